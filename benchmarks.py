@@ -1,9 +1,16 @@
 from __future__ import print_function
 from builtins import range
+import gc
+import threading
+import time  #!
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor  #!
+from functools import partial
 from pyperform import BenchmarkedClass, BenchmarkedFunction
 
 from eventdispatcher import EventDispatcher, Property, ListProperty, DictProperty, SetProperty, UnitProperty  #!
 from eventdispatcher import StringProperty, LimitProperty #!
+from eventdispatcher import bind_many, Clock, ScheduledEvent, TimerHeap, TimingWheel
 from tests.test_property import PropertyTest             #!
 from tests.test_dictproperty import DictPropertyTest     #!
 from tests.test_listproperty import ListPropertyTest     #!
@@ -100,3 +107,331 @@ class Dispatcher(EventDispatcher):
 
     def callback(self, inst, number):
         pass
+
+
+@BenchmarkedFunction(timeit_repeat=TIMEIT_REPEAT, timeit_number=TIMEIT_NUMBER)
+def run_construction():
+    class Base(EventDispatcher):
+        p1 = Property(1)
+        p2 = Property(2)
+        limitp = LimitProperty(5, min=0, max=10)
+
+    class Derived(Base):
+        p3 = Property(3)
+        listp = ListProperty([1, 2])
+        p4 = Property(4)
+
+        def on_p1(self, inst, value):
+            pass
+
+    for i in range(INNER_LOOP):
+        Derived()
+
+
+def _mixed_listeners(offload):  #!
+    """Producer with a fast inline listener and two slow listeners."""
+    class Producer(EventDispatcher):
+        value = Property(0)
+        executor = ThreadPoolExecutor(8)
+
+    def slow_listener(inst, value):
+        time.sleep(0.001)
+
+    def fast_listener(inst, value):
+        pass
+
+    producer = Producer()
+    producer.bind(value=fast_listener)
+    bind = producer.bind_offloaded if offload else producer.bind
+    bind(value=slow_listener)
+    bind(value=slow_listener)
+    return producer
+
+
+@BenchmarkedFunction(timeit_repeat=TIMEIT_REPEAT, timeit_number=TIMEIT_NUMBER)
+def run_slow_listeners_offloaded():
+    producer = _mixed_listeners(True)
+    try:
+        for i in range(1, 501):
+            producer.value = i
+        producer.wait_offloaded()
+    finally:
+        producer.executor.shutdown()
+
+
+def measure_producer_latency(n=500):
+    """
+    Print how long setting a property blocks the producer when slow listeners
+    are called inline and when they are offloaded to an executor.
+    """
+    for offload in (False, True):
+        producer = _mixed_listeners(offload)
+        latencies = []
+        for i in range(1, n + 1):
+            t0 = time.perf_counter()
+            producer.value = i
+            latencies.append(time.perf_counter() - t0)
+        producer.wait_offloaded()
+        producer.executor.shutdown()
+        print("%s \t mean %.1f us \t max %.1f us" % (
+            'offloaded' if offload else 'inline',
+            sum(latencies) / n * 1e6, max(latencies) * 1e6))
+
+
+def measure_contended_dispatch(n=20000, producers=4, churners=4):
+    """
+    Print the dispatch throughput of several producer threads while other
+    threads keep binding and unbinding callbacks of the same event.
+    """
+    class Producer(EventDispatcher):
+        def __init__(self):
+            super(Producer, self).__init__()
+            self.register_event('event1')
+
+    def listener(*args):
+        pass
+
+    producer = Producer()
+    producer.bind(event1=listener)
+    stop = threading.Event()
+
+    def churn():
+        def noise(*args):
+            pass
+        while not stop.is_set():
+            producer.bind(event1=noise).unbind()
+
+    def produce():
+        for i in range(n):
+            producer.dispatch_event('event1', i)
+
+    for n_churners in (0, churners):
+        stop.clear()
+        threads = [threading.Thread(target=churn) for i in range(n_churners)]
+        for thread in threads:
+            thread.start()
+        producing = [threading.Thread(target=produce) for i in range(producers)]
+        t0 = time.perf_counter()
+        for thread in producing:
+            thread.start()
+        for thread in producing:
+            thread.join()
+        dt = time.perf_counter() - t0
+        stop.set()
+        for thread in threads:
+            thread.join()
+        print("%d producers, %d churners \t %d dispatches/s" % (
+            producers, n_churners, n * producers / dt))
+
+
+def measure_bind_many(n=50000):
+    """
+    Print the time to bind one callback to many instances, one bind call per
+    instance and with bind_many.
+    """
+    class Monitored(EventDispatcher):
+        p1 = Property(1)
+        p2 = Property(2)
+
+    def monitor(inst, value):
+        pass
+
+    each = [Monitored() for i in range(n)]
+    many = [Monitored() for i in range(n)]
+    # Like timeit, keep the garbage collector out of the timings
+    gc.collect()
+    gc.disable()
+    t0 = time.perf_counter()
+    for instance in each:
+        instance.bind(p1=monitor, p2=monitor)
+    t1 = time.perf_counter()
+    bind_many(many, p1=monitor, p2=monitor)
+    t2 = time.perf_counter()
+    gc.enable()
+    print("bind per instance \t %.1f ms" % ((t1 - t0) * 1e3))
+    print("bind_many \t %.1f ms" % ((t2 - t1) * 1e3))
+
+
+def measure_instance_memory(n=10000):
+    """
+    Print the bytes allocated per instance with the dictionary and the
+    compact (slot-based) property records.
+    """
+    class DictRecords(EventDispatcher):
+        p1 = Property(1)
+        p2 = Property(2)
+        p3 = Property(3)
+        limitp = LimitProperty(5, min=0, max=10)
+        unitp = UnitProperty(1.0, 'm')
+
+    class CompactRecords(DictRecords):
+        compact_properties = True
+
+    for cls in (DictRecords, CompactRecords):
+        cls()
+        tracemalloc.start()
+        instances = [cls() for i in range(n)]
+        size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print("%s \t %d bytes/instance" % (cls.__name__, size // len(instances)))
+
+
+def measure_clock_idle(duration=1.0, n=50):
+    """
+    Print the CPU used by a Clock waiting for a timer, and how late the timed
+    calls and the calls triggered from another thread are made, for a
+    polling clock and for the default sleeping clock.
+    """
+    class PollingClock(Clock):
+        poll_interval = 0
+
+    previous_clock = getattr(Clock, 'clock', None)
+    for cls in (PollingClock, Clock):
+        clock = cls()
+        thread = threading.Thread(target=clock.run)
+        thread.start()
+        ScheduledEvent.schedule_once(lambda: None, duration * 2)
+        t0 = time.process_time()
+        time.sleep(duration)
+        cpu = (time.process_time() - t0) / duration
+
+        lateness = []
+        for i in range(n):
+            deadline = time.time() + 0.002
+            ScheduledEvent.schedule_once(
+                lambda: lateness.append(time.time() - deadline), 0.002)
+            time.sleep(0.005)
+
+        latency = []
+        done = threading.Event()
+
+        def triggered():
+            latency.append(time.perf_counter() - t_submit)
+            done.set()
+
+        trigger = ScheduledEvent.create_trigger(triggered)
+        for i in range(n):
+            done.clear()
+            t_submit = time.perf_counter()
+            trigger.next()
+            done.wait()
+            time.sleep(0.001)
+        clock.stop()
+        thread.join()
+        print("%s \t idle cpu %.0f%% \t timer late %.0f us \t "
+              "wake-up %.0f us" % (
+                  cls.__name__, cpu * 100,
+                  sorted(lateness)[n // 2] * 1e6,
+                  sorted(latency)[n // 2] * 1e6))
+    Clock.clock = previous_clock
+
+
+def measure_timer_scaling(sizes=(int(1e3), int(1e4), int(1e5), int(1e6))):
+    """
+    Print the cost per timer of adding timers with deadlines spread over a
+    minute, cancelling half of them and expiring the rest in 10 ms steps,
+    with the heap and the timing wheel backends.
+    """
+    import random
+
+    def func():
+        pass
+
+    for n in sizes:
+        start = time.time()
+        deadlines = [start + random.random() * 60 for i in range(n)]
+        for backend in (TimerHeap, TimingWheel):
+            timers = backend()
+            expired = []
+            t0 = time.perf_counter()
+            handles = [timers.add(deadline, func) for deadline in deadlines]
+            t1 = time.perf_counter()
+            for handle in handles[::2]:
+                timers.cancel(handle)
+            t2 = time.perf_counter()
+            now = start
+            while timers:
+                now += 0.01
+                timers.expire(now, expired.append)
+            t3 = time.perf_counter()
+            print("%d timers \t %s \t add %.2f us \t cancel %.2f us \t "
+                  "expire %.2f us" % (
+                      n, backend.__name__, (t1 - t0) / n * 1e6,
+                      (t2 - t1) / (n // 2) * 1e6,
+                      (t3 - t2) / len(expired) * 1e6))
+
+
+def measure_trigger_resets(sizes=(1000, 10000, 50000)):
+    """
+    Print the time to reset every one of n pending triggers in one cycle,
+    the most recently triggered first, and the size of the clock's bookkeeping once the cycle ran.
+    """
+    previous_clock = getattr(Clock, 'clock', None)
+    for n in sizes:
+        clock = Clock()
+        triggers = [ScheduledEvent.create_trigger(lambda: None)
+                    for i in range(n)]
+        for trigger in triggers:
+            trigger.next()
+        t0 = time.perf_counter()
+        for trigger in reversed(triggers):
+            trigger.reset_trigger()
+        dt = time.perf_counter() - t0
+        clock._run_scheduled_events()
+        print("%d triggers \t reset %.2f us/trigger \t %d funcs tracked" % (
+            n, dt / n * 1e6, len(clock.scheduled_funcs)))
+    Clock.clock = previous_clock
+
+
+def measure_handoff_contention(n=20000, producers=(1, 2, 4, 8)):
+    """
+    Print the throughput of N producer threads handing functions over to a
+    running Clock with call_soon_threadsafe, and the median time until the
+    clock calls them.
+    """
+    previous_clock = getattr(Clock, 'clock', None)
+    for n_producers in producers:
+        clock = Clock()
+        thread = threading.Thread(target=clock.run)
+        thread.start()
+        latencies = []
+        done = threading.Event()
+        total = n * n_producers
+
+        def call(t_submit):
+            latencies.append(time.perf_counter() - t_submit)
+            if len(latencies) == total:
+                done.set()
+
+        def produce():
+            for i in range(n):
+                clock.call_soon_threadsafe(
+                    partial(call, time.perf_counter()))
+                if not i % 100:
+                    # Let the clock go idle from time to time
+                    time.sleep(0.0001)
+
+        threads = [threading.Thread(target=produce)
+                   for i in range(n_producers)]
+        t0 = time.perf_counter()
+        for producer in threads:
+            producer.start()
+        for producer in threads:
+            producer.join()
+        done.wait()
+        dt = time.perf_counter() - t0
+        clock.stop()
+        thread.join()
+        print("%d producers \t %d calls/s \t median latency %.0f us" % (
+            n_producers, total / dt, sorted(latencies)[total // 2] * 1e6))
+    Clock.clock = previous_clock
+
+
+measure_instance_memory()
+measure_producer_latency()
+measure_contended_dispatch()
+measure_bind_many()
+measure_clock_idle()
+measure_timer_scaling()
+measure_trigger_resets()
+measure_handoff_contention()
@@ -1,19 +1,27 @@
 import json
 from typing import Any
 
-from .eventdispatcher import EventDispatcher
-from .property import Property
+from .eventdispatcher import EventDispatcher, batch, bind_many, unbind_many
+from .callbacklist import CallbackList
+from .property import Property, PropertyInfo
 from .dictproperty import DictProperty, ObservableDict
 from .limitproperty import LimitProperty
+from .deadbandproperty import DeadbandProperty, DeadbandArrayProperty
 from .listproperty import ListProperty, ObservableList
 from .optionproperty import OptionProperty
 from .setproperty import SetProperty, ObservableSet
 from .stringproperty import StringProperty, _
 from .unitproperty import UnitProperty
 from .weakrefproperty import WeakRefProperty
+from .computedproperty import ComputedProperty
 from .scheduledevent import ScheduledEvent
 from .clock import Clock
+from .timers import TimerHeap, TimingWheel
+from .asyncioclock import AsyncioClock
 from .json_map import JSON_Map
+from .profiler import DispatchProfiler
+from . import compare
+from .propertygraph import PropertyGraph, bind_property, bind_properties
 from .exceptions import *
 from .version import __version__
 
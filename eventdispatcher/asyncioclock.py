@@ -0,0 +1,148 @@
+__author__ = "calvin"
+
+import asyncio
+from time import time
+from typing import Any, Callable, Optional
+
+from .clock import Clock
+from .timers import Timer
+
+
+class AsyncioTimer(Timer):
+    """Timer parked in the timer heap of an asyncio event loop."""
+
+    __slots__ = ("handle",)
+
+    def __init__(self, deadline: float, func: Callable[[], None]) -> None:
+        super(AsyncioTimer, self).__init__(deadline, func)
+        self.handle: Optional[asyncio.TimerHandle] = None
+
+
+class AsyncioClock(Clock):
+    """
+    Clock driven by an asyncio event loop instead of its own run loop. A
+    cycle is scheduled with loop.call_soon whenever something is queued, and
+    timed functions wait in the loop's timer heap (loop.call_at), so the
+    ScheduledEvents and deferred dispatches run on the loop without polling.
+
+    Functions can be scheduled from other threads, they are handed to the
+    loop with call_soon_threadsafe.
+    """
+
+    def __init__(
+        self,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        *args: Any,
+        **kwargs: Any
+    ) -> None:
+        super(AsyncioClock, self).__init__(*args, **kwargs)
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = asyncio.get_event_loop()
+        self.loop = loop
+        self._cycle_scheduled = False
+
+    def _in_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def in_clock_thread(self) -> bool:
+        return not self.loop.is_running() or self._in_loop()
+
+    def call_soon_threadsafe(self, func: Callable[[], None]) -> None:
+        """Call a function on the loop, from any thread."""
+        self.loop.call_soon_threadsafe(func)
+
+    def _schedule_cycle(self) -> None:
+        self._cycle_scheduled = True
+        if self._in_loop():
+            self.loop.call_soon(self._run_scheduled_events)
+        else:
+            self.loop.call_soon_threadsafe(self._run_scheduled_events)
+
+    def schedule(self, func: Callable[[], None]) -> None:
+        """Call a function on the next cycle."""
+        self.scheduled_funcs[func] += 1
+        self.queue.append(func)
+        if not self._cycle_scheduled:
+            self._schedule_cycle()
+
+    def schedule_at(
+        self, deadline: float, func: Callable[[], None]
+    ) -> AsyncioTimer:
+        """
+        Call a function on the first cycle after `deadline` (in seconds since
+        the epoch, see time.time).
+        :return: Timer to pass to `cancel`
+        """
+        self.scheduled_funcs[func] += 1
+        timer = AsyncioTimer(deadline, func)
+        if self._in_loop():
+            self._arm(timer)
+        else:
+            self.loop.call_soon_threadsafe(self._arm, timer)
+        return timer
+
+    def _arm(self, timer: AsyncioTimer) -> None:
+        if timer.func is not None:
+            loop = self.loop
+            # The loop's clock is monotonic, the deadlines are not
+            when = loop.time() + timer.deadline - time()
+            timer.handle = loop.call_at(when, self._expire, timer)
+
+    def _expire(self, timer: AsyncioTimer) -> None:
+        func = timer.func
+        if func is not None:
+            timer.func = None
+            self.queue.append(func)
+            if not self._cycle_scheduled:
+                self._schedule_cycle()
+
+    def cancel(self, timer: AsyncioTimer) -> bool:
+        """
+        Cancel a function scheduled with `schedule_at`. Returns False if it
+        was already called or cancelled.
+        """
+        func = timer.func
+        if func is None:
+            return False
+        timer.func = None
+        handle = timer.handle
+        if handle is not None:
+            handle.cancel()
+        self._cancelled_timer(func)
+        return True
+
+    def _run_scheduled_events(self) -> None:
+        # Functions queued by this cycle schedule the next one
+        self._cycle_scheduled = False
+        try:
+            super(AsyncioClock, self)._run_scheduled_events()
+        finally:
+            # Left over if a function raised
+            if self.queue and not self._cycle_scheduled:
+                self._schedule_cycle()
+
+    def defer_dispatch(
+        self, callbacks: Any, args: tuple, kwargs: dict
+    ) -> None:
+        if not self.in_clock_thread():
+            self.loop.call_soon_threadsafe(
+                self.defer_dispatch, callbacks, args, kwargs
+            )
+            return
+        self.deferred_dispatches[id(callbacks)] = (callbacks, args, kwargs)
+        if not self._cycle_scheduled:
+            self._schedule_cycle()
+
+    def stop(self) -> None:
+        """Stop the event loop started by run()."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def run(self) -> None:
+        """Run the event loop until stop() is called."""
+        self.loop.run_forever()
@@ -0,0 +1,226 @@
+__author__ = "calvin"
+
+import threading
+from itertools import count
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from .clock import Clock
+
+# Keys identifying a binding in its CallbackList
+_binding_keys = count()
+# Serializes the modifications of all the CallbackLists. Dispatching never
+# takes it. A single lock keeps the lists small, modifications are short. It
+# is reentrant because a weak binding can be unbound by the garbage collector
+# while the lock is held.
+_lock = threading.RLock()
+
+
+class CancellableCallback(object):
+    """
+    Base of the callbacks that keep calls pending after a dispatch, like the
+    throttled and debounced bindings. A CallbackList calls `cancel` when it
+    removes such a callback, so that nothing is called once it is unbound.
+    """
+
+    __slots__ = ()
+
+    def cancel(self) -> None:
+        pass
+
+
+def _cancel(callbacks: Iterable[Callable[..., Any]]) -> None:
+    for callback in callbacks:
+        if isinstance(callback, CancellableCallback):
+            callback.cancel()
+
+
+class CallbackList(object):
+    """
+    Ordered collection of the callbacks bound to a property or event. Each
+    binding is stored under a unique key so that it can be removed in O(1)
+    given its key (see EventDispatcher.bind). Dispatching iterates over a
+    tuple snapshot of the callbacks that is rebuilt lazily after the
+    collection changed. Modifications are serialized by a lock and never
+    change a snapshot in place, so binding and unbinding from other threads is
+    safe while a dispatch iterates over the previous snapshot without locking.
+
+    The `fire` attribute is kept specialized to the number of bindings so
+    that dispatching does not have to loop in the common cases:
+
+        - None when nothing is bound, the caller skips the dispatch entirely
+        - the callback itself when exactly one callback is bound
+        - a loop honouring stop-propagation when several callbacks are bound
+
+    Every method that modifies the collection updates `fire`. While the list
+    is held (see `hold`), `fire` only records the arguments of the last
+    dispatch. When the list is deferred (see `set_deferred`), `fire` queues
+    the dispatch on the running Clock.
+    """
+
+    __slots__ = (
+        "fire",
+        "held",
+        "_holds",
+        "_deferred",
+        "_callbacks",
+        "_snapshot",
+    )
+
+    def __init__(self, callbacks: Iterable[Callable[..., Any]] = ()) -> None:
+        self._callbacks: Dict[int, Callable[..., Any]] = {}
+        self._snapshot: Optional[Tuple[Callable[..., Any], ...]] = None
+        self.fire: Optional[Callable[..., Any]] = None
+        self.held: Optional[Tuple[tuple, dict]] = None
+        self._holds = 0
+        self._deferred = False
+        if callbacks:
+            for callback in callbacks:
+                self._callbacks[next(_binding_keys)] = callback
+            self._update()
+
+    def _update(self) -> None:
+        # Called with the lock held, or before the list is shared
+        self._snapshot = None
+        if self._holds:
+            self.fire = self._hold_dispatch
+            return
+        n = len(self._callbacks)
+        if n == 0:
+            self.fire = None
+        elif self._deferred:
+            self.fire = self._defer_dispatch
+        elif n == 1:
+            self.fire = next(iter(self._callbacks.values()))
+        else:
+            self.fire = self.call_all
+
+    @property
+    def snapshot(self) -> Tuple[Callable[..., Any], ...]:
+        """Tuple of the bound callbacks, in the order they were bound."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with _lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = self._snapshot = tuple(self._callbacks.values())
+        return snapshot
+
+    def call_all(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Call the callbacks in order until one of them returns True,
+        regardless of whether the list is held or deferred.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.snapshot
+        for callback in snapshot:
+            if callback(*args, **kwargs):
+                break
+
+    def _defer_dispatch(self, *args: Any, **kwargs: Any) -> None:
+        Clock.get_running_clock().defer_dispatch(self, args, kwargs)
+
+    def set_deferred(self, deferred: bool) -> None:
+        """
+        Queue dispatches on the running Clock instead of calling the
+        callbacks right away. The Clock calls the callbacks at most once per
+        cycle, with the arguments of the last dispatch of that cycle. Raises
+        RuntimeError if no Clock was created.
+        """
+        if deferred:
+            Clock.get_running_clock()
+        with _lock:
+            self._deferred = deferred
+            self._update()
+
+    def _hold_dispatch(self, *args: Any, **kwargs: Any) -> None:
+        self.held = (args, kwargs)
+
+    def hold(self) -> None:
+        """
+        Record dispatches instead of calling the callbacks until `release` has
+        been called as many times as `hold`.
+        """
+        with _lock:
+            self._holds += 1
+            self._update()
+
+    def release(self) -> Optional[Tuple[tuple, dict]]:
+        """
+        Undo one call to `hold`. When the last hold is released, the
+        arguments of the last recorded dispatch are returned (None if nothing
+        was dispatched while held).
+        """
+        with _lock:
+            self._holds -= 1
+            if self._holds:
+                return None
+            held, self.held = self.held, None
+            self._update()
+            return held
+
+    def append(self, callback: Callable[..., Any]) -> int:
+        """Bind a callback and return the key of the binding."""
+        key = next(_binding_keys)
+        with _lock:
+            self._callbacks[key] = callback
+            self._update()
+        return key
+
+    def discard(self, key: int) -> bool:
+        """
+        Remove the binding with the given key in O(1). Returns False if there
+        is no such binding.
+        """
+        with _lock:
+            callback = self._callbacks.pop(key, None)
+            if callback is None:
+                return False
+            self._update()
+        _cancel((callback,))
+        return True
+
+    def remove(self, callback: Callable[..., Any]) -> None:
+        """
+        Remove the first binding that compares equal to the callback. Raises
+        ValueError if there is none.
+        """
+        with _lock:
+            for key, bound in list(self._callbacks.items()):
+                if bound == callback:
+                    del self._callbacks[key]
+                    self._update()
+                    break
+            else:
+                raise ValueError("Callback is not bound")
+        _cancel((bound,))
+
+    def clear(self) -> None:
+        with _lock:
+            removed = tuple(self._callbacks.values())
+            self._callbacks.clear()
+            self._update()
+        _cancel(removed)
+
+    def copy(self) -> "CallbackList":
+        callbacks = CallbackList()
+        with _lock:
+            callbacks._callbacks = self._callbacks.copy()
+        callbacks._deferred = self._deferred
+        callbacks._update()
+        return callbacks
+
+    def __iter__(self) -> Iterator[Callable[..., Any]]:
+        return iter(self.snapshot)
+
+    def __len__(self) -> int:
+        return len(self._callbacks)
+
+    def __contains__(self, callback: Callable[..., Any]) -> bool:
+        return callback in self.snapshot
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.snapshot[index]
+
+    def __repr__(self) -> str:
+        return "CallbackList({!r})".format(list(self.snapshot))
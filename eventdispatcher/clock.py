@@ -1,36 +1,303 @@
 __author__ = 'calvin'
 
+import threading
 from builtins import range
 from collections import deque, Counter
-from typing import Callable
+from functools import partial
+from time import time
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from .timers import Timer, TimerHeap, TimingWheel
 
 
 class Clock:
-    clock: "Clock"
+    """
+    Runs the scheduled functions. Functions in `queue` are called on the next
+    cycle, timed functions (see `schedule_at`) are kept by a timer backend
+    until they are due. When there is nothing to call, `run` sleeps until the
+    earliest deadline or until something is submitted, instead of polling.
+
+    `scheduled_funcs` counts the pending calls of each function, functions
+    that are not scheduled are dropped from it. Unscheduling a function
+    leaves its entry in the queue as a tombstone that is skipped when it is
+    popped, so that cancelling is O(1).
+
+    The scheduling methods are meant to be called from the thread running
+    the clock. Other threads hand functions over with
+    `call_soon_threadsafe`, which wakes the sleeping run loop. Deferred
+    dispatches from other threads are handed over that way by
+    `defer_dispatch` itself.
 
-    def __init__(self, *args, **kwargs) -> None:
+    The timer backend is a TimerHeap by default. `Clock(timers=TimingWheel())`
+    uses a hierarchical timing wheel instead, for large numbers of timers.
+    """
+
+    # The most recently created clock, see get_running_clock
+    clock: Optional["Clock"] = None
+    # Longest time run() sleeps between cycles, None to sleep until the next
+    # deadline or submission. Subclasses that do work of their own on every
+    # cycle can set it to keep polling.
+    poll_interval: Optional[float] = None
+
+    def __init__(
+        self, *args, timers: Union[TimerHeap, TimingWheel] = None, **kwargs
+    ) -> None:
         self.scheduled_funcs: Counter[Callable[[], None]] = Counter()
         self.queue: deque[Callable[[], None]] = deque([])
+        self.deferred_dispatches: Dict[int, Tuple[Any, tuple, dict]] = {}
+        # Number of entries of each function in the queue, or among the
+        # timers, to skip
+        self.cancelled: Dict[Callable[[], None], int] = {}
+        self.timers = TimerHeap() if timers is None else timers
+        # Guards the timers and wakes the sleeping run loop
+        self._condition = threading.Condition()
+        self._sleeping = False
+        # Functions handed over by other threads. Appending to and popping
+        # from a deque are atomic, so neither side takes a lock.
+        self.handoff: deque[Callable[[], None]] = deque()
+        # Thread running run(), None when the clock is not running
+        self.thread_id: Optional[int] = None
+        # Deadline the run loop sleeps until, None if there is none
+        self._wake_at: Optional[float] = None
         self._running: int = 0
         Clock.clock = self
         super().__init__(*args, **kwargs)
 
     @staticmethod
     def get_running_clock() -> "Clock":
-        return Clock.clock
+        """
+        Return the most recently created clock. Raises RuntimeError if no
+        clock was created.
+        """
+        clock = Clock.clock
+        if clock is None:
+            raise RuntimeError(
+                "No Clock is running, create a Clock before scheduling"
+                " functions or deferring dispatches"
+            )
+        return clock
+
+    def in_clock_thread(self) -> bool:
+        """
+        Whether the caller can schedule functions directly: it runs in the
+        thread of the clock, or the clock is not running in a thread.
+        """
+        thread_id = self.thread_id
+        return thread_id is None or thread_id == threading.get_ident()
+
+    def call_soon_threadsafe(self, func: Callable[[], None]) -> None:
+        """
+        Call a function on the next cycle of the clock, from any thread.
+        Unlike `schedule`, it is not counted in `scheduled_funcs` and cannot
+        be unscheduled.
+        """
+        self.handoff.append(func)
+        if self._sleeping:
+            self.wake()
+
+    def schedule(self, func: Callable[[], None]) -> None:
+        """Call a function on the next cycle."""
+        self.scheduled_funcs[func] += 1
+        self.queue.append(func)
+        if self._sleeping:
+            self.wake()
+
+    def unschedule(self, func: Callable[[], None]) -> bool:
+        """
+        Cancel the earliest pending call of a function scheduled with
+        `schedule` or `schedule_at`. Returns False if it is not scheduled.
+        """
+        funcs = self.scheduled_funcs
+        n = funcs.get(func, 0)
+        if not n:
+            return False
+        # Counter.__delitem__ is slower than pop
+        if n == 1:
+            funcs.pop(func)
+        else:
+            funcs[func] = n - 1
+        cancelled = self.cancelled
+        cancelled[func] = cancelled.get(func, 0) + 1
+        return True
+
+    def schedule_at(
+        self, deadline: float, func: Callable[[], None]
+    ) -> Timer:
+        """
+        Call a function on the first cycle after `deadline` (in seconds since
+        the epoch, see time.time).
+        :return: Timer to pass to `cancel`
+        """
+        self.scheduled_funcs[func] += 1
+        with self._condition:
+            timer = self.timers.add(deadline, func)
+            # Only an earlier deadline changes how long to sleep
+            if self._sleeping and (
+                self._wake_at is None or deadline < self._wake_at
+            ):
+                self._condition.notify()
+        return timer
+
+    def cancel(self, timer: Timer) -> bool:
+        """
+        Cancel a function scheduled with `schedule_at`. Returns False if it
+        was already called or cancelled.
+        """
+        with self._condition:
+            func = timer.func
+            if not self.timers.cancel(timer):
+                return False
+        self._cancelled_timer(func)
+        return True
+
+    def _cancelled_timer(self, func: Callable[[], None]) -> None:
+        if self.scheduled_funcs.get(func, 0) > 0:
+            self._discard(func)
+        else:
+            # Every pending call was unscheduled, the timer was the one
+            # its tombstone stood for
+            self._skip(func)
+
+    def _discard(self, func: Callable[[], None]) -> None:
+        """Count one pending call of a function less."""
+        funcs = self.scheduled_funcs
+        n = funcs[func] - 1
+        if n:
+            funcs[func] = n
+        else:
+            funcs.pop(func)
+
+    def wake(self) -> None:
+        """Interrupt the sleep of the run loop."""
+        with self._condition:
+            # The other threads submitting meanwhile need not wake it again
+            self._sleeping = False
+            self._condition.notify()
 
     def _run_scheduled_events(self) -> None:
+        if self.handoff:
+            self._run_handoff()
+        if self.timers:
+            self._expire_timers()
         events = self.queue
         funcs = self.scheduled_funcs
+        cancelled = self.cancelled
         popleft = events.popleft
+        pop = funcs.pop
         for i in range(len(events)):
             f = popleft()
-            funcs[f] -= 1
+            if cancelled and f in cancelled:
+                self._skip(f)
+                continue
+            n = funcs[f] - 1
+            if n:
+                funcs[f] = n
+            else:
+                pop(f)
             f()
+        if self.deferred_dispatches:
+            self._run_deferred_dispatches()
+
+    def _run_handoff(self) -> None:
+        handoff = self.handoff
+        popleft = handoff.popleft
+        # Functions handed over meanwhile wait for the next cycle
+        for i in range(len(handoff)):
+            popleft()()
+
+    def _skip(self, func: Callable[[], None]) -> None:
+        """Drop a tombstone of a function popped from the queue."""
+        cancelled = self.cancelled
+        n = cancelled[func] - 1
+        if n:
+            cancelled[func] = n
+        else:
+            cancelled.pop(func)
+
+    def _expire_timers(self) -> None:
+        """Move the timed functions that are due to the queue."""
+        with self._condition:
+            self.timers.expire(time(), self.queue.append)
+
+    def defer_dispatch(
+        self, callbacks: Any, args: tuple, kwargs: dict
+    ) -> None:
+        """
+        Queue the dispatch of a CallbackList until the end of the current
+        cycle. Queuing the same CallbackList again within a cycle replaces
+        the arguments rather than dispatching twice.
+        """
+        if not self.in_clock_thread():
+            # Only the clock thread writes to deferred_dispatches, so that
+            # it can swap the dictionary without losing dispatches
+            self.call_soon_threadsafe(
+                partial(self.defer_dispatch, callbacks, args, kwargs)
+            )
+            return
+        self.deferred_dispatches[id(callbacks)] = (callbacks, args, kwargs)
+        if self._sleeping:
+            self.wake()
+
+    def _run_deferred_dispatches(self) -> None:
+        dispatches = self.deferred_dispatches
+        self.deferred_dispatches = {}
+        for callbacks, args, kwargs in dispatches.values():
+            callbacks.call_all(*args, **kwargs)
+
+    def _sleep(self) -> None:
+        """
+        Wait until the earliest deadline, or until a function is scheduled,
+        if there is nothing to call on the next cycle.
+        """
+        if (
+            self.queue
+            or self.handoff
+            or self.deferred_dispatches
+            or not self._running
+        ):
+            return
+        timeout = self.poll_interval
+        if timeout == 0:
+            return
+        with self._condition:
+            # Checked again with the lock held, a submission from another
+            # thread either sees _sleeping or is seen here
+            self._sleeping = True
+            try:
+                if (
+                    self.queue
+                    or self.handoff
+                    or self.deferred_dispatches
+                    or not self._running
+                ):
+                    return
+                deadline = self.timers.next_deadline()
+                if deadline is not None:
+                    delay = deadline - time()
+                    if delay <= 0:
+                        return
+                    if timeout is None or delay < timeout:
+                        timeout = delay
+                self._wake_at = deadline
+                self._condition.wait(timeout)
+            finally:
+                self._sleeping = False
+                self._wake_at = None
+
+    def stop(self) -> None:
+        """Make run() return after the current cycle."""
+        self._running = 0
+        self.wake()
 
     def run(self) -> None:
         # Use all local variables to speed up the loop
         _run_scheduled_events = self._run_scheduled_events
+        _sleep = self._sleep
         self._running = 1
-        while self._running:
-            _run_scheduled_events()
+        self.thread_id = threading.get_ident()
+        try:
+            while self._running:
+                _run_scheduled_events()
+                _sleep()
+        finally:
+            self.thread_id = None
@@ -0,0 +1,95 @@
+"""
+Change-detection strategies for the `compare` argument of the properties.
+
+A strategy is a callable `compare(old, new)` that returns True when the two
+values are considered equal, in which case assigning `new` does not
+dispatch. Strategies that need to remember something between assignments
+subclass CompareStrategy instead.
+"""
+
+__author__ = "calvin"
+
+import math
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+
+_missing = object()
+
+
+class CompareStrategy(object):
+    """Change-detection strategy with access to the property record."""
+
+    def changed(self, info: Dict[str, Any], old: Any, new: Any) -> bool:
+        """Return True if assigning `new` over `old` should dispatch."""
+        raise NotImplementedError
+
+
+def change_detector(
+    compare: Any,
+) -> Callable[[Dict[str, Any], Any, Any], bool]:
+    """
+    Return the function used by the setters to decide whether to dispatch,
+    changed(info, old, new), for a `compare` argument.
+    """
+    if isinstance(compare, CompareStrategy):
+        return compare.changed
+    return lambda info, old, new: not compare(old, new)
+
+
+def identity(old: Any, new: Any) -> bool:
+    """Equal only if it is the same object. Skips deep comparisons."""
+    return old is new
+
+
+def always_changed(old: Any, new: Any) -> bool:
+    """Dispatch on every assignment."""
+    return False
+
+
+def array_equal(old: Any, new: Any) -> bool:
+    """Element-wise equality of NumPy arrays (or sequences)."""
+    return bool(np.array_equal(old, new))
+
+
+def tolerance(
+    abs_tol: float = 0.0, rel_tol: float = 1e-9
+) -> Callable[[Any, Any], bool]:
+    """
+    Floats that are within the absolute or relative tolerance of each other
+    are equal, see math.isclose. Values that are not numbers are compared
+    with ==.
+    """
+
+    def compare(old: Any, new: Any) -> bool:
+        try:
+            return math.isclose(old, new, rel_tol=rel_tol, abs_tol=abs_tol)
+        except TypeError:
+            return old == new
+
+    return compare
+
+
+class VersionCounter(CompareStrategy):
+    """
+    For mutable values that count their modifications in a version
+    attribute. Assigning another object always dispatches. Assigning the same
+    object again dispatches only if its version changed since it was last
+    assigned, without comparing the contents. Values without the attribute,
+    such as None, are compared with !=.
+    """
+
+    def __init__(self, attr: str = "version") -> None:
+        self.attr = attr
+
+    def changed(self, info: Dict[str, Any], old: Any, new: Any) -> bool:
+        version = getattr(new, self.attr, _missing)
+        if version is _missing:
+            # None or another value without a version, compared with !=
+            info["version"] = None
+            return new is not old and bool(new != old)
+        if new is old and info.get("version") == version:
+            return False
+        info["version"] = version
+        return True
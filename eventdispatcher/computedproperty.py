@@ -0,0 +1,137 @@
+__author__ = "calvin"
+
+from typing import Any, Callable, Iterable
+
+from . import Property
+from .exceptions import BindError
+
+
+class Invalidation(object):
+    """
+    Binding of a ComputedProperty of an instance to one of its dependencies.
+    """
+
+    __slots__ = ("prop", "obj")
+
+    def __init__(self, prop: "ComputedProperty", obj: Any) -> None:
+        self.prop = prop
+        self.obj = obj
+
+    def __call__(self, *args: Any) -> None:
+        self.prop.invalidate(self.obj)
+
+    def mark_dirty(self) -> None:
+        """Invalidate without recomputing or dispatching."""
+        self.prop.mark_dirty(self.obj)
+
+
+class ComputedProperty(Property):
+    """
+    Read-only property whose value is computed by `func(instance)` from the
+    properties named in `depends_on`.
+
+    A change of a dependency only marks the value as dirty, it is recomputed
+    the next time it is read. If something is bound to the property, the
+    value is recomputed right away instead, and dispatched if it differs
+    from the previous value. A value that was dirty when the property was
+    bound is always dispatched, since it has no valid previous value.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[Any], Any],
+        depends_on: Iterable[str] = (),
+        **additionals: dict
+    ) -> None:
+        super(ComputedProperty, self).__init__(None, **additionals)
+        self.func = func
+        self.depends_on = tuple(depends_on)
+
+    def register(
+        self, instance: Any, property_name: str, default_value: Any
+    ) -> None:
+        super(ComputedProperty, self).register(
+            instance, property_name, default_value
+        )
+        info = instance.event_dispatcher_properties[property_name]
+        info["dirty"] = True
+        # The dependencies are registered first, see get_property_registry.
+        # The invalidation hooks are kept out of their callbacks, so that
+        # they cannot be unbound and do not make a computed dependency
+        # recompute eagerly.
+        invalidate = Invalidation(self, instance)
+        all_properties = instance.event_dispatcher_properties
+        for prop_name in self.depends_on:
+            dependency = all_properties.get(prop_name)
+            if dependency is None:
+                raise BindError(
+                    "No property by the name of '%s'" % prop_name
+                )
+            dependents = dependency["dependents"]
+            if dependents is None:
+                dependency["dependents"] = [invalidate]
+            else:
+                dependents.append(invalidate)
+
+    def __get__(self, obj: Any, objtype: type = None) -> Any:
+        info = obj.event_dispatcher_properties[self.name]
+        if info["dirty"]:
+            info["value"] = self.func(obj)
+            info["dirty"] = False
+        return info["value"]
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        raise AttributeError("Cannot set computed properties")
+
+    def store(self, obj: Any, info: Any, value: Any) -> bool:
+        raise AttributeError("Cannot set computed properties")
+
+    def invalidate(self, obj: Any, *args: Any) -> None:
+        """
+        Called when a dependency changed. Marks the value as dirty, or
+        recomputes and dispatches it if the property is bound.
+        """
+        info = obj.event_dispatcher_properties[self.name]
+        if (
+            info["callbacks"].fire is None
+            and obj.event_dispatcher_any_callbacks is None
+        ):
+            info["dirty"] = True
+            dependents = info["dependents"]
+            if dependents is not None:
+                for dependent in dependents:
+                    dependent()
+            return
+        value = self.func(obj)
+        was_dirty = info["dirty"]
+        info["dirty"] = False
+        changed = self.changed
+        if not was_dirty and (
+            value == info["value"]
+            if changed is None
+            else not changed(info, info["value"], value)
+        ):
+            return
+        info["value"] = value
+        self.notify(obj, info, value)
+
+    def mark_dirty(self, obj: Any) -> None:
+        """
+        Mark the value, and the computed properties that depend on it, as
+        dirty without dispatching. Used by silent assignments.
+        """
+        info = obj.event_dispatcher_properties[self.name]
+        info["dirty"] = True
+        mark_dependents_dirty(info)
+
+
+def mark_dependents_dirty(info: Any) -> None:
+    """
+    Mark the computed properties that depend on a property as dirty,
+    without dispatching. Other dependents are not notified.
+    """
+    dependents = info["dependents"]
+    if dependents is not None:
+        for dependent in dependents:
+            if isinstance(dependent, Invalidation):
+                dependent.mark_dirty()
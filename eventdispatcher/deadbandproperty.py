@@ -0,0 +1,98 @@
+__author__ = "calvin"
+
+from typing import Any
+
+import numpy as np
+
+from . import Property
+
+
+class DeadbandProperty(Property):
+    """
+    Numeric property that always stores the assigned value, but only
+    dispatches when the value moves more than `epsilon` away from the last
+    dispatched value. With `relative`, epsilon is a fraction of the last
+    dispatched value. Suppresses the dispatches of noisy values such as
+    sensor readings.
+
+    The band replaces the change detection of the other properties, so the
+    `compare` argument is not supported.
+    """
+
+    def __init__(
+        self,
+        default_value: Any,
+        epsilon: float,
+        relative: bool = False,
+        compare: Any = None,
+    ) -> None:
+        if compare is not None:
+            raise TypeError(
+                "{} does not support compare, epsilon decides when it "
+                "dispatches".format(type(self).__name__)
+            )
+        super().__init__(default_value, epsilon=epsilon, relative=relative)
+
+    def register(
+        self, instance: Any, property_name: str, default_value: Any
+    ) -> None:
+        super().register(instance, property_name, default_value)
+        info = instance.event_dispatcher_properties[property_name]
+        info["dispatched"] = self.reference(default_value)
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        info = obj.event_dispatcher_properties[self.name]
+        info["value"] = value
+        if self.outside_band(info, value):
+            info["dispatched"] = self.reference(value)
+            self.notify(obj, info, value)
+
+    def store(self, obj: Any, info: Any, value: Any) -> bool:
+        # The band is measured from the last dispatched value, which a
+        # silent assignment does not change
+        info["value"] = value
+        return True
+
+    @staticmethod
+    def reference(value: Any) -> Any:
+        """Value kept to compare the next assignments against."""
+        return value
+
+    @staticmethod
+    def outside_band(info: Any, value: Any) -> bool:
+        reference = info["dispatched"]
+        try:
+            band = info["epsilon"]
+            if info["relative"]:
+                band *= abs(reference)
+            return abs(value - reference) > band
+        except TypeError:
+            # None or other values that are not numbers
+            return value != reference
+
+
+class DeadbandArrayProperty(DeadbandProperty):
+    """
+    DeadbandProperty for NumPy arrays. Dispatches when any element moves
+    more than epsilon (or more than epsilon times the element with
+    `relative`) away from the last dispatched array, or when the shape
+    changes.
+    """
+
+    @staticmethod
+    def reference(value: Any) -> Any:
+        # Copy so that modifying the assigned array in place is detected
+        return None if value is None else np.array(value)
+
+    @staticmethod
+    def outside_band(info: Any, value: Any) -> bool:
+        reference = info["dispatched"]
+        if reference is None or value is None:
+            return value is not reference
+        value = np.asarray(value)
+        if value.shape != reference.shape:
+            return True
+        band = info["epsilon"]
+        if info["relative"]:
+            band = band * np.abs(reference)
+        return bool(np.any(np.abs(value - reference) > band))
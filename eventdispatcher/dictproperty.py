@@ -130,26 +130,34 @@ class DictProperty(Property):
             raise ValueError('DictProperty takes dict only.')
 
     def register(self, instance: Any, property_name: str, value: Dict) -> None:
-        self.value = ObservableDict(
+        value = ObservableDict(
             value,
             dispatch_method=partial(
                 instance.dispatch, property_name, instance
             ),
         )
-        super().register(instance, property_name, self.value)
+        super().register(instance, property_name, value)
+
+    def snapshot(self, info: dict) -> Dict:
+        return info['value'].copy()
 
     def __set__(self, obj: Any, value: Dict) -> None:
-        p = self.instances[obj]
-        try:
-            # Ensure that the comparison evaluates as a
-            # scalar boolean (unlike numpy arrrays)
-            do_dispatch = bool(p['value'] != value)
-        except Exception:
-            do_dispatch = True
+        p = obj.event_dispatcher_properties[self.name]
+        if self.store(obj, p, value):
+            self.notify(obj, p, value)
+
+    def store(self, obj: Any, p: Any, value: Dict) -> bool:
+        if self.changed is not None:
+            do_dispatch = self.changed(p, p['value'].dictionary, value)
+        else:
+            try:
+                # Ensure that the comparison evaluates as a
+                # scalar boolean (unlike numpy arrrays)
+                do_dispatch = bool(p['value'] != value)
+            except Exception:
+                do_dispatch = True
         if do_dispatch:
             p['value'].dictionary.clear()
             # Assign to the ObservableDict's value
             p['value'].dictionary.update(value)
-            for callback in p['callbacks']:
-                if callback(obj, value):
-                    break
+        return do_dispatch
@@ -1,30 +1,710 @@
 __author__ = "calvin"
 
+import asyncio
 import contextlib
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from copy import copy
+from inspect import isawaitable, iscoroutinefunction
+from operator import attrgetter
+from time import time
+from weakref import ref, WeakMethod
 from future.utils import iteritems
+from .callbacklist import CallbackList, CancellableCallback
+from .clock import Clock
+from .scheduledevent import ScheduledEvent
 from .property import Property
 from .exceptions import BindError
-from typing import Callable, Dict, Any, List
+from typing import Callable, Dict, Any, Iterable, List, Optional, Set, Tuple
+
+
+class Subscription(object):
+    """
+    Handle to the bindings made by one call to EventDispatcher.bind. The
+    bindings are removed in O(1) with `unbind`.
+    """
+
+    __slots__ = ("dispatcher", "bindings")
+
+    def __init__(
+        self, dispatcher: "EventDispatcher", bindings: Tuple[Tuple[str, int]]
+    ) -> None:
+        self.dispatcher = dispatcher
+        self.bindings = bindings
+
+    def unbind(self) -> None:
+        self.dispatcher.unbind_subscription(self)
+
+
+class ClassObservers(object):
+    """
+    Callbacks bound with EventDispatcher.observe to a property or event of
+    every instance of a class. Each instance binds the `call_all` method of
+    the CallbackList of the name when it is created, in the same way as the
+    'on_<name>' handlers.
+    """
+
+    __slots__ = ("callbacks",)
+
+    def __init__(self) -> None:
+        self.callbacks: Dict[str, CallbackList] = {}
+
+    def unbind_subscription(self, subscription: Subscription) -> None:
+        for prop_name, key in subscription.bindings:
+            self.callbacks[prop_name].discard(key)
+
+
+class WeakCallback(object):
+    """
+    Callable that holds a weak reference to a bound method or function and
+    forwards calls to it while it is alive. Compares equal to the callback it
+    references so that it can be unbound with the original callback. Once the
+    callback is garbage collected, its subscription is unbound. The
+    coroutines of a coroutine function are run like AsyncCallback does.
+    """
+
+    __slots__ = ("ref", "subscription", "loop")
+
+    def __init__(self, callback: Callable[..., Any]) -> None:
+        self.subscription: Optional[Subscription] = None
+        # Event loop of the coroutines, None if the callback is not a
+        # coroutine function
+        self.loop: Optional[asyncio.AbstractEventLoop] = (
+            get_event_loop() if iscoroutinefunction(callback) else None
+        )
+        if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            self.ref = WeakMethod(callback, self._on_dead)
+        else:
+            self.ref = ref(callback, self._on_dead)
+
+    def _on_dead(self, dead_ref: ref) -> None:
+        if self.subscription is not None:
+            self.subscription.unbind()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        callback = self.ref()
+        if callback is not None:
+            if self.loop is not None:
+                return AsyncCallback.run(self.loop, callback(*args, **kwargs))
+            return callback(*args, **kwargs)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, WeakCallback):
+            return self.ref == other.ref
+        callback = self.ref()
+        return callback is not None and callback == other
+
+    def __hash__(self) -> int:
+        return hash(self.ref)
+
+
+class CallbackWrapper(object):
+    """
+    Base class of the callables that bind wraps around a callback to change
+    how it is called. Compares equal to the wrapped callback so that it can
+    be unbound with the original callback.
+    """
+
+    __slots__ = ("callback",)
+
+    def __init__(self, callback: Callable[..., Any]) -> None:
+        self.callback = callback
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CallbackWrapper):
+            return self.callback == other.callback
+        return self.callback == other
+
+    def __hash__(self) -> int:
+        return hash(self.callback)
+
+    def __repr__(self) -> str:
+        return "{}({!r})".format(self.__class__.__name__, self.callback)
+
+
+class AsyncCallback(CallbackWrapper):
+    """
+    Wraps a coroutine function. When dispatched synchronously, the coroutine
+    is scheduled as a task on the running event loop. Without a running loop,
+    as in a worker thread or before the loop runs, it is handed to the event
+    loop of the thread that bound it. dispatch_async awaits the coroutine
+    instead.
+    """
+
+    __slots__ = ("loop",)
+
+    # Keep a reference to the scheduled tasks so that they are not garbage
+    # collected before they finish.
+    tasks: Set[asyncio.Task] = set()
+
+    def __init__(self, callback: Callable[..., Any]) -> None:
+        super().__init__(callback)
+        self.loop = get_event_loop()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> None:
+        AsyncCallback.run(self.loop, self.callback(*args, **kwargs))
+
+    @staticmethod
+    def run(loop: asyncio.AbstractEventLoop, coroutine: Any) -> None:
+        """
+        Schedule a coroutine on the running event loop, or on `loop` if no
+        loop is running in this thread. Never waits for the coroutine.
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            loop.call_soon_threadsafe(
+                AsyncCallback._create_task, loop, coroutine
+            )
+        else:
+            AsyncCallback._create_task(running, coroutine)
+
+    @staticmethod
+    def _create_task(loop: asyncio.AbstractEventLoop, coroutine: Any) -> None:
+        task = loop.create_task(coroutine)
+        AsyncCallback.tasks.add(task)
+        task.add_done_callback(AsyncCallback.tasks.discard)
+
+
+class OffloadedCallback(CallbackWrapper):
+    """
+    Submits the callback to the executor of the dispatcher instead of calling
+    it on the dispatching thread. The future is tracked by the dispatcher
+    until it is done (see EventDispatcher.wait_offloaded).
+    """
+
+    __slots__ = ("dispatcher",)
+
+    def __init__(
+        self, callback: Callable[..., Any], dispatcher: "EventDispatcher"
+    ) -> None:
+        # The coroutines are scheduled on the event loop of the binding
+        # thread rather than run by the worker thread
+        super().__init__(wrap_callback(callback))
+        self.dispatcher = dispatcher
+
+    def __call__(self, *args: Any, **kwargs: Any) -> None:
+        dispatcher = self.dispatcher
+        future = dispatcher.get_executor().submit(
+            self.callback, *args, **kwargs
+        )
+        futures = dispatcher.event_dispatcher_futures
+        futures.add(future)
+        future.add_done_callback(futures.discard)
+
+
+class ThrottledCallback(CallbackWrapper, CancellableCallback):
+    """
+    Calls the callback at most once every `interval` seconds. A call within
+    the interval is delayed until the interval has passed, on the running
+    Clock, with the arguments of the last call, so that the trailing value
+    is always delivered. Unbinding it cancels the delayed call. Raises
+    RuntimeError if no Clock was created.
+    """
+
+    __slots__ = ("interval", "last_call", "pending", "event")
+
+    def __init__(self, callback: Callable[..., Any], interval: float) -> None:
+        Clock.get_running_clock()
+        super().__init__(wrap_callback(callback))
+        self.interval = interval
+        self.last_call = 0.0
+        self.pending: Optional[Tuple[tuple, dict]] = None
+        self.event: Optional[ScheduledEvent] = None
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        now = time()
+        if self.pending is None and now - self.last_call >= self.interval:
+            self.last_call = now
+            return self.callback(*args, **kwargs)
+        if self.pending is None:
+            if self.event is None:
+                self.event = ScheduledEvent.schedule_once(
+                    self._flush, self.interval, start=False
+                )
+            self.event.start()
+            # Count the interval from the last call rather than from now
+            self.event.t0 = self.last_call
+        self.pending = (args, kwargs)
+
+    def _flush(self) -> None:
+        pending = self.pending
+        if pending is None:
+            # Cancelled by another thread
+            return
+        self.pending = None
+        self.last_call = time()
+        args, kwargs = pending
+        self.callback(*args, **kwargs)
+
+    def cancel(self) -> None:
+        self.pending = None
+        if self.event is not None:
+            self.event.stop()
+
+
+class DebouncedCallback(CallbackWrapper, CancellableCallback):
+    """
+    Calls the callback once no call has been made for `interval` seconds, on
+    the running Clock, with the arguments of the last call. Unbinding it
+    cancels the pending call. Raises RuntimeError if no Clock was created.
+    """
+
+    __slots__ = ("interval", "pending", "event")
+
+    def __init__(self, callback: Callable[..., Any], interval: float) -> None:
+        Clock.get_running_clock()
+        super().__init__(wrap_callback(callback))
+        self.interval = interval
+        self.pending: Optional[Tuple[tuple, dict]] = None
+        self.event: Optional[ScheduledEvent] = None
+
+    def __call__(self, *args: Any, **kwargs: Any) -> None:
+        self.pending = (args, kwargs)
+        if self.event is None:
+            self.event = ScheduledEvent.schedule_once(
+                self._flush, self.interval, start=False
+            )
+        # Restarts the timer, without scheduling the event twice
+        self.event.start()
+
+    def _flush(self) -> None:
+        pending = self.pending
+        if pending is None:
+            # Cancelled by another thread
+            return
+        self.pending = None
+        args, kwargs = pending
+        self.callback(*args, **kwargs)
+
+    def cancel(self) -> None:
+        self.pending = None
+        if self.event is not None:
+            self.event.stop()
+
+
+# Name under which the bind_any bindings are recorded in a Subscription
+ANY_PROPERTY = "*"
+
+# Executor used by the dispatchers that do not configure their own
+_default_executor: Optional[Executor] = None
+_default_executor_lock = threading.Lock()
+
+
+def get_default_executor() -> Executor:
+    """Return the shared ThreadPoolExecutor, creating it on first use."""
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = ThreadPoolExecutor(
+                thread_name_prefix="eventdispatcher"
+            )
+        return _default_executor
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the event loop running the coroutine callbacks bound in this
+    thread: the running loop, or else the current loop of the thread. Raises
+    BindError if the thread has no event loop.
+    """
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    try:
+        return asyncio.get_event_loop()
+    except RuntimeError:
+        raise BindError(
+            "Coroutine functions can only be bound in a thread with an"
+            " event loop, see asyncio.set_event_loop"
+        ) from None
+
+
+def wrap_callback(callback: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap coroutine functions in an AsyncCallback before binding them."""
+    if iscoroutinefunction(callback):
+        return AsyncCallback(callback)
+    return callback
+
+
+async def gather_callbacks(
+    callbacks: CallbackList, args: tuple, kwargs: dict
+) -> None:
+    """
+    Call the callbacks of a CallbackList in order and await the coroutines
+    they produce concurrently. A synchronous callback returning True stops
+    the propagation to the remaining callbacks.
+    """
+    awaitables = []
+    for callback in callbacks.snapshot:
+        if isinstance(callback, AsyncCallback):
+            awaitables.append(callback.callback(*args, **kwargs))
+            continue
+        result = callback(*args, **kwargs)
+        if isawaitable(result):
+            awaitables.append(result)
+        elif result:
+            break
+    if awaitables:
+        await asyncio.gather(*awaitables)
+
+
+def bind_many(
+    instances: Iterable["EventDispatcher"],
+    **kwargs: Dict[str, Callable[..., Any]]
+) -> List[Subscription]:
+    """
+    Bind the same callbacks to the properties or events of many dispatchers.
+    The names are looked up once per class rather than once per instance.
+    Nothing is bound if a name is missing from any of the instances.
+    :param instances: EventDispatcher instances to bind to
+    :param kwargs: {property name: callback} bindings
+    :return: one Subscription per instance, in order
+    """
+    bindings = [
+        (prop_name, wrap_callback(callback))
+        for prop_name, callback in iteritems(kwargs)
+    ]
+    # Whether all the names are properties, per class
+    all_properties: Dict[type, bool] = {}
+    # The CallbackLists of every instance are looked up before binding, so
+    # that a missing name raises BindError before anything is bound
+    targets = []
+    for instance in instances:
+        cls = type(instance)
+        properties_only = all_properties.get(cls)
+        if properties_only is None:
+            names = {entry[0] for entry in cls.get_property_registry()}
+            properties_only = all_properties[cls] = all(
+                prop_name in names for prop_name, _ in bindings
+            )
+        if properties_only:
+            properties = instance.event_dispatcher_properties
+            callback_lists = tuple(
+                properties[name]["callbacks"] for name, _ in bindings
+            )
+        else:
+            callback_lists = tuple(
+                instance._get_callbacks(name) for name, _ in bindings
+            )
+        targets.append((instance, callback_lists))
+    return [
+        Subscription(
+            instance,
+            tuple(
+                (name, callbacks.append(callback))
+                for (name, callback), callbacks in zip(
+                    bindings, callback_lists
+                )
+            ),
+        )
+        for instance, callback_lists in targets
+    ]
+
+
+def unbind_many(
+    instances: Iterable["EventDispatcher"],
+    **kwargs: Dict[str, Callable[..., Any]]
+) -> None:
+    """
+    Unbind the same callbacks from the properties or events of many
+    dispatchers. Prefer calling `unbind` on the Subscriptions returned by
+    bind_many, which does not have to search the callbacks.
+    :param instances: EventDispatcher instances to unbind from
+    :param kwargs: {property name: callback} bindings
+    """
+    for instance in instances:
+        instance.unbind(**kwargs)
+
+
+@contextlib.contextmanager
+def batch(*dispatchers: "EventDispatcher") -> None:
+    """
+    Context manager that defers the dispatching of property changes on the
+    given dispatchers until the with statement exits. Each property that
+    changed is then dispatched once, with its final value. Properties that
+    ended up back at their original value are not dispatched. Batches can be
+    nested, the outermost one dispatches.
+    :param dispatchers: EventDispatcher instances to batch
+    """
+    # Enter / With
+    from .propertygraph import property_graph
+
+    # Propagate the property bindings once, after the batched dispatches
+    property_graph.hold()
+    held = []
+    held_any = []
+    for dispatcher in dispatchers:
+        for info in dispatcher.event_dispatcher_properties.values():
+            callbacks = info["callbacks"]
+            callbacks.hold()
+            prop = info["property"]
+            # The compare strategies check the final value against the
+            # record as it was before the batch, see compare.VersionCounter
+            record = None if prop.changed is None else copy(info)
+            held.append(
+                (dispatcher, info, callbacks, prop.snapshot(info), record)
+            )
+        any_callbacks = dispatcher.event_dispatcher_any_callbacks
+        if any_callbacks is not None:
+            any_callbacks.hold()
+            held_any.append(any_callbacks)
+    try:
+        # Inside of with statement
+        yield None
+    finally:
+        # Finally / Exit
+        try:
+            # The bind_any callbacks are called for every property that
+            # changed rather than with the last change only.
+            for any_callbacks in held_any:
+                any_callbacks.release()
+            for dispatcher, info, callbacks, original, record in held:
+                dispatched = callbacks.release()
+                if dispatched is None:
+                    continue
+                try:
+                    if record is None:
+                        changed = bool(original != info["value"])
+                    else:
+                        changed = info["property"].changed(
+                            record, original, info["value"]
+                        )
+                except Exception:
+                    # Comparisons that do not evaluate to a scalar boolean
+                    # (eg. numpy arrays) are assumed to have changed.
+                    changed = True
+                if not changed:
+                    continue
+                args, kwargs = dispatched
+                fire = info["callbacks"].fire
+                if fire is not None:
+                    fire(*args, **kwargs)
+                if dispatcher.event_dispatcher_any_callbacks is not None:
+                    dispatcher.dispatch_any(info["name"], args[-1])
+        finally:
+            property_graph.release()
 
 
 class EventDispatcher:
+    # Store the per-instance property state in slot-based PropertyInfo
+    # records rather than dictionaries. Trades some access speed for a
+    # smaller memory footprint per instance.
+    compact_properties: bool = False
+    # Queue property and event dispatches on the running Clock, which calls
+    # the bindings once per cycle. See set_deferred_dispatch.
+    deferred_dispatch: bool = False
+    # Executor that runs the callbacks bound with bind_offloaded. Falls back
+    # to a shared ThreadPoolExecutor when None.
+    executor: Optional[Executor] = None
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         self.event_dispatcher_event_callbacks: Dict[str, List[callable]] = {}
         self.event_dispatcher_properties: Dict[str, Dict[str, Any]] = {}
-        bindings: Dict[str, callable] = EventDispatcher.register_properties(
-            self
+        # Callbacks bound with bind_any, created by the first call to bind_any.
+        # An instance attribute keeps the check in the setters cheap.
+        self.event_dispatcher_any_callbacks: Optional[CallbackList] = None
+        all_properties = self.event_dispatcher_properties
+        for prop_name, prop, handler in self.get_property_registry():
+            prop.register(self, prop_name, prop.default_value)
+            if handler is not None:
+                all_properties[prop_name]["callbacks"].append(handler(self))
+        observed = self.get_class_observers()
+        if observed:
+            self._bind_class_observers(observed, all_properties)
+        if self.deferred_dispatch:
+            self.set_deferred_dispatch(True)
+
+    @classmethod
+    def get_property_registry(
+        cls,
+    ) -> Tuple[Tuple[str, Property, Optional[Callable]], ...]:
+        """
+        Return the table of (property name, Property, default handler getter)
+        entries for this class. The table is built once per class by walking
+        backwards through the MRO and is then shared by every instance.
+        Walking backwards allows you to override the default value for a
+        superclass.
+
+        The default handler getter returns the callback to bind to the
+        'on_<prop_name>' method of an instance if the class defines it,
+        otherwise it is None.
+        """
+        try:
+            return cls.__dict__["_event_dispatcher_registry"]
+        except KeyError:
+            pass
+        properties: Dict[str, Property] = {}
+        for klass in reversed(cls.__mro__):
+            for prop_name, prop in iteritems(klass.__dict__):
+                if isinstance(prop, Property):
+                    prop.name = prop_name
+                    properties[prop_name] = prop
+        properties = EventDispatcher._dependency_order(properties)
+        registry = tuple(
+            (
+                prop_name,
+                prop,
+                EventDispatcher._handler_getter(
+                    cls, "on_{}".format(prop_name)
+                ),
+            )
+            for prop_name, prop in iteritems(properties)
+        )
+        cls._event_dispatcher_registry = registry
+        return registry
+
+    @staticmethod
+    def _dependency_order(
+        properties: Dict[str, Property]
+    ) -> Dict[str, Property]:
+        """
+        Order the properties so that the properties computed from others
+        (those with a 'depends_on' attribute) come after their dependencies.
+        """
+        if not any(
+            getattr(prop, "depends_on", None) for prop in properties.values()
+        ):
+            return properties
+        ordered: Dict[str, Property] = {}
+        visited: Set[str] = set()
+
+        def visit(prop_name: str) -> None:
+            if prop_name in visited or prop_name not in properties:
+                return
+            visited.add(prop_name)
+            prop = properties[prop_name]
+            for dependency in getattr(prop, "depends_on", ()):
+                visit(dependency)
+            ordered[prop_name] = prop
+
+        for prop_name in properties:
+            visit(prop_name)
+        return ordered
+
+    @classmethod
+    def get_class_observers(cls) -> Dict[str, Tuple[Callable[..., Any], ...]]:
+        """
+        Return the callbacks that bind the observers of this class and its
+        superclasses (see `observe`) to an instance, by property / event name.
+        Cached per class like the property registry.
+        """
+        try:
+            return cls.__dict__["_event_dispatcher_observed"]
+        except KeyError:
+            pass
+        # Called when the instances are created, tells observe that some
+        # were created before it
+        cls._event_dispatcher_instantiated = True
+        observed: Dict[str, List[Callable[..., Any]]] = {}
+        for klass in reversed(cls.__mro__):
+            observers = klass.__dict__.get("_event_dispatcher_observers")
+            if observers is not None:
+                for prop_name, callbacks in iteritems(observers.callbacks):
+                    observed.setdefault(prop_name, []).append(
+                        callbacks.call_all
+                    )
+        cls._event_dispatcher_observed = {
+            prop_name: tuple(forwarders)
+            for prop_name, forwarders in iteritems(observed)
+        }
+        return cls._event_dispatcher_observed
+
+    def _bind_class_observers(
+        self,
+        observed: Dict[str, Tuple[Callable[..., Any], ...]],
+        names: Iterable[str],
+    ) -> None:
+        for prop_name in names:
+            forwarders = observed.get(prop_name)
+            if forwarders:
+                callbacks = self._get_callbacks(prop_name)
+                for forwarder in forwarders:
+                    callbacks.append(forwarder)
+
+    @classmethod
+    def observe(cls, **kwargs: Dict[str, Callable[..., Any]]) -> Subscription:
+        """
+        Bind a function to a property or event of every instance of this
+        class and its subclasses, without binding to each instance. The
+        callbacks receive the same arguments as the instance bindings.
+
+        Instances are hooked up to the observers of a name when they are
+        created, so observe a name before creating the instances. Observing
+        a name that is not observed yet once instances of the class, or of
+        its subclasses, have been created raises BindError, since those
+        instances would not be observed. Observing more callbacks on a name
+        that is already observed affects all the instances.
+        :param kwargs: {property name: callback} bindings
+        :return: Subscription that removes these observers in O(1)
+        """
+        observers = cls.__dict__.get("_event_dispatcher_observers")
+        if observers is None:
+            observers = cls._event_dispatcher_observers = ClassObservers()
+        new_names = [
+            prop_name
+            for prop_name in kwargs
+            if prop_name not in observers.callbacks
+        ]
+        if new_names:
+            if EventDispatcher._instantiated(cls):
+                raise BindError(
+                    "Cannot observe {} after instances of {} were "
+                    "created".format(
+                        ", ".join(map(repr, new_names)), cls.__name__
+                    )
+                )
+            for prop_name in new_names:
+                observers.callbacks[prop_name] = CallbackList()
+            EventDispatcher.invalidate_property_registry(cls)
+        bindings: List[Tuple[str, int]] = []
+        for prop_name, callback in iteritems(kwargs):
+            callbacks = observers.callbacks[prop_name]
+            key = callbacks.append(wrap_callback(callback))
+            bindings.append((prop_name, key))
+        return Subscription(observers, tuple(bindings))
+
+    @staticmethod
+    def _instantiated(cls: type) -> bool:
+        """Whether instances of the class or its subclasses were created."""
+        return "_event_dispatcher_instantiated" in cls.__dict__ or any(
+            EventDispatcher._instantiated(subclass)
+            for subclass in cls.__subclasses__()
         )
-        self.bind(**bindings)
+
+    @staticmethod
+    def _handler_getter(cls: type, handler_name: str) -> Optional[Callable]:
+        handler = getattr(cls, handler_name, None)
+        if handler is None:
+            return None
+        elif iscoroutinefunction(handler):
+            return lambda obj: AsyncCallback(getattr(obj, handler_name))
+        else:
+            return attrgetter(handler_name)
+
+    @staticmethod
+    def invalidate_property_registry(cls: type) -> None:
+        """
+        Discard the cached property registry and class observers of a class
+        and all of its subclasses. This must be called if Property attributes
+        are added to a class after it has been instantiated.
+        """
+        if "_event_dispatcher_registry" in cls.__dict__:
+            del cls._event_dispatcher_registry
+        if "_event_dispatcher_observed" in cls.__dict__:
+            del cls._event_dispatcher_observed
+        for subclass in cls.__subclasses__():
+            EventDispatcher.invalidate_property_registry(subclass)
 
     @staticmethod
     def register_properties(
         obj: Any, properties: Dict[str, Property] = None
     ) -> Dict[str, callable]:
         """
-        Walk backwards through the MRO looking for event dispatcher Property
-        attributes in the classes. Then register and bind them to the default
-        handler 'on_<prop_name>' if it exists. Walking backwards allows you to
-        override the default value for a superclass.
+        Register the event dispatcher Property attributes of the object's
+        class and return the bindings to the default handler 'on_<prop_name>'
+        for those that have one.
 
         If the 'properties' argument is given, then only register the
         properties in the dictionary 'properties' must be a dictionary of keys
@@ -33,26 +713,35 @@ class EventDispatcher:
         """
         bindings: Dict[str, callable] = {}
         if properties is None:
-            for cls in reversed(obj.__class__.__mro__):
-                for prop_name, prop in iteritems(cls.__dict__):
-                    if isinstance(prop, Property):
-                        prop.name = prop_name
-                        prop.register(obj, prop_name, prop.default_value)
-                        if hasattr(obj, "on_%s" % prop_name):
-                            bindings[prop_name] = getattr(
-                                obj, "on_{}".format(prop_name)
-                            )
+            for prop_name, prop, handler in obj.get_property_registry():
+                prop.register(obj, prop_name, prop.default_value)
+                if handler is not None:
+                    bindings[prop_name] = handler(obj)
         else:
             for prop_name, prop in iteritems(properties):
                 prop.name = prop_name
                 prop.register(obj, prop_name, prop.default_value)
+                if obj.deferred_dispatch:
+                    obj.event_dispatcher_properties[prop_name][
+                        "callbacks"
+                    ].set_deferred(True)
                 if hasattr(obj, "on_%s" % prop_name):
                     bindings[prop_name] = getattr(
                         obj, "on_{}".format(prop_name)
                     )
+            observed = obj.get_class_observers()
+            if observed:
+                obj._bind_class_observers(observed, properties)
 
         return bindings
 
+    def batch(self) -> contextlib.AbstractContextManager:
+        """
+        Context manager that defers the dispatching of property changes until
+        the with statement exits. See eventdispatcher.batch.
+        """
+        return batch(self)
+
     def force_dispatch(self, prop_name: str, value: Any) -> None:
         """
         Assigns the value to the property and then dispatches the event,
@@ -66,6 +755,69 @@ class EventDispatcher:
         else:
             setattr(self, prop_name, value)
 
+    def set_silent(self, prop_name: str, value: Any) -> None:
+        """
+        Assign the value to the property without dispatching it. Computed
+        properties that depend on it are marked dirty.
+        :param prop_name: property name
+        :param value: value to assign to the property
+        """
+        self.set_properties(dispatch="none", **{prop_name: value})
+
+    def set_properties(self, dispatch: str = "each", **values: Any) -> None:
+        """
+        Assign several properties at once.
+        :param dispatch: 'each' dispatches every change as it is assigned,
+        'once' dispatches each property that changed once, with its final
+        value, after all the values are assigned (see batch), and 'none'
+        assigns the values without dispatching.
+        :param values: {property name: value}
+        """
+        if dispatch == "each":
+            for prop_name, value in iteritems(values):
+                setattr(self, prop_name, value)
+        elif dispatch == "once":
+            with batch(self):
+                for prop_name, value in iteritems(values):
+                    setattr(self, prop_name, value)
+        elif dispatch == "none":
+            self._set_silent(values)
+        else:
+            raise ValueError(
+                "dispatch must be 'each', 'once' or 'none', not %r"
+                % (dispatch,)
+            )
+
+    def _set_silent(self, values: Dict[str, Any]) -> None:
+        # The properties store the values without dispatching, rather than
+        # holding callbacks that other threads may dispatch meanwhile
+        from .computedproperty import mark_dependents_dirty
+
+        all_properties = self.event_dispatcher_properties
+        for prop_name, value in iteritems(values):
+            info = all_properties[prop_name]
+            if info["property"].store(self, info, value):
+                # Computed properties are invalidated without dispatching
+                mark_dependents_dirty(info)
+
+    def set_deferred_dispatch(self, deferred: bool) -> None:
+        """
+        Switch the dispatching of all properties and events to deferred mode
+        and back. In deferred mode, assigning a property or dispatching an
+        event queues the dispatch on the running Clock instead of calling the
+        bindings. The Clock calls the bindings once per cycle, with the last
+        value of that cycle, no matter how many times the property changed.
+        Raises RuntimeError if no Clock was created.
+        :param deferred: True to defer the dispatches
+        """
+        if deferred:
+            Clock.get_running_clock()
+        self.deferred_dispatch = deferred
+        for info in self.event_dispatcher_properties.values():
+            info["callbacks"].set_deferred(deferred)
+        for callbacks in self.event_dispatcher_event_callbacks.values():
+            callbacks.set_deferred(deferred)
+
     def dispatch(self, key: str, *args: Any, **kwargs: Any) -> None:
         """
         Dispatch a property. This calls all functions bound to the property.
@@ -73,9 +825,61 @@ class EventDispatcher:
         :param args: arguments to provide to the bindings
         :param kwargs: keyword arguments to provide to the bindings
         """
-        for callback in self.event_dispatcher_properties[key]["callbacks"]:
-            if callback(*args, **kwargs):
-                break
+        info = self.event_dispatcher_properties[key]
+        dependents = info["dependents"]
+        if dependents is not None:
+            for dependent in dependents:
+                dependent()
+        fire = info["callbacks"].fire
+        if fire is not None:
+            fire(*args, **kwargs)
+        if self.event_dispatcher_any_callbacks is not None:
+            value = (
+                args[-1]
+                if args
+                else self.event_dispatcher_properties[key]["value"]
+            )
+            self.dispatch_any(key, value)
+
+    def dispatch_any(self, prop_name: str, value: Any) -> None:
+        """
+        Call the callbacks bound with bind_any for a property change.
+        :param prop_name: name of the property that changed
+        :param value: new value of the property
+        """
+        fire = self.event_dispatcher_any_callbacks.fire
+        if fire is not None:
+            fire(self, prop_name, value)
+
+    async def dispatch_async(
+        self, key: str, *args: Any, **kwargs: Any
+    ) -> None:
+        """
+        Dispatch a property, awaiting the coroutine callbacks concurrently.
+        Synchronous callbacks are called in order and can still stop the
+        propagation by returning True.
+        :param key: property name
+        :param args: arguments to provide to the bindings
+        :param kwargs: keyword arguments to provide to the bindings
+        """
+        await gather_callbacks(
+            self.event_dispatcher_properties[key]["callbacks"], args, kwargs
+        )
+
+    async def dispatch_event_async(
+        self, event: str, *args: Any, **kwargs: Any
+    ) -> None:
+        """
+        Dispatch an event, awaiting the coroutine callbacks concurrently.
+        Synchronous callbacks are called in order and can still stop the
+        propagation by returning True.
+        :param event: event name
+        :param args: arguments to provide to the bindings
+        :param kwargs: keyword arguments to provide to the bindings
+        """
+        await gather_callbacks(
+            self.event_dispatcher_event_callbacks[event], args, kwargs
+        )
 
     def dispatch_event(self, event: str, *args: Any, **kwargs: Any) -> None:
         """
@@ -84,9 +888,9 @@ class EventDispatcher:
         :param args: arguments to provide to the bindings
         :param kwargs: keyword arguments to provide to the bindings
         """
-        for callback in self.event_dispatcher_event_callbacks[event]:
-            if callback(*args, **kwargs):
-                break
+        fire = self.event_dispatcher_event_callbacks[event].fire
+        if fire is not None:
+            fire(*args, **kwargs)
 
     def register_event(self, *event_names: str) -> None:
         """
@@ -97,12 +901,17 @@ class EventDispatcher:
             default_dispatcher = getattr(
                 self, "on_{}".format(event_name), None
             )
-            if default_dispatcher:
-                self.event_dispatcher_event_callbacks[event_name] = [
-                    default_dispatcher
-                ]
-            else:
-                self.event_dispatcher_event_callbacks[event_name] = []
+            callbacks = CallbackList(
+                [wrap_callback(default_dispatcher)]
+                if default_dispatcher
+                else []
+            )
+            if self.deferred_dispatch:
+                callbacks.set_deferred(True)
+            self.event_dispatcher_event_callbacks[event_name] = callbacks
+        observed = self.get_class_observers()
+        if observed:
+            self._bind_class_observers(observed, event_names)
 
     def unbind(self, **kwargs: Dict[str, Callable[..., Any]]) -> None:
         """
@@ -146,50 +955,202 @@ class EventDispatcher:
         all_properties = self.event_dispatcher_properties
         for prop_name in args:
             if prop_name in all_properties:
-                del all_properties[prop_name]["callbacks"][:]
+                all_properties[prop_name]["callbacks"].clear()
             elif prop_name in self.event_dispatcher_event_callbacks:
-                del self.event_dispatcher_event_callbacks[prop_name][:]
+                self.event_dispatcher_event_callbacks[prop_name].clear()
             else:
                 raise BindError("No such property or event '%s'" % prop_name)
 
-    def bind(self, **kwargs: Dict[str, Callable[..., Any]]) -> None:
+    def bind(self, **kwargs: Dict[str, Callable[..., Any]]) -> Subscription:
         """
         Bind a function to a property or event.
         :param kwargs: {property name: callback} bindings
+        :return: Subscription that removes these bindings in O(1)
         """
+        bindings: List[Tuple[str, int]] = []
         for prop_name, callback in iteritems(kwargs):
-            if prop_name in self.event_dispatcher_properties:
-                # Queue the callback into the property
-                self.event_dispatcher_properties[prop_name][
-                    "callbacks"
-                ].append(callback)
-            elif prop_name in self.event_dispatcher_event_callbacks:
-                # If a property was not found, search in events
-                self.event_dispatcher_event_callbacks[prop_name].append(
-                    callback
-                )
-            else:
-                raise BindError(
-                    "No property or event by the name of '%s'" % prop_name
-                )
+            callbacks = self._get_callbacks(prop_name)
+            key = callbacks.append(wrap_callback(callback))
+            bindings.append((prop_name, key))
+        return Subscription(self, tuple(bindings))
+
+    def unbind_subscription(self, subscription: Subscription) -> None:
+        """
+        Remove the bindings of a Subscription returned by bind. Bindings that
+        were already removed are ignored.
+        :param subscription: Subscription returned by bind
+        """
+        for prop_name, key in subscription.bindings:
+            self._get_callbacks(prop_name).discard(key)
+
+    def _get_callbacks(self, prop_name: str) -> CallbackList:
+        if prop_name in self.event_dispatcher_properties:
+            return self.event_dispatcher_properties[prop_name]["callbacks"]
+        elif prop_name in self.event_dispatcher_event_callbacks:
+            # If a property was not found, search in events
+            return self.event_dispatcher_event_callbacks[prop_name]
+        elif (
+            prop_name == ANY_PROPERTY
+            and self.event_dispatcher_any_callbacks is not None
+        ):
+            return self.event_dispatcher_any_callbacks
+        else:
+            raise BindError(
+                "No property or event by the name of '%s'" % prop_name
+            )
+
+    def bind_weak(
+        self, **kwargs: Dict[str, Callable[..., Any]]
+    ) -> Subscription:
+        """
+        Bind a function to a property or event while only holding a weak
+        reference to it. A bound method does not keep its instance alive, and
+        the binding is removed once the callback has been garbage collected.
+        :param kwargs: {property name: callback} bindings
+        :return: Subscription that removes these bindings in O(1)
+        """
+        bindings: List[Tuple[str, int]] = []
+        for prop_name, callback in iteritems(kwargs):
+            weak_callback = WeakCallback(callback)
+            weak_callback.subscription = self.bind(
+                **{prop_name: weak_callback}
+            )
+            bindings.extend(weak_callback.subscription.bindings)
+        return Subscription(self, tuple(bindings))
+
+    def bind_any(self, callback: Callable[..., Any]) -> Subscription:
+        """
+        Bind a function to the changes of all the properties of the
+        dispatcher, including the properties registered after this call. The
+        callback receives (instance, property name, value). It is called after
+        the bindings of the property, and is not deferred by the deferred
+        dispatch mode.
+        :param callback: callback function
+        :return: Subscription that removes this binding in O(1)
+        """
+        callbacks = self.event_dispatcher_any_callbacks
+        if callbacks is None:
+            callbacks = self.event_dispatcher_any_callbacks = CallbackList()
+        key = callbacks.append(wrap_callback(callback))
+        return Subscription(self, ((ANY_PROPERTY, key),))
+
+    def unbind_any(self, callback: Callable[..., Any]) -> None:
+        """
+        Unbind a function bound with bind_any.
+        :param callback: callback function
+        """
+        try:
+            self._get_callbacks(ANY_PROPERTY).remove(callback)
+        except ValueError:
+            raise BindError(
+                "No binding for {} in any property".format(callback.__name__)
+            )
+
+    def bind_throttled(
+        self, interval: float, **kwargs: Dict[str, Callable[..., Any]]
+    ) -> Subscription:
+        """
+        Bind a function to a property or event so that it is called at most
+        once every `interval` seconds. Changes within the interval are
+        delivered once it has passed, with the last value. The delayed calls
+        are made by the running Clock.
+        :param interval: minimum number of seconds between two calls
+        :param kwargs: {property name: callback} bindings
+        :return: Subscription that removes these bindings in O(1)
+        """
+        return self.bind(
+            **{
+                prop_name: ThrottledCallback(callback, interval)
+                for prop_name, callback in iteritems(kwargs)
+            }
+        )
+
+    def bind_debounced(
+        self, interval: float, **kwargs: Dict[str, Callable[..., Any]]
+    ) -> Subscription:
+        """
+        Bind a function to a property or event so that it is only called once
+        the property or event has been quiet for `interval` seconds, with the
+        last value. The calls are made by the running Clock.
+        :param interval: number of quiet seconds before the call
+        :param kwargs: {property name: callback} bindings
+        :return: Subscription that removes these bindings in O(1)
+        """
+        return self.bind(
+            **{
+                prop_name: DebouncedCallback(callback, interval)
+                for prop_name, callback in iteritems(kwargs)
+            }
+        )
+
+    def bind_offloaded(
+        self, **kwargs: Dict[str, Callable[..., Any]]
+    ) -> Subscription:
+        """
+        Bind a function to a property or event so that it is submitted to the
+        executor of the dispatcher rather than called on the dispatching
+        thread. Offloaded callbacks cannot stop the propagation. Use
+        wait_offloaded to wait for them to finish.
+        :param kwargs: {property name: callback} bindings
+        :return: Subscription that removes these bindings in O(1)
+        """
+        return self.bind(
+            **{
+                prop_name: OffloadedCallback(callback, self)
+                for prop_name, callback in iteritems(kwargs)
+            }
+        )
+
+    def get_executor(self) -> Executor:
+        """Return the executor that runs the offloaded callbacks."""
+        return self.executor or get_default_executor()
+
+    @property
+    def event_dispatcher_futures(self) -> Set[Future]:
+        """Futures of the offloaded callbacks that are still running."""
+        try:
+            return self.__dict__["_event_dispatcher_futures"]
+        except KeyError:
+            return self.__dict__.setdefault("_event_dispatcher_futures", set())
+
+    def wait_offloaded(self, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for the offloaded callbacks that are running to finish.
+        :param timeout: maximum number of seconds to wait, None for no limit
+        :return: (done, not_done) sets of futures, see concurrent.futures.wait
+        """
+        return wait(set(self.event_dispatcher_futures), timeout)
 
-    def bind_once(self, **kwargs: Dict[str, callable]) -> None:
+    def bind_once(self, **kwargs: Dict[str, callable]) -> Subscription:
         """
         Bind a function to a property or event and unbind it after the first
         time the function has been called.
         :param kwargs: {property name: callback} bindings
+        :return: Subscription that removes these bindings in O(1)
         """
-        for prop_name, callback in iteritems(kwargs.copy()):
+        bindings: List[Tuple[str, int]] = []
+        for prop_name, callback in iteritems(kwargs):
+            bindings.extend(self._bind_once(prop_name, callback).bindings)
+        return Subscription(self, tuple(bindings))
 
-            def _wrapped_binding(*args: Any) -> None:
-                callback()
-                self.unbind(**{prop_name: _wrapped_binding})
+    def _bind_once(self, prop_name: str, callback: callable) -> Subscription:
+        # Another thread can dispatch as soon as the binding is appended, the
+        # lock makes it wait for the subscription and lets only one call in.
+        lock = threading.Lock()
+        called = []
+        callback = wrap_callback(callback)
 
-            self.bind(**{prop_name: _wrapped_binding})
-            kwargs.pop(prop_name)
-            if kwargs:
-                self.bind_once(**kwargs)
-                return
+        def _wrapped_binding(*args: Any) -> None:
+            with lock:
+                if called:
+                    return
+                called.append(True)
+            subscription.unbind()
+            callback()
+
+        with lock:
+            subscription = self.bind(**{prop_name: _wrapped_binding})
+        return subscription
 
     def setter(self, prop_name: str) -> callable:
         return lambda inst, value: setattr(self, prop_name, value)
@@ -210,16 +1171,16 @@ class EventDispatcher:
         for prop_name, binding in iteritems(bindings):
             if prop_name in all_properties:
                 # Make a copy of the callback sequence so we can revert back
-                callbacks[prop_name] = all_properties[prop_name]["callbacks"][
-                    :
-                ]
+                callbacks[prop_name] = all_properties[prop_name][
+                    "callbacks"
+                ].copy()
                 # Remove the specified bindings
                 if binding in all_properties[prop_name]["callbacks"]:
                     all_properties[prop_name]["callbacks"].remove(binding)
             elif prop_name in self.event_dispatcher_event_callbacks:
                 callbacks[prop_name] = self.event_dispatcher_event_callbacks[
                     prop_name
-                ][:]
+                ].copy()
                 self.event_dispatcher_event_callbacks[prop_name].remove(
                     binding
                 )
@@ -251,12 +1212,14 @@ class EventDispatcher:
                 property_callbacks[name] = self.event_dispatcher_properties[
                     name
                 ]["callbacks"]
-                self.event_dispatcher_properties[name]["callbacks"] = []
+                self.event_dispatcher_properties[name][
+                    "callbacks"
+                ] = CallbackList()
             if name in self.event_dispatcher_event_callbacks:
                 event_callbacks[name] = self.event_dispatcher_event_callbacks[
                     name
                 ]
-                self.event_dispatcher_event_callbacks[name] = []
+                self.event_dispatcher_event_callbacks[name] = CallbackList()
         # Inside of with statement
         yield None
         # Finally / Exit
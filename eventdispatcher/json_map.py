@@ -201,6 +201,7 @@ class JSON_Map(EventDispatcher):
                 ](value)
                 setattr(cls, attr, properties[attr])
         if unregistered:
+            EventDispatcher.invalidate_property_registry(cls)
             EventDispatcher.register_properties(obj, unregistered)
         return properties
 
@@ -6,36 +6,29 @@ from . import Property
 
 
 class LimitProperty(Property):
-    def __init__(self, default_value: Any, min: Any, max: Any):
-        super().__init__(default_value, min=min, max=max)
+    def __init__(
+        self, default_value: Any, min: Any, max: Any, compare: Any = None
+    ):
+        super().__init__(default_value, compare=compare, min=min, max=max)
 
     def __get__(self, obj: Any, objtype: Any = None) -> Any:
         return obj.event_dispatcher_properties[self.name]['value']
 
     def __set__(self, obj: Any, value: Any) -> None:
         info = obj.event_dispatcher_properties[self.name]
-        if value != info['value']:
-            # Clip the value to be within min/max
-            if value < info['min']:
-                # Only dispatch if the current value
-                # is not already clipped to the minimum
-                if info['value'] != info['min']:
-                    info['value'] = info['min']
-                else:
-                    return
-            elif value > info['max']:
-                # Only dispatch if the current value
-                # is not already clipped to the maximum
-                if info['value'] != info['max']:
-                    info['value'] = value = info['max']
-                else:
-                    return
-            else:
-                info['value'] = value
+        if self.store(obj, info, value):
+            value = info['value']
             # Dispatch callbacks
-            for callback in info['callbacks']:
-                if callback(obj, value):
-                    break
+            self.notify(obj, info, value)
+
+    def store(self, obj: Any, info: Any, value: Any) -> bool:
+        # Clip the value to be within min/max, and only dispatch if the
+        # current value is not already clipped to it
+        if value < info['min']:
+            value = info['min']
+        elif value > info['max']:
+            value = info['max']
+        return super().store(obj, info, value)
 
     def __delete__(self, obj: Any) -> None:
         raise AttributeError("Cannot delete properties")
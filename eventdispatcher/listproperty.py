@@ -105,27 +105,34 @@ class ListProperty(Property):
         value: list,
         dtype: type = None,
     ) -> None:
-        self.value = ObservableList(
+        value = ObservableList(
             value,
             dispatch_method=partial(
                 instance.dispatch, property_name, instance
             ),
             dtype=self._additionals.get("dtype"),
         )
-        super(ListProperty, self).register(instance, property_name, self.value)
+        super(ListProperty, self).register(instance, property_name, value)
+
+    def snapshot(self, info: dict) -> list:
+        return info["value"].copy()
 
     def __set__(self, obj: object, value: list) -> None:
-        p = self.instances[obj]
+        p = obj.event_dispatcher_properties[self.name]
+        if self.store(obj, p, value):
+            self.notify(obj, p, p["value"].list)
+
+    def store(self, obj: object, p: dict, value: list) -> bool:
         # Check if we need to dispatch
-        do_dispatch = len(p["value"].list) != len(
-            value
-        ) or not ListProperty.compare_sequences(p["value"], value)
+        if self.changed is not None:
+            do_dispatch = self.changed(p, p["value"].list, value)
+        else:
+            do_dispatch = len(p["value"].list) != len(
+                value
+            ) or not ListProperty.compare_sequences(p["value"], value)
         # do_dispatch = not ListProperty.compare_sequences(p['value'], value)
         p["value"].list[:] = value  # Assign to ObservableList's value
-        if do_dispatch:
-            for callback in p["callbacks"]:
-                if callback(obj, p["value"].list):
-                    break
+        return do_dispatch
 
     @staticmethod
     def compare_sequences(iter1: list, iter2: list) -> bool:
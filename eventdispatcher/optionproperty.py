@@ -1,12 +1,20 @@
+from typing import Any
+
 from . import Property
 from .exceptions import InvalidOptionError
 
 
 class OptionProperty(Property):
     def __init__(
-        self, default_value: str, options: list, handler: callable = None
+        self,
+        default_value: str,
+        options: list,
+        handler: callable = None,
+        compare: Any = None,
     ):
-        super().__init__(default_value, options=options, handler=None)
+        super().__init__(
+            default_value, compare=compare, options=options, handler=None
+        )
         self.handler = handler
         self.options = set(options) if options else set()
         if default_value not in self.options:
@@ -22,6 +30,15 @@ class OptionProperty(Property):
         else:
             raise InvalidOptionError(value, self.options)
 
+    def store(self, obj, info, value: str) -> bool:
+        if value in self.options:
+            return super(OptionProperty, self).store(obj, info, value)
+        elif self.handler:
+            self.handler(obj, value)
+            return False
+        else:
+            raise InvalidOptionError(value, self.options)
+
     @staticmethod
     def set_options(inst, name: str, options: list):
         inst.event_dispatcher_properties[name]["options"].options = set(
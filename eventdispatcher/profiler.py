@@ -0,0 +1,272 @@
+__author__ = "calvin"
+
+import json
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .callbacklist import CallbackList
+from .eventdispatcher import EventDispatcher
+
+
+class DispatchStats(object):
+    """Dispatch statistics of one property or event of a class."""
+
+    __slots__ = ("dispatches", "callback_calls", "max_fan_out", "callbacks")
+
+    def __init__(self) -> None:
+        self.dispatches = 0
+        self.callback_calls = 0
+        self.max_fan_out = 0
+        self.callbacks: Dict[str, CallbackStats] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "dispatches": self.dispatches,
+            "mean_fan_out": self.callback_calls / (self.dispatches or 1),
+            "max_fan_out": self.max_fan_out,
+            "callbacks": {
+                name: stats.to_dict()
+                for name, stats in self.callbacks.items()
+            },
+        }
+
+
+class CallbackStats(object):
+    """Timing statistics of one callback."""
+
+    __slots__ = ("calls", "total_time", "max_time")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "max_time": self.max_time,
+        }
+
+
+class DispatchProfiler(object):
+    """
+    Records, per dispatcher class, property / event and callback, how many
+    times it was dispatched, how many callbacks each dispatch called and how
+    long the callbacks took.
+
+    Profiling swaps instrumented dispatch paths in while it is enabled and
+    restores the originals when it is disabled, so dispatching costs nothing
+    extra when no profiler is running. Only one profiler can be enabled at a
+    time. Can be used as a context manager:
+
+        with DispatchProfiler() as profiler:
+            run_application()
+        print(profiler.report())
+    """
+
+    active: Optional["DispatchProfiler"] = None
+
+    def __init__(self) -> None:
+        self.stats: Dict[Tuple[str, str], DispatchStats] = {}
+        # Maps id(CallbackList) to its owner so that property dispatches can
+        # be attributed without storing the owner in every CallbackList.
+        self._owners: Dict[int, Tuple[CallbackList, str, str]] = {}
+        self._originals: Dict[str, Any] = {}
+
+    def __enter__(self) -> "DispatchProfiler":
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.disable()
+
+    def enable(self) -> None:
+        if DispatchProfiler.active is not None:
+            raise RuntimeError("A DispatchProfiler is already enabled.")
+        DispatchProfiler.active = self
+        fire_slot = CallbackList.__dict__["fire"]
+        original_dispatch = EventDispatcher.__dict__["dispatch"]
+        original_dispatch_event = EventDispatcher.__dict__["dispatch_event"]
+        self._originals = {
+            "fire": fire_slot,
+            "dispatch": original_dispatch,
+            "dispatch_event": original_dispatch_event,
+        }
+        profiler = self
+
+        def get_fire(callbacks: CallbackList) -> Optional[Callable]:
+            fire = fire_slot.__get__(callbacks, CallbackList)
+            if fire is None or callbacks._holds or callbacks._deferred:
+                return fire
+
+            def profiled_fire(*args: Any, **kwargs: Any) -> None:
+                cls_name, name = profiler._owner(callbacks, args)
+                profiler.call(cls_name, name, callbacks, args, kwargs)
+
+            return profiled_fire
+
+        # The original methods dispatch through the profiled fire, they are
+        # wrapped to tell it the owner of the callbacks
+        def dispatch(
+            dispatcher: EventDispatcher, key: str, *args: Any, **kwargs: Any
+        ) -> None:
+            info = dispatcher.event_dispatcher_properties[key]
+            profiler._set_owner(info["callbacks"], dispatcher, key)
+            original_dispatch(dispatcher, key, *args, **kwargs)
+
+        def dispatch_event(
+            dispatcher: EventDispatcher, event: str, *args: Any, **kwargs: Any
+        ) -> None:
+            callbacks = dispatcher.event_dispatcher_event_callbacks[event]
+            profiler._set_owner(callbacks, dispatcher, event)
+            original_dispatch_event(dispatcher, event, *args, **kwargs)
+
+        CallbackList.fire = property(get_fire, fire_slot.__set__)
+        EventDispatcher.dispatch = dispatch
+        EventDispatcher.dispatch_event = dispatch_event
+
+    def disable(self) -> None:
+        if DispatchProfiler.active is not self:
+            return
+        CallbackList.fire = self._originals["fire"]
+        EventDispatcher.dispatch = self._originals["dispatch"]
+        EventDispatcher.dispatch_event = self._originals["dispatch_event"]
+        self._owners.clear()
+        DispatchProfiler.active = None
+
+    def reset(self) -> None:
+        self.stats.clear()
+
+    def _set_owner(
+        self, callbacks: CallbackList, dispatcher: EventDispatcher, name: str
+    ) -> None:
+        # Keep a reference to the CallbackList so that its id is not reused
+        self._owners[id(callbacks)] = (
+            callbacks,
+            type(dispatcher).__name__,
+            name,
+        )
+
+    def _owner(self, callbacks: CallbackList, args: tuple) -> Tuple[str, str]:
+        """
+        Find the class and property name of a property's CallbackList. The
+        first argument of a property dispatch is the dispatcher instance.
+        """
+        try:
+            return self._owners[id(callbacks)][1:]
+        except KeyError:
+            pass
+        owner = ("?", "?")
+        if args and isinstance(args[0], EventDispatcher):
+            dispatcher = args[0]
+            for name, info in dispatcher.event_dispatcher_properties.items():
+                if info["callbacks"] is callbacks:
+                    owner = (type(dispatcher).__name__, name)
+                    break
+        # Keep a reference to the CallbackList so that its id is not reused
+        self._owners[id(callbacks)] = (callbacks,) + owner
+        return owner
+
+    def call(
+        self,
+        cls_name: str,
+        name: str,
+        callbacks: CallbackList,
+        args: tuple,
+        kwargs: dict,
+    ) -> None:
+        """Call the callbacks, recording the dispatch and their timings."""
+        key = (cls_name, name)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = DispatchStats()
+        fan_out = 0
+        for callback in callbacks.snapshot:
+            fan_out += 1
+            t0 = perf_counter()
+            try:
+                stop = callback(*args, **kwargs)
+            finally:
+                dt = perf_counter() - t0
+                label = getattr(callback, "__qualname__", None) or repr(
+                    callback
+                )
+                callback_stats = stats.callbacks.get(label)
+                if callback_stats is None:
+                    callback_stats = stats.callbacks[label] = CallbackStats()
+                callback_stats.calls += 1
+                callback_stats.total_time += dt
+                if dt > callback_stats.max_time:
+                    callback_stats.max_time = dt
+            if stop:
+                break
+        stats.dispatches += 1
+        stats.callback_calls += fan_out
+        if fan_out > stats.max_fan_out:
+            stats.max_fan_out = fan_out
+
+    def rows(self, sort_by: str = "total_time") -> List[Dict[str, Any]]:
+        """
+        Flatten the statistics into one row per callback, sorted in
+        descending order of `sort_by` (total_time, max_time, calls or
+        dispatches).
+        """
+        rows = []
+        for (cls_name, name), stats in self.stats.items():
+            for label, callback_stats in stats.callbacks.items():
+                rows.append(
+                    {
+                        "class": cls_name,
+                        "name": name,
+                        "callback": label,
+                        "dispatches": stats.dispatches,
+                        "mean_fan_out": stats.callback_calls
+                        / (stats.dispatches or 1),
+                        "max_fan_out": stats.max_fan_out,
+                        **callback_stats.to_dict(),
+                    }
+                )
+        rows.sort(key=lambda row: row[sort_by], reverse=True)
+        return rows
+
+    def report(self, sort_by: str = "total_time") -> str:
+        """Return the statistics as a text table, see `rows`."""
+        header = (
+            "class",
+            "name",
+            "callback",
+            "dispatches",
+            "fan_out",
+            "calls",
+            "total_ms",
+            "max_ms",
+        )
+        lines = [
+            (
+                row["class"],
+                row["name"],
+                row["callback"],
+                str(row["dispatches"]),
+                "%.1f/%d" % (row["mean_fan_out"], row["max_fan_out"]),
+                str(row["calls"]),
+                "%.3f" % (row["total_time"] * 1e3),
+                "%.3f" % (row["max_time"] * 1e3),
+            )
+            for row in self.rows(sort_by)
+        ]
+        widths = [
+            max(len(line[i]) for line in [header] + lines)
+            for i in range(len(header))
+        ]
+        return "\n".join(
+            "  ".join(cell.ljust(width) for cell, width in zip(line, widths))
+            for line in [header] + lines
+        )
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Export the statistics as JSON, grouped by class and name."""
+        data: Dict[str, Dict[str, Any]] = {}
+        for (cls_name, name), stats in self.stats.items():
+            data.setdefault(cls_name, {})[name] = stats.to_dict()
+        return json.dumps(data, **kwargs)
@@ -1,42 +1,202 @@
 __author__ = "calvin"
 
+from typing import Any, Callable, Dict, Optional
+
+from .callbacklist import CallbackList
+from .compare import change_detector
+
+
+class PropertyInfo(object):
+    """
+    Compact, slot-based record of a property's per-instance state. Used instead
+    of a dictionary when the EventDispatcher class sets `compact_properties`.
+    It supports the same item access as the dictionary records, including
+    KeyError for missing keys. The additional keyword arguments of the
+    Property are shared class attributes of the record type and are only
+    copied into the instance when assigned.
+    """
+
+    __slots__ = ("property", "value", "name", "callbacks", "__dict__")
+
+    # Stored in the instance once something depends on the property
+    dependents = None
+
+    # Keys of every record of the type, the additionals are added by
+    # record_type. Keys assigned later are found in __dict__.
+    _keys = frozenset(
+        ("property", "value", "name", "callbacks", "dependents")
+    )
+
+    __setitem__ = object.__setattr__
+
+    def __init__(
+        self,
+        prop: "Property",
+        value: Any,
+        name: str,
+        callbacks: CallbackList,
+    ) -> None:
+        self.property = prop
+        self.value = value
+        self.name = name
+        self.callbacks = callbacks
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._keys or key in self.__dict__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __delitem__(self, key: str) -> None:
+        try:
+            del self.__dict__[key]
+        except KeyError:
+            if key not in self._keys:
+                raise
+            object.__delattr__(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys or key in self.__dict__
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._keys or key in self.__dict__:
+            return getattr(self, key)
+        return default
+
+    def update(self, values: Dict[str, Any]) -> None:
+        for key, value in values.items():
+            setattr(self, key, value)
+
+    @staticmethod
+    def record_type(prop: "Property") -> type:
+        """
+        Return the record type of a Property, creating it on first use. The
+        additionals are wrapped in staticmethod so that callables are not
+        bound to the record.
+        """
+        try:
+            return prop.__dict__["_record_type"]
+        except KeyError:
+            record_type = prop._record_type = type(
+                "PropertyInfo",
+                (PropertyInfo,),
+                {
+                    "__slots__": (),
+                    "_keys": PropertyInfo._keys.union(prop._additionals),
+                    **{
+                        key: staticmethod(value)
+                        for key, value in prop._additionals.items()
+                    },
+                },
+            )
+            return record_type
+
 
 class Property(object):
-    def __init__(self, default_value: object, **additionals: dict) -> None:
-        self.instances = {}
+    """
+    Descriptor of a property of the EventDispatchers. The state of each
+    instance is kept in a record, a dictionary or PropertyInfo, with the
+    value, the bound callbacks and the additionals.
+
+    The `dependents` of a record are hooks called without arguments when
+    the property dispatches, before the callbacks. They belong to the
+    library (computed properties, bind_property) rather than to the users,
+    so unbinding or stopping the propagation does not affect them.
+    """
+
+    # changed(info, old, new) deciding whether an assignment dispatches, None
+    # to compare with !=. See the `compare` argument.
+    changed: Optional[Callable[[Any, Any, Any], bool]] = None
+
+    def __init__(
+        self, default_value: object, compare: Any = None, **additionals: dict
+    ) -> None:
+        """
+        :param default_value: value of the property of a new instance
+        :param compare: compare(old, new) returning True when assigning new
+        should not dispatch, or a strategy from eventdispatcher.compare
+        :param additionals: values stored in the record of each instance
+        """
         self.default_value = default_value
         self._additionals = additionals
+        self.changed = None if compare is None else change_detector(compare)
 
     def __get__(self, obj: object, objtype: type = None) -> object:
         return obj.event_dispatcher_properties[self.name]["value"]
 
     def __set__(self, obj: object, value: object) -> None:
-        if value != obj.event_dispatcher_properties[self.name]["value"]:
-            prop = obj.event_dispatcher_properties[self.name]
+        # Same as store, inlined to save a call per assignment
+        prop = obj.event_dispatcher_properties[self.name]
+        changed = self.changed
+        if (
+            value != prop["value"]
+            if changed is None
+            else changed(prop, prop["value"], value)
+        ):
             prop["value"] = value
-            for callback in prop["callbacks"]:
-                if callback(obj, value):
-                    break
+            self.notify(obj, prop, value)
+
+    def notify(self, obj: object, info: Any, value: object) -> None:
+        """
+        Dispatch a change of the property of an instance: call the
+        dependents, then the bound callbacks and the bind_any callbacks.
+        Every setter dispatches through it.
+        """
+        dependents = info["dependents"]
+        if dependents is not None:
+            for dependent in dependents:
+                dependent()
+        fire = info["callbacks"].fire
+        if fire is not None:
+            fire(obj, value)
+        if obj.event_dispatcher_any_callbacks is not None:
+            obj.dispatch_any(self.name, value)
+
+    def store(self, obj: object, info: Any, value: object) -> bool:
+        """
+        Assign the value to the record of the instance without dispatching
+        it. Returns whether the value changed. Used by silent assignments.
+        """
+        changed = self.changed
+        if (
+            value != info["value"]
+            if changed is None
+            else changed(info, info["value"], value)
+        ):
+            info["value"] = value
+            return True
+        return False
 
     def __delete__(self, obj: object) -> None:
         raise AttributeError("Cannot delete properties")
 
+    def snapshot(self, info: dict) -> object:
+        """
+        Return a copy of the current value of the property that can later be
+        compared against the value to tell whether it changed.
+        """
+        return info["value"]
+
     def register(
         self, instance: object, property_name: str, default_value: object
     ) -> None:
-        info = self._additionals.copy()
-        info.update(
-            {
-                "property": self,
-                "value": default_value,
-                "name": property_name,
-                "callbacks": [],
-            }
-        )
-        # Create the instances dictionary at registration
-        # so that each class has it's own instance of it.
-        self.instances[instance] = info
+        if instance.compact_properties:
+            info = PropertyInfo.record_type(self)(
+                self, default_value, property_name, CallbackList()
+            )
+        else:
+            info = self._additionals.copy()
+            info.update(
+                {
+                    "property": self,
+                    "value": default_value,
+                    "name": property_name,
+                    "callbacks": CallbackList(),
+                    "dependents": None,
+                }
+            )
+        # The record is only referenced by the instance so that the
+        # dispatcher can be garbage collected once it is dropped.
         instance.event_dispatcher_properties[property_name] = info
 
-    def get_dispatcher_property(self, property_name: str) -> dict:
-        return self.instances[self][property_name]
+    def get_dispatcher_property(self, instance: object) -> dict:
+        return instance.event_dispatcher_properties[self.name]
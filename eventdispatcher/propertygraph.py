@@ -0,0 +1,352 @@
+__author__ = "calvin"
+
+import threading
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from weakref import ref
+
+from .eventdispatcher import EventDispatcher, Subscription
+from .exceptions import BindError
+
+# A property of a dispatcher in the graph, (id(dispatcher), property name)
+Node = Tuple[int, str]
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+class PropertyRule(object):
+    """
+    Computes a target property from the values of source properties. Holds
+    weak references to the dispatchers.
+    """
+
+    __slots__ = ("node", "target", "name", "sources", "inputs", "transform")
+
+    def __init__(
+        self,
+        target: EventDispatcher,
+        name: str,
+        sources: Tuple[Tuple[EventDispatcher, str], ...],
+        transform: Callable[..., Any],
+    ) -> None:
+        self.node: Node = (id(target), name)
+        self.target = ref(target)
+        self.name = name
+        self.sources = tuple(
+            (ref(source), source_name) for source, source_name in sources
+        )
+        self.inputs: Tuple[Node, ...] = tuple(
+            (id(source), source_name) for source, source_name in sources
+        )
+        self.transform = transform
+
+    def assign(self) -> None:
+        """Set the target to the transformed values of the sources."""
+        target = self.target()
+        sources = [source() for source, name in self.sources]
+        if target is None or None in sources:
+            # Collected, the rule is removed by the graph
+            return
+        setattr(
+            target,
+            self.name,
+            self.transform(
+                *[
+                    getattr(source, name)
+                    for source, (_, name) in zip(sources, self.sources)
+                ]
+            ),
+        )
+
+
+class PropertyGraph(object):
+    """
+    Dependency graph of the properties bound with bind_property. Each target
+    property is computed by one rule from its source properties.
+
+    When sources change, the targets downstream of them are recomputed in
+    topological order, each at most once per change, instead of every
+    binding setting the next property recursively. Changes made while the
+    graph is propagating, or while it is held by a batch, are collected and
+    propagated together afterwards. Bindings that would create a cycle are
+    rejected when they are made.
+
+    The graph only holds weak references to the bound dispatchers. The
+    bindings of a dispatcher are removed once it is garbage collected, or
+    with the Subscription returned by `bind`.
+
+    The graph is locked while it propagates or is held by a batch. Changes
+    that other threads make to the properties of the graph meanwhile wait
+    for the propagation or the batch to finish, and are then propagated on
+    their own.
+    """
+
+    def __init__(self) -> None:
+        self.rules: Dict[Node, PropertyRule] = {}
+        # Source property -> target properties computed from it
+        self.dependents: Dict[Node, Set[Node]] = {}
+        # Source property -> (dispatcher, hook) reporting its changes to the
+        # graph. The hooks are dependents of the records rather than
+        # callbacks, so that the users cannot unbind or block them.
+        self._watchers: Dict[Node, Tuple[ref, Callable[[], None]]] = {}
+        # Changed properties to propagate, True for targets to recompute
+        self._pending: Dict[Node, bool] = {}
+        self._changed: Set[Node] = set()
+        self._assigning: Optional[Node] = None
+        self._propagating = False
+        self._holds = 0
+        # Reentrant, the assignments of a propagation report back to it
+        self._lock = threading.RLock()
+        # Weak references to the bound dispatchers, by id
+        self._dispatchers: Dict[int, ref] = {}
+        # Ids of the collected dispatchers, whose bindings are removed the
+        # next time the graph is used. Appending is atomic, so the weakref
+        # callbacks do not take the lock.
+        self._collected: List[int] = []
+
+    def bind(
+        self,
+        sources: Sequence[Tuple[EventDispatcher, str]],
+        target: EventDispatcher,
+        name: str,
+        transform: Callable[..., Any],
+    ) -> Subscription:
+        """
+        Compute the property `name` of `target` by calling transform with the
+        values of the source properties, now and whenever they change.
+        :param sources: (dispatcher, property name) pairs
+        :param target: dispatcher of the computed property
+        :param name: name of the computed property
+        :param transform: callable receiving the values of the sources
+        :return: Subscription that removes the binding
+        """
+        node = (id(target), name)
+        if name not in target.event_dispatcher_properties:
+            raise BindError("No property by the name of '%s'" % name)
+        for source, source_name in sources:
+            if source_name not in source.event_dispatcher_properties:
+                raise BindError(
+                    "No property by the name of '%s'" % source_name
+                )
+        with self._lock:
+            if self._collected:
+                self._purge()
+            if node in self.rules:
+                raise BindError("Property '%s' is already bound" % name)
+            rule = PropertyRule(target, name, tuple(sources), transform)
+            if self._reaches(node, rule.inputs):
+                raise BindError(
+                    "Binding property '%s' would create a cycle" % name
+                )
+            self.rules[node] = rule
+            self._track(target)
+            for (source, source_name), input_node in zip(
+                sources, rule.inputs
+            ):
+                self._track(source)
+                dependents = self.dependents.get(input_node)
+                if dependents is None:
+                    dependents = self.dependents[input_node] = set()
+                    self._watch(input_node, source, source_name)
+                dependents.add(node)
+            self._schedule(node, True)
+        return Subscription(self, ((name, rule),))
+
+    def unbind_subscription(self, subscription: Subscription) -> None:
+        with self._lock:
+            for name, rule in subscription.bindings:
+                # The node may have been reused by another dispatcher once
+                # the bound one was collected
+                if self.rules.get(rule.node) is rule:
+                    self._remove(rule.node)
+
+    def _remove(self, node: Node) -> None:
+        rule = self.rules.pop(node)
+        for input_node in rule.inputs:
+            dependents = self.dependents[input_node]
+            dependents.discard(node)
+            if not dependents:
+                del self.dependents[input_node]
+                self._unwatch(input_node)
+
+    def _track(self, dispatcher: EventDispatcher) -> None:
+        key = id(dispatcher)
+        if key not in self._dispatchers:
+            self._dispatchers[key] = ref(
+                dispatcher, partial(self._on_collected, key)
+            )
+
+    def _on_collected(self, key: int, dispatcher_ref: ref) -> None:
+        # Called by the garbage collector, in any thread and possibly in the
+        # middle of a propagation, so the bindings are removed later
+        self._collected.append(key)
+
+    def _purge(self) -> None:
+        """Remove the bindings of the collected dispatchers."""
+        collected = self._collected
+        for i in range(len(collected)):
+            key = collected.pop()
+            self._dispatchers.pop(key, None)
+            for node, rule in list(self.rules.items()):
+                if node[0] == key or any(
+                    input_node[0] == key for input_node in rule.inputs
+                ):
+                    self._remove(node)
+            for node in [node for node in self._pending if node[0] == key]:
+                del self._pending[node]
+
+    def _watch(
+        self, node: Node, source: EventDispatcher, source_name: str
+    ) -> None:
+        info = source.event_dispatcher_properties[source_name]
+        hook = partial(self._on_change, node)
+        if info["dependents"] is None:
+            info["dependents"] = [hook]
+        else:
+            info["dependents"].append(hook)
+        self._watchers[node] = (ref(source), hook)
+
+    def _unwatch(self, node: Node) -> None:
+        source, hook = self._watchers.pop(node)
+        source = source()
+        if source is None:
+            return
+        info = source.event_dispatcher_properties[node[1]]
+        dependents = info["dependents"]
+        dependents.remove(hook)
+        if not dependents:
+            info["dependents"] = None
+
+    def hold(self) -> None:
+        """
+        Collect the changes until `release` is called as often. Other
+        threads wait for the release to change properties of the graph.
+        """
+        self._lock.acquire()
+        self._holds += 1
+
+    def release(self) -> None:
+        try:
+            self._holds -= 1
+            if not self._holds and self._pending and not self._propagating:
+                self._propagate()
+        finally:
+            self._lock.release()
+
+    def _reaches(self, start: Node, nodes: Sequence[Node]) -> bool:
+        """Whether any of the nodes is, or is downstream of, start."""
+        nodes = set(nodes)
+        stack = [start]
+        visited = set()
+        while stack:
+            node = stack.pop()
+            if node in nodes:
+                return True
+            if node not in visited:
+                visited.add(node)
+                stack.extend(self.dependents.get(node, ()))
+        return False
+
+    def _on_change(self, node: Node, *args: Any) -> None:
+        with self._lock:
+            if node == self._assigning:
+                self._changed.add(node)
+            else:
+                self._schedule(node, False)
+
+    def _schedule(self, node: Node, recompute: bool) -> None:
+        # Called with the lock held
+        self._pending[node] = self._pending.get(node, False) or recompute
+        if not self._holds and not self._propagating:
+            if self._collected:
+                self._purge()
+            self._propagate()
+
+    def _propagate(self) -> None:
+        self._propagating = True
+        try:
+            while self._pending:
+                roots, self._pending = self._pending, {}
+                self._changed = set(roots)
+                for node in self._order(roots):
+                    rule = self.rules.get(node)
+                    if rule is None:
+                        continue
+                    changed = self._changed
+                    if roots.get(node) or any(
+                        input_node in changed for input_node in rule.inputs
+                    ):
+                        self._assign(node, rule)
+        finally:
+            self._propagating = False
+            self._changed = set()
+
+    def _assign(self, node: Node, rule: PropertyRule) -> None:
+        # The change of the target is reported back through its watcher, if
+        # other rules depend on it.
+        self._assigning = node
+        try:
+            rule.assign()
+        finally:
+            self._assigning = None
+
+    def _order(self, roots: Dict[Node, bool]) -> List[Node]:
+        """Topological order of the roots and the nodes downstream of them."""
+        order = []
+        visited = set()
+        for root in roots:
+            if root in visited:
+                continue
+            visited.add(root)
+            stack = [(root, iter(self.dependents.get(root, ())))]
+            while stack:
+                node, dependents = stack[-1]
+                for dependent in dependents:
+                    if dependent not in visited:
+                        visited.add(dependent)
+                        downstream = self.dependents.get(dependent, ())
+                        stack.append((dependent, iter(downstream)))
+                        break
+                else:
+                    stack.pop()
+                    order.append(node)
+        order.reverse()
+        return order
+
+
+# Graph of the bindings made with bind_property and bind_properties
+property_graph = PropertyGraph()
+
+
+def bind_property(
+    source: EventDispatcher,
+    source_name: str,
+    target: EventDispatcher,
+    target_name: str,
+    transform: Callable[[Any], Any] = _identity,
+) -> Subscription:
+    """
+    Keep the property `target_name` of `target` equal to
+    transform(source.source_name). See PropertyGraph.
+    :return: Subscription that removes the binding
+    """
+    return property_graph.bind(
+        ((source, source_name),), target, target_name, transform
+    )
+
+
+def bind_properties(
+    sources: Sequence[Tuple[EventDispatcher, str]],
+    target: EventDispatcher,
+    target_name: str,
+    transform: Callable[..., Any],
+) -> Subscription:
+    """
+    Keep the property `target_name` of `target` equal to transform called
+    with the values of the (dispatcher, property name) sources. See
+    PropertyGraph.
+    :return: Subscription that removes the binding
+    """
+    return property_graph.bind(sources, target, target_name, transform)
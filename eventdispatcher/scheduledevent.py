@@ -2,6 +2,7 @@ from __future__ import annotations
 
 __author__ = "calvin"
 
+from functools import partial
 from time import time
 from .clock import Clock
 from typing import Generator
@@ -11,7 +12,11 @@ import logging
 
 
 class ScheduledEvent(object):
-    """Creates a trigger to the scheduler generator that is thread-safe."""
+    """
+    Creates a trigger to the scheduler generator that is thread-safe. Called
+    from a thread other than the clock's, the methods hand the scheduling
+    over to the clock (see Clock.call_soon_threadsafe).
+    """
 
     RUNNING: int = 1
     KILL: int = 0
@@ -61,8 +66,7 @@ class ScheduledEvent(object):
         """
         self._active = 1
         self.t0 = time()
-        if self.clock.scheduled_funcs[self.next] == 0:
-            self._schedule(self.next)
+        self._schedule_next()
 
     def kill(self) -> None:
         """
@@ -88,14 +92,23 @@ class ScheduledEvent(object):
         schedule_interval).
         """
         self.t0 = time()
+        self._schedule_next()
 
+    def _schedule_next(self) -> None:
+        clock = ScheduledEvent.clock
+        if not clock.in_clock_thread():
+            clock.call_soon_threadsafe(self._schedule_next)
         # schedule the call to the generator, ensuring
         # only one function is added to the queue
-        if not self.clock.scheduled_funcs[self.next]:
+        elif not clock.scheduled_funcs[self.next]:
             self._schedule(self.next)
 
     def reset_trigger(self, reschedule: bool = False) -> None:
         """Reset a triggered scheduled event."""
+        clock = ScheduledEvent.clock
+        if not clock.in_clock_thread():
+            clock.call_soon_threadsafe(partial(self.reset_trigger, reschedule))
+            return
         if self.clock.scheduled_funcs[self.func]:
             try:
                 self._unschedule(self.func)
@@ -109,14 +122,15 @@ class ScheduledEvent(object):
     def _schedule(self, func: callable) -> None:
         """Add a function to the scheduled events."""
         clock = ScheduledEvent.clock
-        clock.scheduled_funcs[func] += 1
-        clock.queue.append(func)
+        if clock.in_clock_thread():
+            clock.schedule(func)
+        else:
+            clock.call_soon_threadsafe(partial(clock.schedule, func))
 
     def _unschedule(self, func: callable) -> None:
         """Remove a function from the scheduled events."""
-        clock = ScheduledEvent.clock
-        clock.queue.remove(func)
-        clock.scheduled_funcs[func] -= 1
+        if not ScheduledEvent.clock.unschedule(func):
+            raise ValueError("Function is not scheduled")
 
     @property
     def is_scheduled(self) -> bool:
@@ -130,6 +144,11 @@ class ScheduledEvent(object):
         )
 
     def __next__(self, *args):
+        clock = ScheduledEvent.clock
+        if not clock.in_clock_thread():
+            # Run the generator in the thread of the clock
+            clock.call_soon_threadsafe(self.next)
+            return
         try:
             with self.lock:
                 self.generator.send(ScheduledEvent.RUNNING)
@@ -147,13 +166,7 @@ class ScheduledEvent(object):
         :param func: Scheduled function in the queue
         :return: True if the function was removed from the queue
         """
-        clock = Clock.get_running_clock()
-        if clock.scheduled_funcs[func]:
-            clock.scheduled_funcs[func] -= 1
-            clock.queue.remove(func)
-            return True
-        else:
-            return False
+        return Clock.get_running_clock().unschedule(func)
 
     @staticmethod
     def schedule_once(
@@ -210,21 +223,22 @@ class ScheduledEvent(object):
         """
         interval = self.timeout
         scheduled_funcs = ScheduledEvent.clock.scheduled_funcs
-        append = ScheduledEvent.clock.queue.append
+        schedule_at = ScheduledEvent.clock.schedule_at
         _next = self.next
         running = yield
         while running:
-            t = time()
-            dt = t - self.t0
-            if dt > interval and self._active:
-                # If we have past the timeout time, call the function,
-                # reset the reference time (t0)
-                f()
-                self.t0 = t
-            # Add another call to this generator to the scheduled functions
-            if not scheduled_funcs[_next]:
-                scheduled_funcs[_next] += 1
-                append(_next)
+            # A stopped event is not rescheduled until it is started again
+            if self._active:
+                t = time()
+                dt = t - self.t0
+                if dt > interval:
+                    # If we have past the timeout time, call the function,
+                    # reset the reference time (t0)
+                    f()
+                    self.t0 = t
+                # Call this generator again when the next interval is over
+                if not scheduled_funcs[_next]:
+                    schedule_at(self.t0 + interval, _next)
             running = yield
         # When the loop breaks, we still have
         # one scheduled call to the generator.
@@ -236,21 +250,20 @@ class ScheduledEvent(object):
         """
         timeout = self.timeout
         scheduled_funcs = ScheduledEvent.clock.scheduled_funcs
-        append = ScheduledEvent.clock.queue.append
+        schedule_at = ScheduledEvent.clock.schedule_at
         _next = self.next
         running = yield
         while running:
-            dt = time() - self.t0
-            if dt > timeout and self._active:
-                # If we have pasted the timeout time, call the function
-                f()
-                running = yield
-            else:
-                # Add another call to this generator to the scheduled functions
-                if not scheduled_funcs[_next]:
-                    scheduled_funcs[_next] += 1
-                    append(_next)
-                running = yield
+            # A stopped event is not rescheduled until it is started again
+            if self._active:
+                dt = time() - self.t0
+                if dt > timeout:
+                    # If we have pasted the timeout time, call the function
+                    f()
+                elif not scheduled_funcs[_next]:
+                    # Call this generator again when the timeout is over
+                    schedule_at(self.t0 + timeout, _next)
+            running = yield
         # When the loop breaks, we still
         # have one scheduled call to the generator.
         yield
@@ -261,12 +274,11 @@ class ScheduledEvent(object):
         can be scheduled at most once per clock cycle.
         """
         scheduled_funcs = ScheduledEvent.clock.scheduled_funcs
-        append = ScheduledEvent.clock.queue.append
+        schedule = ScheduledEvent.clock.schedule
         running = yield
         while running:
             if not scheduled_funcs[f] and self._active:
-                scheduled_funcs[f] += 1
-                append(f)
+                schedule(f)
                 running = yield
             else:
                 running = yield
@@ -100,20 +100,27 @@ class SetProperty(Property):
             raise ValueError("SetProperty takes sets only.")
 
     def register(self, instance, property_name: str, value: set):
-        self.value = ObservableSet(
+        value = ObservableSet(
             value,
             dispatch_method=partial(
                 instance.dispatch, property_name, instance
             ),
         )
-        super().register(instance, property_name, self.value)
+        super().register(instance, property_name, value)
+
+    def snapshot(self, info: dict) -> set:
+        return info["value"].copy()
 
     def __set__(self, obj, value: set):
-        p = self.instances[obj]
-        do_dispatch = p["value"] != value
+        p = obj.event_dispatcher_properties[self.name]
+        if self.store(obj, p, value):
+            self.notify(obj, p, value)
+
+    def store(self, obj, p, value: set) -> bool:
+        if self.changed is not None:
+            do_dispatch = self.changed(p, p["value"].set, value)
+        else:
+            do_dispatch = p["value"] != value
         p["value"].set.clear()
         p["value"].set.update(value)  # Assign to the ObservableDict's value
-        if do_dispatch:
-            for callback in p["callbacks"]:
-                if callback(obj, value):
-                    break
+        return bool(do_dispatch)
@@ -1,6 +1,8 @@
 __author__ = "calvin"
 
 import gettext
+from typing import Any
+from weakref import WeakSet
 from builtins import str as basestring, str as unicode
 
 from eventdispatcher import Property
@@ -25,9 +27,9 @@ def fake_translation(s):
 class StringProperty(Property):
     observers = set()
 
-    def __init__(self, default_value: str):
-        super(StringProperty, self).__init__(default_value)
-        self.translatables = set()
+    def __init__(self, default_value: str, compare: Any = None):
+        super(StringProperty, self).__init__(default_value, compare=compare)
+        self.translatables = WeakSet()
         if not isinstance(default_value, (str, basestring, unicode)):
             raise ValueError("StringProperty can only accepts strings.")
 
@@ -50,6 +52,10 @@ class StringProperty(Property):
 
     def __set__(self, obj, value: str):
         prop = obj.event_dispatcher_properties[self.name]
+        if self.store(obj, prop, value):
+            self.notify(obj, prop, value)
+
+    def store(self, obj, prop, value: str) -> bool:
         if isinstance(value, _):
             # If it is tagged as translatable,
             # register this object as an observer
@@ -61,18 +67,15 @@ class StringProperty(Property):
                 self.translatables.remove(obj)
             if "_" in prop:
                 del prop["_"]
-        if value != prop["value"]:
-            prop["value"] = value
-            for callback in prop["callbacks"]:
-                if callback(obj, value):
-                    break
+        return super(StringProperty, self).store(obj, prop, value)
 
     def translate(self):
-        for obj in self.translatables:
+        # The callbacks may assign untranslated strings, which removes their
+        # instance from the translatables
+        for obj in list(self.translatables):
             prop = obj.event_dispatcher_properties[self.name]
             prop["value"] = _.translate(prop["_"])
-            for callback in prop["callbacks"]:
-                callback(prop["obj"], prop["value"])
+            self.notify(obj, prop, prop["value"])
 
     @staticmethod
     def remove_translation() -> None:
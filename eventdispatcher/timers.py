@@ -0,0 +1,263 @@
+"""
+Timer backends of the Clock. A backend stores functions with a deadline
+until they are due:
+
+    - TimerHeap, a binary heap ordered by deadline. Exact, O(log n) insert.
+    - TimingWheel, a hierarchical timing wheel with a fixed resolution.
+      O(1) insert, cancel and expire, for very large numbers of timers.
+
+The Clock serializes the calls to its backend.
+"""
+
+__author__ = "calvin"
+
+from heapq import heappop, heappush
+from itertools import count
+from time import time
+from typing import Callable, List, Optional, Tuple
+
+
+class Timer(object):
+    """Handle of a function scheduled by a timer backend."""
+
+    __slots__ = ("deadline", "func", "tick")
+
+    def __init__(self, deadline: float, func: Callable[[], None]) -> None:
+        self.deadline = deadline
+        # None once the timer is cancelled or expired
+        self.func: Optional[Callable[[], None]] = func
+        self.tick = 0
+
+    @property
+    def active(self) -> bool:
+        return self.func is not None
+
+    def __repr__(self) -> str:
+        return "Timer({}, {!r})".format(self.deadline, self.func)
+
+
+class TimerHeap(object):
+    """
+    Binary heap of timers ordered by deadline. Cancelled timers are left in
+    the heap and skipped when they reach the top.
+    """
+
+    def __init__(self) -> None:
+        # (deadline, sequence number, timer), the sequence number keeps the
+        # timers out of the comparisons
+        self.heap: List[Tuple[float, int, Timer]] = []
+        self._ids = count()
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, deadline: float, func: Callable[[], None]) -> Timer:
+        timer = Timer(deadline, func)
+        heappush(self.heap, (deadline, next(self._ids), timer))
+        self._len += 1
+        return timer
+
+    def cancel(self, timer: Timer) -> bool:
+        """Cancel the timer, returns False if it was not active."""
+        if timer.func is None:
+            return False
+        timer.func = None
+        self._len -= 1
+        # Drop the cancelled timers once they are most of the heap
+        heap = self.heap
+        if len(heap) > 64 and self._len < len(heap) // 2:
+            self.heap = [entry for entry in heap if entry[2].func is not None]
+            self.heap.sort()
+        return True
+
+    def next_deadline(self) -> Optional[float]:
+        heap = self.heap
+        while heap and heap[0][2].func is None:
+            heappop(heap)
+        return heap[0][0] if heap else None
+
+    def expire(
+        self, now: float, append: Callable[[Callable[[], None]], None]
+    ) -> None:
+        """Pass the functions of the timers due at `now` to append."""
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            timer = heappop(heap)[2]
+            func = timer.func
+            if func is not None:
+                timer.func = None
+                self._len -= 1
+                append(func)
+
+
+class TimingWheel(object):
+    """
+    Hierarchical timing wheel. Deadlines are rounded up to ticks of
+    `resolution` seconds, so timers expire at most one tick late, never
+    early. Level 0 has one slot per tick for the next `slots` ticks, each
+    following level has one slot per revolution of the level below. A timer
+    is stored in the slot of the lowest level that covers its deadline, and
+    moves down a level when the wheel reaches its slot, until it expires
+    from level 0. Deadlines beyond the last level wait in its farthest slot.
+
+    Inserting and cancelling are O(1), and expiring costs O(1) per timer and
+    per elapsed tick. Empty stretches of the wheel are skipped.
+    """
+
+    def __init__(
+        self, resolution: float = 0.001, slots: int = 64, levels: int = 5
+    ) -> None:
+        if slots & (slots - 1):
+            raise ValueError("slots must be a power of 2")
+        self.resolution = resolution
+        self.levels = levels
+        self.bits = slots.bit_length() - 1
+        self.mask = slots - 1
+        self.wheels: List[List[List[Timer]]] = [
+            [[] for i in range(slots)] for level in range(levels)
+        ]
+        # Number of timers stored in each level, including cancelled ones
+        self.counts = [0] * levels
+        # Timers added with a deadline in a tick that already expired
+        self.due: List[Timer] = []
+        # Last tick that was expired
+        self.current = self._tick(time())
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _tick(self, seconds: float) -> int:
+        return int(seconds / self.resolution)
+
+    def add(self, deadline: float, func: Callable[[], None]) -> Timer:
+        timer = Timer(deadline, func)
+        # The first tick that starts after the deadline
+        timer.tick = self._tick(deadline) + 1
+        if timer.tick <= self.current:
+            self.due.append(timer)
+        else:
+            self._insert(timer)
+        self._len += 1
+        return timer
+
+    def _insert(self, timer: Timer) -> None:
+        # The tick of the timer is not before the current tick
+        bits = self.bits
+        tick = timer.tick
+        # Lowest level whose revolution covers the delay
+        level = (((tick - self.current) | 1).bit_length() - 1) // bits
+        if level >= self.levels:
+            # Too far in the future, wait in the farthest slot of the top
+            # level and be inserted again from there
+            level = self.levels - 1
+            tick = self.current + (self.mask << (bits * level))
+        self.wheels[level][(tick >> (bits * level)) & self.mask].append(timer)
+        self.counts[level] += 1
+
+    def cancel(self, timer: Timer) -> bool:
+        """
+        Cancel the timer, returns False if it was not active. The timer is
+        dropped from its slot when the wheel reaches it.
+        """
+        if timer.func is None:
+            return False
+        timer.func = None
+        self._len -= 1
+        return True
+
+    def next_deadline(self) -> Optional[float]:
+        """
+        Start of the first tick with timers to expire or to move down a
+        level. It can be earlier than the next deadline, but never later.
+        """
+        if not self._len:
+            return None
+        if self.due:
+            return self.current * self.resolution
+        bits = self.bits
+        current = self.current
+        first = None
+        for level, wheel in enumerate(self.wheels):
+            if not self.counts[level]:
+                continue
+            shift = bits * level
+            position = current >> shift
+            for i in range(1, self.mask + 2):
+                slot = wheel[(position + i) & self.mask]
+                if any(timer.func is not None for timer in slot):
+                    tick = (position + i) << shift
+                    if first is None or tick < first:
+                        first = tick
+                    break
+        return None if first is None else first * self.resolution
+
+    def expire(
+        self, now: float, append: Callable[[Callable[[], None]], None]
+    ) -> None:
+        """Pass the functions of the timers due at `now` to append."""
+        if self.due:
+            due, self.due = self.due, []
+            self._expire_slot(due, append)
+        current = self.current
+        target = self._tick(now)
+        bits = self.bits
+        mask = self.mask
+        wheels = self.wheels
+        counts = self.counts
+        while current < target:
+            current += 1
+            self.current = current
+            if not current & mask:
+                self._cascade(current)
+            slot = wheels[0][current & mask]
+            if slot:
+                wheels[0][current & mask] = []
+                counts[0] -= len(slot)
+                self._expire_slot(slot, append)
+            # Skip to the tick before the next slot boundary of the lowest
+            # level that has timers
+            level = 0
+            while level < self.levels and not counts[level]:
+                level += 1
+            if level == self.levels:
+                current = target
+            elif level:
+                boundary = current | ((1 << (bits * level)) - 1)
+                current = min(boundary, target)
+        self.current = current
+
+    def _expire_slot(
+        self,
+        slot: List[Timer],
+        append: Callable[[Callable[[], None]], None],
+    ) -> None:
+        for timer in slot:
+            func = timer.func
+            if func is not None:
+                timer.func = None
+                self._len -= 1
+                append(func)
+
+    def _cascade(self, tick: int) -> None:
+        """
+        Move the timers of the slots that the wheel reached at `tick` down,
+        from the highest level that turned over. Timers due at `tick` end up
+        in level 0 and expire right after.
+        """
+        bits = self.bits
+        mask = self.mask
+        level = 1
+        while level < self.levels - 1 and not (tick >> (bits * level)) & mask:
+            level += 1
+        for level in range(level, 0, -1):
+            index = (tick >> (bits * level)) & mask
+            slot = self.wheels[level][index]
+            if not slot:
+                continue
+            self.wheels[level][index] = []
+            self.counts[level] -= len(slot)
+            for timer in slot:
+                if timer.func is not None:
+                    self._insert(timer)
@@ -41,8 +41,10 @@ for v, v_per_meter in iteritems(from_meter_conversions):
 class UnitProperty(Property):
     unit_properties = WeakSet()
 
-    def __init__(self, default_value: Any, units: str) -> None:
-        super().__init__(default_value, units=units)
+    def __init__(
+        self, default_value: Any, units: str, compare: Any = None
+    ) -> None:
+        super().__init__(default_value, compare=compare, units=units)
 
     @staticmethod
     def get_units(dispatcher: Any, property_name: str) -> str:
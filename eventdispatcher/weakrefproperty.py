@@ -5,6 +5,8 @@ from copy import deepcopy
 from eventdispatcher import Property
 from weakref import ref
 
+from .compare import change_detector
+
 
 class WeakRefProperty(Property):
     """
@@ -12,8 +14,9 @@ class WeakRefProperty(Property):
     garbage collection.
     """
 
-    def __init__(self, default_value: any, **additionals: dict) -> None:
-        self.instances = {}
+    def __init__(
+        self, default_value: any, compare: any = None, **additionals: dict
+    ) -> None:
         try:
             self.default_value = ref(default_value)
         except TypeError:
@@ -23,6 +26,7 @@ class WeakRefProperty(Property):
         except TypeError:
             self.value = None
         self._additionals = additionals
+        self.changed = None if compare is None else change_detector(compare)
 
     def __get__(self, obj: any, objtype: type = None) -> any:
         value = obj.event_dispatcher_properties[self.name]["value"]
@@ -32,13 +36,22 @@ class WeakRefProperty(Property):
             return value
 
     def __set__(self, obj: any, value: any) -> None:
+        prop = obj.event_dispatcher_properties[self.name]
+        if self.store(obj, prop, value):
+            self.notify(obj, prop, value)
+
+    def store(self, obj: any, info: any, value: any) -> bool:
         wr = ref(value) if value is not None else None
-        if wr != obj.event_dispatcher_properties[self.name]["value"]:
-            prop = obj.event_dispatcher_properties[self.name]
-            prop["value"] = wr
-            for callback in prop["callbacks"]:
-                if callback(obj, value):
-                    break
+        changed = self.changed
+        if changed is None:
+            do_dispatch = wr != info["value"]
+        else:
+            # The strategies compare the referents
+            old = info["value"]
+            do_dispatch = changed(info, old() if old else old, value)
+        if do_dispatch:
+            info["value"] = wr
+        return do_dispatch
 
     def register(
         self, instance: any, property_name: str, default_value: any
@@ -0,0 +1,145 @@
+__author__ = 'calvin'
+
+import asyncio
+import threading
+import time
+import unittest
+
+from eventdispatcher import BindError, Clock, EventDispatcher, Property
+
+
+class Dispatcher(EventDispatcher):
+    p1 = Property(0)
+
+    def __init__(self):
+        super(Dispatcher, self).__init__()
+        self.register_event('event1')
+        self.handled = []
+
+    async def on_p1(self, inst, value):
+        self.handled.append(value)
+
+
+class AsyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.d = Dispatcher()
+        self.calls = []
+
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def run_loop(self, duration):
+        self.loop.run_until_complete(asyncio.sleep(duration))
+
+    async def slow_callback(self, *args):
+        await asyncio.sleep(0.1)
+        self.calls.append(('slow', args))
+
+    def sync_callback(self, *args):
+        self.calls.append(('sync', args))
+
+    def blocking_callback(self, *args):
+        self.calls.append(('blocking', args))
+        return True
+
+    def test_dispatch_async_concurrent(self):
+        d = self.d
+        d.bind(event1=self.slow_callback)
+        d.bind(event1=self.slow_callback)
+        d.bind(event1=self.sync_callback)
+        t0 = time.time()
+        asyncio.run(d.dispatch_event_async('event1', 1))
+        # Both coroutines sleep 0.1 s and must run concurrently
+        self.assertLess(time.time() - t0, 0.18)
+        self.assertEqual(sorted(self.calls), [('slow', (1,)), ('slow', (1,)), ('sync', (1,))])
+
+    def test_dispatch_async_stop_propagation(self):
+        d = self.d
+        d.bind(p1=self.slow_callback, event1=self.slow_callback)
+        d.bind(p1=self.blocking_callback)
+        d.bind(p1=self.sync_callback)
+        asyncio.run(d.dispatch_async('p1', d, 1))
+        self.assertEqual(self.calls, [('blocking', (d, 1)), ('slow', (d, 1))])
+
+    def test_set_inside_loop(self):
+        d = self.d
+        d.bind(p1=self.slow_callback)
+
+        async def main():
+            d.p1 = 1
+            self.assertEqual(self.calls, [])
+            await asyncio.sleep(0.15)
+
+        asyncio.run(main())
+        self.assertEqual(self.calls, [('slow', (d, 1))])
+        self.assertEqual(d.handled, [1])
+
+    def test_set_outside_loop(self):
+        d = self.d
+        d.bind(p1=self.slow_callback)
+        d.bind(p1=self.sync_callback)
+        t0 = time.time()
+        d.p1 = 1
+        # The coroutine does not stop the propagation, nor block the setter
+        self.assertLess(time.time() - t0, 0.05)
+        self.assertEqual(self.calls, [('sync', (d, 1))])
+        # It runs on the loop of the thread, which is left in place
+        self.run_loop(0.15)
+        self.assertEqual(self.calls, [('sync', (d, 1)), ('slow', (d, 1))])
+        self.assertEqual(d.handled, [1])
+        self.assertIs(asyncio.get_event_loop(), self.loop)
+        d.unbind(p1=self.slow_callback)
+        d.p1 = 2
+        self.run_loop(0.15)
+        self.assertEqual(self.calls[-1], ('sync', (d, 2)))
+        self.assertEqual(len(self.calls), 3)
+
+    def test_bind_without_loop(self):
+        errors = []
+
+        def bind():
+            try:
+                self.d.bind(p1=self.slow_callback)
+            except BindError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=bind)
+        thread.start()
+        thread.join()
+        self.assertEqual(len(errors), 1)
+
+    async def quick_callback(self, *args):
+        await asyncio.sleep(0)
+        self.calls.append(('quick', args))
+
+    def test_wrapped_coroutine_functions(self):
+        previous_clock = getattr(Clock, 'clock', None)
+        self.addCleanup(setattr, Clock, 'clock', previous_clock)
+        Clock()
+        d = self.d
+        d.bind_weak(p1=self.quick_callback)
+        d.bind_once(p1=self.quick_callback)
+        d.bind_throttled(10, p1=self.quick_callback)
+        d.p1 = 1
+        self.assertEqual(self.calls, [])
+        self.run_loop(0.01)
+        # The first call of a throttled binding is made right away
+        self.assertEqual(self.calls, [('quick', (d, 1)), ('quick', ()), ('quick', (d, 1))])
+
+    def test_offloaded_coroutine_function(self):
+        d = self.d
+        d.bind_offloaded(p1=self.quick_callback)
+        d.p1 = 1
+        d.wait_offloaded(1)
+        # The worker hands the coroutine to the loop of the binding thread
+        self.run_loop(0.01)
+        self.assertEqual(self.calls, [('quick', (d, 1))])
+        d.unbind(p1=self.quick_callback)
+
+
+if __name__ == '__main__':
+    unittest.main()
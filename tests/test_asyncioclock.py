@@ -0,0 +1,122 @@
+__author__ = 'calvin'
+
+import asyncio
+import threading
+import time
+import unittest
+
+from eventdispatcher import (
+    AsyncioClock, Clock, EventDispatcher, Property, ScheduledEvent)
+
+
+class Dispatcher(EventDispatcher):
+    p1 = Property(0)
+
+
+class CountingClock(AsyncioClock):
+
+    def __init__(self, *args, **kwargs):
+        super(CountingClock, self).__init__(*args, **kwargs)
+        self.cycles = 0
+
+    def _run_scheduled_events(self):
+        self.cycles += 1
+        super(CountingClock, self)._run_scheduled_events()
+
+
+class AsyncioClockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_clock = getattr(Clock, 'clock', None)
+        self.loop = asyncio.new_event_loop()
+        self.clock = CountingClock(self.loop)
+        self.calls = []
+
+    def tearDown(self):
+        self.loop.close()
+        Clock.clock = self.previous_clock
+
+    def call(self):
+        self.calls.append(time.time())
+
+    def run_loop(self, duration):
+        self.loop.run_until_complete(asyncio.sleep(duration))
+
+    def test_trigger(self):
+        trigger = ScheduledEvent.create_trigger(self.call)
+        trigger.next()
+        trigger.next()
+        self.assertTrue(trigger.is_scheduled)
+        self.run_loop(0.01)
+        self.assertEqual(len(self.calls), 1)
+        self.assertFalse(trigger.is_scheduled)
+        trigger.next()
+        trigger.reset_trigger()
+        self.run_loop(0.01)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_schedule_once(self):
+        t0 = time.time()
+        ScheduledEvent.schedule_once(self.call, 0.05)
+        self.run_loop(0.15)
+        self.assertEqual(len(self.calls), 1)
+        self.assertAlmostEqual(self.calls[0] - t0, 0.05, delta=0.03)
+        # The loop waits for the deadline instead of polling
+        self.assertLess(self.clock.cycles, 5)
+
+    def test_schedule_interval(self):
+        event = ScheduledEvent.schedule_interval(self.call, 0.02, start=True)
+        self.run_loop(0.11)
+        event.stop()
+        n_calls = len(self.calls)
+        self.assertIn(n_calls, (3, 4, 5))
+        self.run_loop(0.05)
+        self.assertEqual(len(self.calls), n_calls)
+        self.assertLess(self.clock.cycles, 20)
+
+    def test_cancel(self):
+        timer = self.clock.schedule_at(time.time() + 0.02, self.call)
+        self.assertTrue(self.clock.cancel(timer))
+        self.assertFalse(self.clock.cancel(timer))
+        self.assertEqual(len(self.clock.scheduled_funcs), 0)
+        self.run_loop(0.05)
+        self.assertEqual(self.calls, [])
+
+    def test_deferred_dispatch(self):
+        d = Dispatcher()
+        values = []
+        d.bind(p1=lambda inst, value: values.append(value))
+        d.set_deferred_dispatch(True)
+        d.p1 = 1
+        d.p1 = 2
+        self.assertEqual(values, [])
+        self.run_loop(0.01)
+        self.assertEqual(values, [2])
+
+    def test_schedule_from_thread(self):
+        trigger = ScheduledEvent.create_trigger(self.call)
+
+        async def wait_for_call():
+            thread = threading.Thread(target=trigger.next)
+            thread.start()
+            while not self.calls:
+                await asyncio.sleep(0.001)
+            thread.join()
+
+        self.loop.run_until_complete(
+            asyncio.wait_for(wait_for_call(), 1))
+        self.assertEqual(len(self.calls), 1)
+
+    def test_raising_function(self):
+        def fail():
+            raise ValueError()
+
+        self.loop.set_exception_handler(lambda loop, context: None)
+        self.clock.schedule(fail)
+        self.clock.schedule(self.call)
+        self.run_loop(0.01)
+        self.assertEqual(len(self.calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+__author__ = 'calvin'
+
+import unittest
+
+from eventdispatcher import EventDispatcher, Property, ListProperty, batch
+
+
+class Dispatcher(EventDispatcher):
+    p1 = Property(0)
+    p2 = Property(0)
+    p3 = Property(0)
+    listp = ListProperty([1, 2, 3])
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.d = Dispatcher()
+        self.d2 = Dispatcher()
+        self.d.bind(p1=self.callback, p2=self.callback, p3=self.callback, listp=self.callback)
+        self.d2.bind(p1=self.callback)
+
+    def callback(self, inst, value):
+        self.calls.append((inst, value))
+
+    def test_coalesce(self):
+        d = self.d
+        with d.batch():
+            for i in range(5):
+                d.p1 = i + 1
+            d.p2 = 10
+            self.assertEqual(self.calls, [])
+            self.assertEqual(d.p1, 5)
+        self.assertEqual(self.calls, [(d, 5), (d, 10)])
+
+    def test_skip_unchanged(self):
+        d = self.d
+        with d.batch():
+            d.p1 = 1
+            d.p1 = 0
+            d.listp.append(4)
+            d.listp.pop()
+        self.assertEqual(self.calls, [])
+
+    def test_observable_mutation(self):
+        d = self.d
+        with d.batch():
+            d.listp.append(4)
+            d.listp.append(5)
+        self.assertEqual(self.calls, [(d, [1, 2, 3, 4, 5])])
+
+    def test_nested(self):
+        d = self.d
+        with d.batch():
+            with d.batch():
+                d.p1 = 1
+            self.assertEqual(self.calls, [])
+        self.assertEqual(self.calls, [(d, 1)])
+        d.p1 = 2
+        self.assertEqual(self.calls, [(d, 1), (d, 2)])
+
+    def test_multiple_dispatchers(self):
+        d, d2 = self.d, self.d2
+        with batch(d, d2):
+            d.p1 = 1
+            d2.p1 = 1
+            d2.p1 = 2
+            self.assertEqual(self.calls, [])
+        self.assertEqual(self.calls, [(d, 1), (d2, 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+__author__ = 'calvin'
+
+import unittest
+
+from eventdispatcher import EventDispatcher, Property, ListProperty, LimitProperty
+from eventdispatcher import StringProperty, _
+from eventdispatcher import BindError
+
+
+class Dispatcher(EventDispatcher):
+    p1 = Property(0)
+    p2 = LimitProperty(5, min=0, max=10)
+    listp = ListProperty([1, 2])
+
+
+class BindAnyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.d = Dispatcher()
+        self.calls = []
+
+    def callback(self, *args):
+        self.calls.append(args)
+
+    def test_bind_any(self):
+        d = self.d
+        d.bind_any(self.callback)
+        d.p1 = 1
+        d.p1 = 1
+        d.p2 = 20
+        d.listp = [3]
+        d.listp.append(4)
+        self.assertEqual(self.calls, [
+            (d, 'p1', 1),
+            (d, 'p2', 10),
+            (d, 'listp', [3, 4]),
+            (d, 'listp', [3, 4]),
+        ])
+
+    def test_order(self):
+        d = self.d
+        d.bind(p1=lambda *args: self.calls.append('p1'))
+        d.bind_any(lambda *args: self.calls.append('any'))
+        d.p1 = 1
+        self.assertEqual(self.calls, ['p1', 'any'])
+
+    def test_unbind(self):
+        d = self.d
+        subscription = d.bind_any(self.callback)
+        d.bind_any(self.callback)
+        subscription.unbind()
+        d.p1 = 1
+        d.unbind_any(self.callback)
+        d.p1 = 2
+        self.assertEqual(self.calls, [(d, 'p1', 1)])
+        with self.assertRaises(BindError):
+            d.unbind_any(self.callback)
+
+    def test_batch(self):
+        d = self.d
+        d.bind_any(self.callback)
+        with d.batch():
+            d.p1 = 1
+            d.p1 = 2
+            d.p2 = 3
+            d.p2 = 5
+        self.assertEqual(self.calls, [(d, 'p1', 2)])
+
+    def test_registered_later(self):
+        # Properties added after the binding, as JSON_Map.map_attributes does
+        class Mapped(EventDispatcher):
+            pass
+
+        d = Mapped()
+        d.bind_any(self.callback)
+        prop = Mapped.p3 = Property(0)
+        EventDispatcher.invalidate_property_registry(Mapped)
+        EventDispatcher.register_properties(d, {'p3': prop})
+        d.p3 = 3
+        self.assertEqual(self.calls, [(d, 'p3', 3)])
+
+    def test_translation(self):
+        class Translated(EventDispatcher):
+            label = StringProperty(_('abc'))
+
+        d = Translated()
+        stop = []
+        d.bind(label=lambda *args: bool(stop))
+        d.bind(label=lambda *args: self.calls.append('label'))
+        d.bind_any(self.callback)
+        # Only translate the property of this test
+        observers = StringProperty.observers
+        StringProperty.observers = {Translated.__dict__['label'].translate}
+        try:
+            StringProperty.load_fake_translation()
+            self.assertEqual(self.calls, ['label', (d, 'label', '#abc#')])
+            # A callback that stops the propagation is honoured
+            stop.append(True)
+            StringProperty.remove_translation()
+            self.assertEqual(self.calls[-1], (d, 'label', 'abc'))
+            self.assertEqual(len(self.calls), 3)
+            stop.clear()
+            del self.calls[:]
+            with d.batch():
+                StringProperty.load_fake_translation()
+                self.assertEqual(self.calls, [])
+            self.assertEqual(self.calls, ['label', (d, 'label', '#abc#')])
+        finally:
+            StringProperty.remove_translation()
+            StringProperty.observers = observers
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+__author__ = 'calvin'
+
+import unittest
+
+from eventdispatcher import EventDispatcher, Property, BindError
+from eventdispatcher import bind_many, unbind_many
+
+
+class Dispatcher(EventDispatcher):
+    p1 = Property(0)
+    p2 = Property(0)
+
+    def __init__(self):
+        super(Dispatcher, self).__init__()
+        self.register_event('event1')
+
+
+class SubDispatcher(Dispatcher):
+    p3 = Property(0)
+
+
+class BindManyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+    def callback(self, *args):
+        self.calls.append(args)
+
+    def test_bind_many(self):
+        instances = [Dispatcher() for i in range(3)] + [SubDispatcher()]
+        subscriptions = bind_many(instances, p1=self.callback, event1=self.callback)
+        self.assertEqual(len(subscriptions), 4)
+        for i, d in enumerate(instances):
+            d.p1 = i + 1
+            d.dispatch_event('event1', i)
+        self.assertEqual(len(self.calls), 8)
+        self.assertEqual(self.calls[0], (instances[0], 1))
+        self.assertEqual(self.calls[1], (0,))
+
+        subscriptions[0].unbind()
+        instances[0].p1 = 10
+        self.assertEqual(len(self.calls), 8)
+
+        unbind_many(instances[1:], p1=self.callback, event1=self.callback)
+        for d in instances:
+            d.p1 = 20
+            d.dispatch_event('event1')
+        self.assertEqual(len(self.calls), 8)
+
+    def test_bind_many_properties(self):
+        instances = [Dispatcher(), SubDispatcher()]
+        bind_many(instances, p2=self.callback)
+        for d in instances:
+            d.p2 = 1
+        self.assertEqual(self.calls, [(instances[0], 1), (instances[1], 1)])
+
+    def test_bind_many_unknown(self):
+        with self.assertRaises(BindError):
+            bind_many([Dispatcher()], p4=self.callback)
+
+    def test_bind_many_unknown_later(self):
+        d1, d2 = Dispatcher(), SubDispatcher()
+        with self.assertRaises(BindError):
+            bind_many([d1, d2], p3=self.callback)
+        # Nothing is bound when a later instance lacks a name
+        d1.p1 = d2.p3 = 1
+        self.assertEqual(self.calls, [])
+
+
+class ObserveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+        class Observed(Dispatcher):
+            pass
+
+        class SubObserved(Observed):
+            pass
+
+        self.Observed = Observed
+        self.SubObserved = SubObserved
+
+    def callback(self, *args):
+        self.calls.append(args)
+
+    def test_observe(self):
+        subscription = self.Observed.observe(p1=self.callback, event1=self.callback)
+        d1 = self.Observed()
+        d2 = self.SubObserved()
+        d3 = Dispatcher()
+        for d in (d1, d2, d3):
+            d.p1 = 1
+            d.dispatch_event('event1', 'a')
+        self.assertEqual(self.calls, [(d1, 1), ('a',), (d2, 1), ('a',)])
+
+        # More observers of an observed name reach the existing instances
+        self.Observed.observe(p1=lambda *args: self.calls.append('second'))
+        d1.p1 = 2
+        self.assertEqual(self.calls[-2:], [(d1, 2), 'second'])
+
+        subscription.unbind()
+        del self.calls[:]
+        d1.p1 = 3
+        d2.dispatch_event('event1')
+        self.assertEqual(self.calls, ['second'])
+
+    def test_observe_subclass(self):
+        self.Observed.observe(p2=lambda *args: self.calls.append('base'))
+        self.SubObserved.observe(p2=lambda *args: self.calls.append('sub'))
+        self.Observed().p2 = 1
+        self.SubObserved().p2 = 1
+        self.assertEqual(self.calls, ['base', 'base', 'sub'])
+
+    def test_observe_stop_propagation(self):
+        class Handled(self.Observed):
+            def on_p1(self, inst, value):
+                return True
+
+        self.Observed.observe(p1=self.callback)
+        Handled().p1 = 1
+        self.assertEqual(self.calls, [])
+
+    def test_observe_after_instances(self):
+        self.Observed.observe(p2=self.callback)
+        d = self.SubObserved()
+        with self.assertRaises(BindError):
+            self.Observed.observe(p1=self.callback, p2=self.callback)
+        d.p1 = 1
+        d.p2 = 1
+        # Nothing was observed, the name that is already observed can get
+        # more observers
+        self.assertEqual(self.calls, [(d, 1)])
+        self.Observed.observe(p2=self.callback)
+        d.p2 = 2
+        self.assertEqual(self.calls[1:], [(d, 2), (d, 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+__author__ = 'calvin'
+
+import unittest
+
+from eventdispatcher import CallbackList, EventDispatcher, Property
+
+
+class Dispatcher(EventDispatcher):
+    p1 = Property(0)
+
+
+class CallbackListTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+    def callback1(self, inst, value):
+        self.calls.append((1, value))
+
+    def callback2(self, inst, value):
+        self.calls.append((2, value))
+        return True
+
+    def callback3(self, inst, value):
+        self.calls.append((3, value))
+
+    def test_fire_specialization(self):
+        callbacks = CallbackList()
+        self.assertIsNone(callbacks.fire)
+        callbacks.append(self.callback1)
+        self.assertEqual(callbacks.fire, self.callback1)
+        callbacks.append(self.callback2)
+        callbacks.append(self.callback3)
+        callbacks.fire(None, 1)
+        # callback2 stops the propagation
+        self.assertEqual(self.calls, [(1, 1), (2, 1)])
+        callbacks.remove(self.callback1)
+        callbacks.remove(self.callback2)
+        self.assertEqual(callbacks.fire, self.callback3)
+        callbacks.clear()
+        self.assertIsNone(callbacks.fire)
+
+    def test_discard_by_key(self):
+        callbacks = CallbackList()
+        keys = [callbacks.append(cb) for cb in (self.callback1, self.callback3, self.callback1)]
+        self.assertTrue(callbacks.discard(keys[0]))
+        self.assertFalse(callbacks.discard(keys[0]))
+        # Dispatch order is kept
+        self.assertEqual(list(callbacks), [self.callback3, self.callback1])
+        callbacks.fire(None, 1)
+        self.assertEqual(self.calls, [(3, 1), (1, 1)])
+
+    def test_subscription(self):
+        d = Dispatcher()
+        subscription = d.bind(p1=self.callback1)
+        d.bind(p1=self.callback3)
+        d.p1 = 1
+        subscription.unbind()
+        # Unbinding twice is harmless
+        subscription.unbind()
+        d.p1 = 2
+        self.assertEqual(self.calls, [(1, 1), (3, 1), (3, 2)])
+
+    def test_unbind_many_subscribers(self):
+        d = Dispatcher()
+        subscriptions = [d.bind(p1=self.callback1) for i in range(10000)]
+        for subscription in subscriptions[::2]:
+            subscription.unbind()
+        d.p1 = 1
+        self.assertEqual(len(self.calls), 5000)
+        for subscription in subscriptions[1::2]:
+            d.unbind_subscription(subscription)
+        self.assertIsNone(d.event_dispatcher_properties['p1']['callbacks'].fire)
+
+    def test_bind_switches_setter(self):
+        d = Dispatcher()
+        d.p1 = 1
+        d.bind(p1=self.callback1)
+        d.p1 = 2
+        d.bind(p1=self.callback3)
+        d.p1 = 3
+        d.unbind(p1=self.callback1)
+        d.p1 = 4
+        d.unbind_all('p1')
+        d.p1 = 5
+        self.assertEqual(self.calls, [(1, 2), (1, 3), (3, 3), (3, 4)])
+
+
+if __name__ == '__main__':
+    unittest.main()
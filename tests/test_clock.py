@@ -0,0 +1,299 @@
+__author__ = 'calvin'
+
+import threading
+import time
+import unittest
+
+from eventdispatcher import CallbackList, Clock, ScheduledEvent
+
+
+class CountingClock(Clock):
+
+    def __init__(self):
+        super(CountingClock, self).__init__()
+        self.cycles = 0
+
+    def _run_scheduled_events(self):
+        self.cycles += 1
+        super(CountingClock, self)._run_scheduled_events()
+
+
+class ClockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_clock = getattr(Clock, 'clock', None)
+        self.clock = CountingClock()
+        self.thread = threading.Thread(target=self.clock.run)
+        self.calls = []
+
+    def tearDown(self):
+        self.clock.stop()
+        if self.thread.is_alive():
+            self.thread.join()
+        Clock.clock = self.previous_clock
+
+    def call(self):
+        self.calls.append(time.time())
+
+    def test_schedule_once(self):
+        t0 = time.time()
+        ScheduledEvent.schedule_once(self.call, 0.1)
+        self.thread.start()
+        time.sleep(0.3)
+        self.assertEqual(len(self.calls), 1)
+        self.assertAlmostEqual(self.calls[0] - t0, 0.1, delta=0.05)
+        # Sleeps until the deadline instead of polling
+        self.assertLess(self.clock.cycles, 10)
+
+    def test_schedule_interval(self):
+        event = ScheduledEvent.schedule_interval(self.call, 0.05, start=True)
+        self.thread.start()
+        time.sleep(0.28)
+        event.stop()
+        n_calls = len(self.calls)
+        self.assertIn(n_calls, (3, 4, 5))
+        time.sleep(0.15)
+        self.assertEqual(len(self.calls), n_calls)
+        self.assertLess(self.clock.cycles, 30)
+
+    def test_reset_timer(self):
+        event = ScheduledEvent.schedule_once(self.call, 0.1)
+        self.thread.start()
+        time.sleep(0.05)
+        t0 = time.time()
+        event.reset_timer()
+        time.sleep(0.2)
+        self.assertEqual(len(self.calls), 1)
+        self.assertAlmostEqual(self.calls[0] - t0, 0.1, delta=0.05)
+
+    def test_wake_on_submission(self):
+        trigger = ScheduledEvent.create_trigger(self.call)
+        self.thread.start()
+        time.sleep(0.05)
+        cycles = self.clock.cycles
+        t0 = time.time()
+        trigger.next()
+        time.sleep(0.05)
+        self.assertEqual(len(self.calls), 1)
+        self.assertLess(self.calls[0] - t0, 0.02)
+        self.assertLessEqual(self.clock.cycles - cycles, 2)
+
+    def test_earlier_deadline_wakes(self):
+        ScheduledEvent.schedule_once(self.call, 10)
+        self.thread.start()
+        time.sleep(0.05)
+        t0 = time.time()
+        ScheduledEvent.schedule_once(self.call, 0.05)
+        time.sleep(0.15)
+        self.assertEqual(len(self.calls), 1)
+        self.assertAlmostEqual(self.calls[0] - t0, 0.05, delta=0.03)
+
+    def test_stop(self):
+        ScheduledEvent.schedule_once(self.call, 10)
+        self.thread.start()
+        time.sleep(0.05)
+        self.clock.stop()
+        self.thread.join(1)
+        self.assertFalse(self.thread.is_alive())
+        self.assertEqual(self.calls, [])
+
+
+class UnscheduleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_clock = getattr(Clock, 'clock', None)
+        self.clock = Clock()
+        self.calls = []
+
+    def tearDown(self):
+        Clock.clock = self.previous_clock
+
+    def test_unschedule(self):
+        clock = self.clock
+        calls = self.calls
+        f = lambda: calls.append('f')
+        g = lambda: calls.append('g')
+        clock.schedule(f)
+        clock.schedule(g)
+        clock.schedule(f)
+        self.assertEqual(clock.scheduled_funcs[f], 2)
+        self.assertTrue(clock.unschedule(f))
+        self.assertEqual(clock.scheduled_funcs[f], 1)
+        clock._run_scheduled_events()
+        self.assertEqual(calls, ['g', 'f'])
+        self.assertFalse(clock.unschedule(f))
+        self.assertEqual(len(clock.queue), 0)
+
+    def test_bookkeeping_shrinks(self):
+        clock = self.clock
+        triggers = [
+            ScheduledEvent.create_trigger(lambda: None) for i in range(100)
+        ]
+        for trigger in triggers:
+            trigger.next()
+        for trigger in triggers[::2]:
+            trigger.reset_trigger()
+        self.assertEqual(len(clock.scheduled_funcs), 50)
+        self.assertEqual(len(clock.cancelled), 50)
+        clock._run_scheduled_events()
+        self.assertEqual(len(clock.scheduled_funcs), 0)
+        self.assertEqual(len(clock.cancelled), 0)
+        for trigger in triggers:
+            self.assertFalse(trigger.is_scheduled)
+
+    def test_reschedule_after_reset(self):
+        trigger = ScheduledEvent.create_trigger(lambda: self.calls.append(1))
+        trigger.next()
+        trigger.reset_trigger(reschedule=True)
+        self.assertTrue(trigger.is_scheduled)
+        self.clock._run_scheduled_events()
+        self.assertEqual(self.calls, [1])
+
+    def test_unschedule_event(self):
+        f = lambda: self.calls.append(1)
+        self.clock.schedule_at(time.time() - 1, f)
+        self.assertTrue(ScheduledEvent.unschedule_event(f))
+        self.assertFalse(ScheduledEvent.unschedule_event(f))
+        self.clock._run_scheduled_events()
+        self.assertEqual(self.calls, [])
+        self.assertEqual(len(self.clock.cancelled), 0)
+
+    def test_cancel_timer_and_queued_call(self):
+        f = lambda: self.calls.append(1)
+        timer = self.clock.schedule_at(time.time() + 1, f)
+        self.clock.schedule(f)
+        self.assertTrue(self.clock.unschedule(f))
+        self.assertTrue(self.clock.cancel(timer))
+        self.assertEqual(self.clock.scheduled_funcs[f], 0)
+        self.clock._run_scheduled_events()
+        self.assertEqual(self.calls, [])
+        self.assertEqual(len(self.clock.cancelled), 0)
+
+    def test_cancel_unscheduled_timer(self):
+        f = lambda: self.calls.append(1)
+        timer = self.clock.schedule_at(time.time() + 1, f)
+        self.clock.unschedule(f)
+        self.assertTrue(self.clock.cancel(timer))
+        self.assertEqual(len(self.clock.scheduled_funcs), 0)
+        self.assertEqual(len(self.clock.cancelled), 0)
+
+
+class ThreadsafeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_clock = getattr(Clock, 'clock', None)
+        self.clock = CountingClock()
+        self.thread = threading.Thread(target=self.clock.run)
+        self.thread.start()
+        self.calls = []
+
+    def tearDown(self):
+        self.clock.stop()
+        self.thread.join()
+        Clock.clock = self.previous_clock
+
+    def wait_for(self, condition, timeout=2):
+        t0 = time.time()
+        while not condition() and time.time() - t0 < timeout:
+            time.sleep(0.001)
+
+    def test_producers(self):
+        n, producers = 2000, 4
+        calls = self.calls
+        clock_threads = set()
+
+        def call(i):
+            calls.append(i)
+            clock_threads.add(threading.get_ident())
+
+        def produce(start):
+            for i in range(start, start + n):
+                self.clock.call_soon_threadsafe(lambda i=i: call(i))
+
+        threads = [
+            threading.Thread(target=produce, args=(k * n,))
+            for k in range(producers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.wait_for(lambda: len(calls) == n * producers)
+        self.assertEqual(sorted(calls), list(range(n * producers)))
+        self.assertEqual(clock_threads, {self.thread.ident})
+
+    def test_wake_up(self):
+        time.sleep(0.02)
+        cycles = self.clock.cycles
+        t0 = time.time()
+        self.clock.call_soon_threadsafe(lambda: self.calls.append(time.time()))
+        self.wait_for(lambda: self.calls)
+        self.assertLess(self.calls[0] - t0, 0.02)
+        self.assertLessEqual(self.clock.cycles - cycles, 2)
+
+    def test_trigger_from_threads(self):
+        clock_threads = []
+        trigger = ScheduledEvent.create_trigger(
+            lambda: clock_threads.append(threading.get_ident()))
+        # Keep the clock busy until every thread has triggered, so that all
+        # the triggers are handed over in the same cycle
+        busy, release = threading.Event(), threading.Event()
+
+        def block():
+            busy.set()
+            release.wait(2)
+
+        self.clock.call_soon_threadsafe(block)
+        self.assertTrue(busy.wait(2))
+        threads = [
+            threading.Thread(target=trigger.next) for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        release.set()
+        self.wait_for(lambda: clock_threads)
+        time.sleep(0.02)
+        # The triggers of one cycle call the function once
+        self.assertEqual(clock_threads, [self.thread.ident])
+        self.assertFalse(trigger.is_scheduled)
+
+    def test_start_from_thread(self):
+        event = ScheduledEvent.schedule_once(self.call, 0.02, start=False)
+        thread = threading.Thread(target=event.start)
+        thread.start()
+        thread.join()
+        self.wait_for(lambda: self.calls)
+        time.sleep(0.05)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_deferred_dispatch_from_threads(self):
+        n, producers = 500, 4
+        received = {}
+
+        def produce(k):
+            callbacks = CallbackList([lambda i: received.__setitem__(k, i)])
+            callbacks.set_deferred(True)
+            for i in range(n):
+                callbacks.fire(i)
+
+        threads = [
+            threading.Thread(target=produce, args=(k,))
+            for k in range(producers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # The last value of every list is dispatched
+        self.wait_for(lambda: received == {k: n - 1 for k in range(producers)})
+        self.assertEqual(received, {k: n - 1 for k in range(producers)})
+        self.assertTrue(self.thread.is_alive())
+
+    def call(self):
+        self.calls.append(time.time())
+
+
+if __name__ == '__main__':
+    unittest.main()
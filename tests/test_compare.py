@@ -0,0 +1,174 @@
+__author__ = 'calvin'
+
+import unittest
+
+import numpy as np
+
+from eventdispatcher import EventDispatcher, Property, ListProperty, DictProperty, SetProperty
+from eventdispatcher import LimitProperty, StringProperty, OptionProperty, UnitProperty, WeakRefProperty
+from eventdispatcher import DeadbandProperty, batch
+from eventdispatcher import compare
+
+
+class Versioned(object):
+    def __init__(self):
+        self.version = 0
+        self.items = []
+
+    def add(self, item):
+        self.items.append(item)
+        self.version += 1
+
+
+class Dispatcher(EventDispatcher):
+    identity = Property([1, 2], compare=compare.identity)
+    always = Property(0, compare=compare.always_changed)
+    array = Property(np.zeros(3), compare=compare.array_equal)
+    close = Property(1.0, compare=compare.tolerance(abs_tol=0.01))
+    versioned = Property(None, compare=compare.VersionCounter())
+    custom = Property('a', compare=lambda old, new: old.lower() == new.lower())
+    listp = ListProperty([1, 2], compare=compare.always_changed)
+    dictp = DictProperty({1: 2}, compare=compare.identity)
+    setp = SetProperty({1}, compare=compare.always_changed)
+    limit = LimitProperty(0, min=0, max=10, compare=compare.always_changed)
+    string = StringProperty('a', compare=compare.always_changed)
+    option = OptionProperty('a', options=['a', 'b'], compare=compare.always_changed)
+    unit = UnitProperty(1.0, units='m', compare=compare.tolerance(abs_tol=0.01))
+    weak = WeakRefProperty(None, compare=compare.VersionCounter())
+
+
+class CompactDispatcher(Dispatcher):
+    compact_properties = True
+
+
+class CompareTest(unittest.TestCase):
+    dispatcher_class = Dispatcher
+
+    def setUp(self):
+        self.d = self.dispatcher_class()
+        self.calls = []
+
+    def callback(self, inst, value):
+        self.calls.append(value)
+
+    def bind(self, name):
+        self.d.bind(**{name: self.callback})
+
+    def test_identity(self):
+        self.bind('identity')
+        value = self.d.identity
+        self.d.identity = value
+        self.assertEqual(self.calls, [])
+        self.d.identity = [1, 2]
+        self.assertEqual(len(self.calls), 1)
+
+    def test_always(self):
+        self.bind('always')
+        self.d.always = 0
+        self.d.always = 0
+        self.assertEqual(self.calls, [0, 0])
+
+    def test_array_equal(self):
+        self.bind('array')
+        self.d.array = np.zeros(3)
+        self.assertEqual(self.calls, [])
+        self.d.array = np.ones(3)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_tolerance(self):
+        self.bind('close')
+        self.d.close = 1.005
+        self.assertEqual(self.calls, [])
+        self.assertEqual(self.d.close, 1.0)
+        self.d.close = 1.02
+        self.assertEqual(self.calls, [1.02])
+
+    def test_version_counter(self):
+        self.bind('versioned')
+        value = Versioned()
+        self.d.versioned = value
+        self.d.versioned = value
+        self.assertEqual(len(self.calls), 1)
+        value.add(1)
+        self.d.versioned = value
+        self.d.versioned = value
+        self.assertEqual(len(self.calls), 2)
+        self.d.versioned = Versioned()
+        self.assertEqual(len(self.calls), 3)
+
+    def test_custom(self):
+        self.bind('custom')
+        self.d.custom = 'A'
+        self.assertEqual(self.calls, [])
+        self.d.custom = 'b'
+        self.assertEqual(self.calls, ['b'])
+
+    def test_containers(self):
+        self.bind('listp')
+        self.bind('dictp')
+        self.bind('setp')
+        self.d.listp = [1, 2]
+        self.d.setp = {1}
+        self.d.dictp = {1: 2}
+        self.assertEqual(self.calls, [[1, 2], {1}, {1: 2}])
+
+    def test_version_counter_none(self):
+        self.bind('versioned')
+        self.d.versioned = None
+        self.assertEqual(self.calls, [])
+        value = Versioned()
+        self.d.versioned = value
+        self.d.versioned = None
+        self.assertEqual(self.calls, [value, None])
+
+    def test_other_properties(self):
+        for name in ('limit', 'string', 'option'):
+            self.bind(name)
+            value = getattr(self.d, name)
+            setattr(self.d, name, value)
+            setattr(self.d, name, value)
+            self.assertEqual(self.calls, [value, value])
+            del self.calls[:]
+        # Clipped values are compared after clipping
+        self.d.limit = 20
+        self.assertEqual(self.calls, [10])
+        self.bind('unit')
+        self.d.unit = 1.005
+        self.assertEqual(self.calls, [10])
+
+    def test_weakref(self):
+        self.bind('weak')
+        value = Versioned()
+        self.d.weak = value
+        self.d.weak = value
+        self.assertEqual(self.calls, [value])
+        value.add(1)
+        self.d.weak = value
+        self.assertEqual(self.calls, [value, value])
+
+    def test_deadband_rejects_compare(self):
+        with self.assertRaises(TypeError):
+            DeadbandProperty(0.0, epsilon=0.1, compare=compare.identity)
+
+    def test_batch(self):
+        self.bind('always')
+        self.bind('close')
+        self.bind('versioned')
+        value = Versioned()
+        self.d.versioned = value
+        del self.calls[:]
+        with batch(self.d):
+            self.d.always = 0
+            self.d.close = 1.5
+            self.d.close = 1.005
+            value.add(1)
+            self.d.versioned = value
+        self.assertEqual(self.calls, [0, value])
+
+
+class CompactCompareTest(CompareTest):
+    dispatcher_class = CompactDispatcher
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+__author__ = 'calvin'
+
+import unittest
+
+from eventdispatcher import EventDispatcher, Property, ComputedProperty
+
+
+class Dispatcher(EventDispatcher):
+    # Declared before its dependencies on purpose
+    area = ComputedProperty(lambda self: self.compute_area(), depends_on=['width', 'height'])
+    width = Property(2)
+    height = Property(3)
+    # Computed from another computed property
+    large = ComputedProperty(lambda self: self.area > 10, depends_on=['area'])
+
+    def __init__(self):
+        super(Dispatcher, self).__init__()
+        self.computed = 0
+
+    def compute_area(self):
+        self.computed += 1
+        return self.width * self.height
+
+
+class CompactDispatcher(Dispatcher):
+    compact_properties = True
+
+
+class ComputedPropertyTest(unittest.TestCase):
+    dispatcher_class = Dispatcher
+
+    def setUp(self):
+        self.d = self.dispatcher_class()
+        self.calls = []
+
+    def callback(self, *args):
+        self.calls.append(args)
+
+    def test_lazy(self):
+        d = self.d
+        self.assertEqual(d.computed, 0)
+        self.assertEqual(d.area, 6)
+        self.assertEqual(d.area, 6)
+        self.assertEqual(d.computed, 1)
+        d.width = 4
+        d.height = 4
+        d.width = 5
+        self.assertEqual(d.computed, 1)
+        self.assertEqual(d.area, 20)
+        self.assertEqual(d.computed, 2)
+
+    def test_bound(self):
+        d = self.d
+        d.bind(area=self.callback)
+        d.width = 3
+        self.assertEqual(self.calls, [(d, 9)])
+        self.assertEqual(d.area, 9)
+        self.assertEqual(d.computed, 1)
+
+    def test_unchanged(self):
+        d = self.d
+        self.assertFalse(d.large)
+        d.bind(large=self.callback)
+        d.width = 3
+        self.assertEqual(self.calls, [])
+        with d.batch():
+            d.width = 4
+            d.height = 5
+            d.height = 2
+        self.assertEqual(self.calls, [])
+
+    def test_chained(self):
+        d = self.d
+        self.assertFalse(d.large)
+        d.bind(large=self.callback)
+        d.width = 10
+        self.assertEqual(self.calls, [(d, True)])
+        self.assertTrue(d.large)
+
+    def test_batch(self):
+        d = self.d
+        d.bind(area=self.callback)
+        with d.batch():
+            d.width = 4
+            d.height = 5
+        self.assertEqual(self.calls, [(d, 20)])
+
+    def test_unbind_all(self):
+        d = self.d
+        self.assertEqual(d.area, 6)
+        d.unbind_all('width', 'height')
+        d.width = 4
+        self.assertEqual(d.area, 12)
+
+    def test_stop_propagation(self):
+        d = self.d
+        d.bind(area=self.callback)
+        d.bind(width=lambda inst, value: True)
+        d.width = 4
+        self.assertEqual(self.calls, [(d, 12)])
+        self.assertEqual(d.area, 12)
+
+    def test_temp_unbind_all(self):
+        d = self.d
+        self.assertEqual(d.area, 6)
+        with d.temp_unbind_all('width'):
+            d.width = 4
+        self.assertEqual(d.area, 12)
+
+    def test_read_only(self):
+        with self.assertRaises(AttributeError):
+            self.d.area = 1
+
+
+class CompactComputedPropertyTest(ComputedPropertyTest):
+    dispatcher_class = CompactDispatcher
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+__author__ = 'calvin'
+
+import unittest
+
+import numpy as np
+
+from eventdispatcher import EventDispatcher, DeadbandProperty, DeadbandArrayProperty
+
+
+class Dispatcher(EventDispatcher):
+    position = DeadbandProperty(0.0, epsilon=0.5)
+    temperature = DeadbandProperty(100.0, epsilon=0.1, relative=True)
+    positions = DeadbandArrayProperty(np.zeros(3), epsilon=0.5)
+
+
+class CompactDispatcher(Dispatcher):
+    compact_properties = True
+
+
+class DeadbandPropertyTest(unittest.TestCase):
+    dispatcher_class = Dispatcher
+
+    def setUp(self):
+        self.d = self.dispatcher_class()
+        self.calls = []
+
+    def callback(self, inst, value):
+        self.calls.append(value)
+
+    def test_absolute(self):
+        d = self.d
+        d.bind(position=self.callback)
+        for value in (0.1, 0.3, -0.2, 0.5):
+            d.position = value
+            # The value is always current
+            self.assertEqual(d.position, value)
+        self.assertEqual(self.calls, [])
+        d.position = 0.6
+        self.assertEqual(self.calls, [0.6])
+        # Compared against the last dispatched value, not the last value
+        d.position = 0.9
+        d.position = 1.0
+        self.assertEqual(self.calls, [0.6])
+        d.position = 1.2
+        self.assertEqual(self.calls, [0.6, 1.2])
+
+    def test_relative(self):
+        d = self.d
+        d.bind(temperature=self.callback)
+        d.temperature = 109.0
+        self.assertEqual(self.calls, [])
+        d.temperature = 111.0
+        d.temperature = 120.0
+        self.assertEqual(self.calls, [111.0])
+        d.temperature = 123.0
+        self.assertEqual(self.calls, [111.0, 123.0])
+
+    def test_array(self):
+        d = self.d
+        d.bind(positions=self.callback)
+        d.positions = np.array([0.1, 0.4, -0.4])
+        self.assertEqual(self.calls, [])
+        value = np.array([0.1, 0.4, 0.6])
+        d.positions = value
+        self.assertEqual(len(self.calls), 1)
+        # Modified in place and assigned again
+        value[0] = 0.2
+        d.positions = value
+        self.assertEqual(len(self.calls), 1)
+        value[0] = 1.0
+        d.positions = value
+        self.assertEqual(len(self.calls), 2)
+        d.positions = np.zeros(2)
+        self.assertEqual(len(self.calls), 3)
+
+
+class CompactDeadbandPropertyTest(DeadbandPropertyTest):
+    dispatcher_class = CompactDispatcher
+
+
+if __name__ == '__main__':
+    unittest.main()
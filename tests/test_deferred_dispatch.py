@@ -0,0 +1,79 @@
+__author__ = 'calvin'
+
+import unittest
+
+from eventdispatcher import Clock, EventDispatcher, Property
+
+
+class Dispatcher(EventDispatcher):
+    deferred_dispatch = True
+    p1 = Property(0)
+    p2 = Property(0)
+
+    def __init__(self):
+        super(Dispatcher, self).__init__()
+        self.register_event('event1')
+
+
+class DeferredDispatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_clock = getattr(Clock, 'clock', None)
+        self.clock = Clock()
+        self.calls = []
+        self.d = Dispatcher()
+        self.d.bind(p1=self.callback, p2=self.callback, event1=self.callback)
+
+    def tearDown(self):
+        Clock.clock = self.previous_clock
+
+    def callback(self, inst, value):
+        self.calls.append((inst, value))
+
+    def test_collapse_per_cycle(self):
+        d = self.d
+        for i in range(1000):
+            d.p1 = i + 1
+        d.p2 = 5
+        d.dispatch_event('event1', d, 'a')
+        d.dispatch_event('event1', d, 'b')
+        self.assertEqual(self.calls, [])
+        self.clock._run_scheduled_events()
+        self.assertEqual(self.calls, [(d, 1000), (d, 5), (d, 'b')])
+        self.clock._run_scheduled_events()
+        self.assertEqual(len(self.calls), 3)
+        d.p1 = 0
+        self.clock._run_scheduled_events()
+        self.assertEqual(self.calls[-1], (d, 0))
+
+    def test_immediate_mode(self):
+        d = self.d
+        d.set_deferred_dispatch(False)
+        d.p1 = 1
+        self.assertEqual(self.calls, [(d, 1)])
+        d.set_deferred_dispatch(True)
+        d.p1 = 2
+        d.bind(p1=self.callback)
+        self.assertEqual(self.calls, [(d, 1)])
+        self.clock._run_scheduled_events()
+        self.assertEqual(self.calls, [(d, 1), (d, 2), (d, 2)])
+
+    def test_no_clock(self):
+        Clock.clock = None
+
+        class Immediate(EventDispatcher):
+            p1 = Property(0)
+
+        d = Immediate()
+        d.bind(p1=self.callback)
+        with self.assertRaises(RuntimeError):
+            d.set_deferred_dispatch(True)
+        # The dispatcher stays in immediate mode
+        d.p1 = 1
+        self.assertEqual(self.calls, [(d, 1)])
+        with self.assertRaises(RuntimeError):
+            Dispatcher()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 __author__ = 'Calvin'
 
+import gc
 import unittest
 import random
 
@@ -73,5 +74,49 @@ class EventTest(unittest.TestCase):
         self.d.dispatch_event('event2')
         self.assertEqual(self.d.event2_call_count, 3)
 
+    def test_bind_once_many(self):
+        d = self.d
+        names = ['event%d' % i for i in range(3, 1003)]
+        d.register_event(*names)
+        d.bind_once(**{name: self.increase_count for name in names})
+        for name in names:
+            d.dispatch_event(name)
+            d.dispatch_event(name)
+        self.assertEqual(self.count, len(names))
+
+    def test_bind_weak(self):
+        d = self.d
+
+        class Listener(object):
+            def __init__(self):
+                self.count = 0
+
+            def on_event(self, *args):
+                self.count += 1
+
+        listener = Listener()
+        d.bind_weak(event1=listener.on_event, p1=listener.on_event)
+        d.dispatch_event('event1')
+        d.p1 = {'a': 1}
+        self.assertEqual(listener.count, 2)
+        n_event_callbacks = len(d.event_dispatcher_event_callbacks['event1'])
+        n_property_callbacks = len(d.event_dispatcher_properties['p1']['callbacks'])
+        # The binding must not keep the listener alive and is pruned once it is collected
+        del listener
+        gc.collect()
+        self.assertEqual(len(d.event_dispatcher_event_callbacks['event1']), n_event_callbacks - 1)
+        self.assertEqual(len(d.event_dispatcher_properties['p1']['callbacks']), n_property_callbacks - 1)
+        d.dispatch_event('event1')
+        self.assertEqual(d.event1_call_count, 2)
+
+    def test_unbind_weak(self):
+        d = self.d
+        d.bind_weak(event1=self.increase_count)
+        d.dispatch_event('event1')
+        d.unbind(event1=self.increase_count)
+        d.dispatch_event('event1')
+        self.assertEqual(self.count, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,67 @@
+__author__ = 'calvin'
+
+import gc
+import os
+import unittest
+import weakref
+from builtins import range
+
+from eventdispatcher import EventDispatcher, Property, StringProperty, _
+from eventdispatcher import ListProperty, DictProperty, SetProperty
+
+N_INSTANCES = int(1e6)
+CHUNK_SIZE = int(1e5)
+MAX_RSS_GROWTH_MB = 20
+# The RSS test takes tens of seconds, it only runs when this is set
+SLOW_TESTS = bool(os.environ.get('EVENTDISPATCHER_SLOW_TESTS'))
+
+
+class Dispatcher(EventDispatcher):
+    p1 = Property(0)
+    listp = ListProperty([1, 2, 3])
+    dictp = DictProperty({'a': 1})
+    setp = SetProperty({1, 2})
+    stringp = StringProperty(_('abc'))
+
+
+def current_rss_mb():
+    with open('/proc/self/statm') as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') / 1024. ** 2
+
+
+class LeakTest(unittest.TestCase):
+
+    def test_dropped_dispatcher_is_collected(self):
+        d = Dispatcher()
+        d.listp = [4, 5, 6]
+        d.dictp = {'b': 2}
+        d.setp = {3}
+        ref = weakref.ref(d)
+        del d
+        gc.collect()
+        self.assertIsNone(ref())
+
+    @unittest.skipUnless(SLOW_TESTS, 'Set EVENTDISPATCHER_SLOW_TESTS=1 to run')
+    @unittest.skipUnless(os.path.exists('/proc/self/statm'), 'Requires /proc to measure RSS')
+    def test_rss_stays_flat(self):
+        """
+        Create and drop a million dispatchers and check that the resident memory does not grow.
+        """
+        def create_and_drop(n):
+            for i in range(n):
+                d = Dispatcher()
+                d.p1 = i
+                d.listp = [i]
+            gc.collect()
+
+        # Warm up so that allocator pools are populated before the reference measurement
+        create_and_drop(CHUNK_SIZE)
+        rss_start = current_rss_mb()
+        for i in range(N_INSTANCES // CHUNK_SIZE):
+            create_and_drop(CHUNK_SIZE)
+        self.assertLess(current_rss_mb() - rss_start, MAX_RSS_GROWTH_MB)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -70,6 +70,24 @@ class LimitPropertyTest(EventDispatcherTest, unittest.TestCase):
         self.assertEquals(self.dispatcher.p1, NEW_MAX)
 
 
+class CompactDispatcher(Dispatcher):
+    compact_properties = True
+
+
+class CompactLimitPropertyTest(LimitPropertyTest):
+
+    def __init__(self, *args):
+        super(CompactLimitPropertyTest, self).__init__(*args)
+        self.dispatcher = CompactDispatcher()
+        self.dispatcher2 = CompactDispatcher()
+        self.dispatcher.bind(p1=self.assert_callback, p2=self.assert_callback)
+
+    def test_limits_are_per_instance(self):
+        LimitProperty.set_min(self.dispatcher, 'p1', MIN + 5)
+        self.assertEqual(LimitProperty.get_min(self.dispatcher, 'p1'), MIN + 5)
+        self.assertEqual(LimitProperty.get_min(self.dispatcher2, 'p1'), MIN)
+
+
 
 
 
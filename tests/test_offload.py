@@ -0,0 +1,89 @@
+__author__ = 'calvin'
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from eventdispatcher import EventDispatcher, Property
+
+
+class Dispatcher(EventDispatcher):
+    p1 = Property(0)
+
+    def __init__(self):
+        super(Dispatcher, self).__init__()
+        self.register_event('event1')
+
+
+class OffloadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.d = Dispatcher()
+        self.calls = []
+        self.threads = []
+
+    def slow_callback(self, *args):
+        time.sleep(0.05)
+        self.threads.append(threading.current_thread())
+        self.calls.append(('slow', args))
+
+    def fast_callback(self, *args):
+        self.calls.append(('fast', args))
+
+    def test_producer_does_not_wait(self):
+        d = self.d
+        d.bind_offloaded(p1=self.slow_callback)
+        d.bind(p1=self.fast_callback)
+        t0 = time.perf_counter()
+        d.p1 = 1
+        self.assertLess(time.perf_counter() - t0, 0.05)
+        self.assertEqual(self.calls, [('fast', (d, 1))])
+        done, not_done = d.wait_offloaded()
+        self.assertEqual(len(done), 1)
+        self.assertFalse(not_done)
+        self.assertEqual(self.calls[-1], ('slow', (d, 1)))
+        self.assertIsNot(self.threads[0], threading.current_thread())
+        self.assertFalse(d.event_dispatcher_futures)
+
+    def test_event(self):
+        d = self.d
+        d.bind_offloaded(event1=self.slow_callback)
+        d.dispatch_event('event1', 'a', 'b')
+        d.wait_offloaded()
+        self.assertEqual(self.calls, [('slow', ('a', 'b'))])
+
+    def test_executor(self):
+        executor = ThreadPoolExecutor(1, thread_name_prefix='custom')
+        d = self.d
+        d.executor = executor
+        d.bind_offloaded(p1=self.slow_callback)
+        d.p1 = 1
+        d.wait_offloaded()
+        self.assertTrue(self.threads[0].name.startswith('custom'))
+        executor.shutdown()
+
+    def test_unbind(self):
+        d = self.d
+        subscription = d.bind_offloaded(p1=self.slow_callback)
+        d.unbind(p1=self.slow_callback)
+        d.p1 = 1
+        self.assertFalse(d.event_dispatcher_futures)
+        d.bind_offloaded(p1=self.slow_callback).unbind()
+        subscription.unbind()
+        d.p1 = 2
+        self.assertEqual(self.calls, [])
+
+    def test_exception(self):
+        def fail(*args):
+            raise ValueError
+
+        d = self.d
+        d.bind_offloaded(p1=fail)
+        d.p1 = 1
+        done, not_done = d.wait_offloaded()
+        self.assertIsInstance(done.pop().exception(), ValueError)
+
+
+if __name__ == '__main__':
+    unittest.main()
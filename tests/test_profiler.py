@@ -0,0 +1,95 @@
+__author__ = 'calvin'
+
+import json
+import unittest
+
+from eventdispatcher import CallbackList, DispatchProfiler, EventDispatcher
+from eventdispatcher import ListProperty, Property
+
+
+class Dispatcher(EventDispatcher):
+    p1 = Property(0)
+    p2 = Property(0)
+    listp = ListProperty([])
+
+    def __init__(self):
+        super(Dispatcher, self).__init__()
+        self.register_event('event1')
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.d = Dispatcher()
+        self.count = 0
+
+    def callback(self, *args):
+        self.count += 1
+
+    def blocking_callback(self, *args):
+        self.count += 1
+        return True
+
+    def test_records_dispatches(self):
+        d = self.d
+        d.bind(p1=self.callback, event1=self.callback, listp=self.callback)
+        d.bind(p1=self.callback)
+        with DispatchProfiler() as profiler:
+            for i in range(10):
+                d.p1 = i + 1
+            d.p2 = 1
+            d.dispatch_event('event1', d)
+            d.listp.append(1)
+        self.assertEqual(self.count, 22)
+        stats = profiler.stats[('Dispatcher', 'p1')]
+        self.assertEqual(stats.dispatches, 10)
+        self.assertEqual(stats.max_fan_out, 2)
+        callback_stats = stats.callbacks['ProfilerTest.callback']
+        self.assertEqual(callback_stats.calls, 20)
+        self.assertGreaterEqual(callback_stats.total_time, callback_stats.max_time)
+        self.assertEqual(profiler.stats[('Dispatcher', 'event1')].dispatches, 1)
+        self.assertEqual(profiler.stats[('Dispatcher', 'listp')].dispatches, 1)
+        self.assertNotIn(('Dispatcher', 'p2'), profiler.stats)
+
+        data = json.loads(profiler.to_json())
+        self.assertEqual(data['Dispatcher']['p1']['dispatches'], 10)
+        report = profiler.report()
+        self.assertIn('ProfilerTest.callback', report)
+        self.assertEqual(profiler.rows()[0]['name'], 'p1')
+
+    def test_stop_propagation(self):
+        d = self.d
+        d.bind(p1=self.blocking_callback)
+        d.bind(p1=self.callback)
+        with DispatchProfiler() as profiler:
+            d.p1 = 1
+        self.assertEqual(self.count, 1)
+        self.assertEqual(profiler.stats[('Dispatcher', 'p1')].max_fan_out, 1)
+
+    def test_force_dispatch_any(self):
+        d = self.d
+        changes = []
+        d.bind(p1=self.callback)
+        d.bind_any(lambda inst, name, value: changes.append((name, value)))
+        with DispatchProfiler() as profiler:
+            d.force_dispatch('p1', 0)
+        self.assertEqual(self.count, 1)
+        self.assertEqual(changes, [('p1', 0)])
+        self.assertEqual(profiler.stats[('Dispatcher', 'p1')].dispatches, 1)
+
+    def test_disable_restores(self):
+        fire_slot = CallbackList.__dict__['fire']
+        dispatch = EventDispatcher.__dict__['dispatch']
+        profiler = DispatchProfiler()
+        profiler.enable()
+        self.assertRaises(RuntimeError, DispatchProfiler().enable)
+        profiler.disable()
+        self.assertIs(CallbackList.__dict__['fire'], fire_slot)
+        self.assertIs(EventDispatcher.__dict__['dispatch'], dispatch)
+        self.d.bind(p1=self.callback)
+        self.d.p1 = 1
+        self.assertEqual(profiler.stats, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,3 +19,71 @@ class PropertyTest(EventDispatcherTest, unittest.TestCase):
         self.dispatcher = Dispatcher()
         self.dispatcher2 = Dispatcher()
         self.dispatcher.bind(p1=self.assert_callback, p2=self.assert_callback)
+
+
+class CompactDispatcher(Dispatcher):
+    compact_properties = True
+
+
+class CompactPropertyTest(PropertyTest):
+
+    def setUp(self):
+        super(CompactPropertyTest, self).setUp()
+        self.dispatcher = CompactDispatcher()
+        self.dispatcher2 = CompactDispatcher()
+        self.dispatcher.bind(p1=self.assert_callback, p2=self.assert_callback)
+
+    def test_item_access(self):
+        info = self.dispatcher.event_dispatcher_properties['p1']
+        self.assertNotIsInstance(info, dict)
+        self.assertEqual(info['name'], 'p1')
+        self.assertEqual(info['value'], 10)
+        self.assertIn('callbacks', info)
+        info.update({'extra': 1})
+        self.assertEqual(info.get('extra'), 1)
+        del info['extra']
+        self.assertNotIn('extra', info)
+
+    def test_missing_keys(self):
+        info = self.dispatcher.event_dispatcher_properties['p1']
+        for key in ('extra', 'get', '__class__'):
+            self.assertNotIn(key, info)
+            self.assertIsNone(info.get(key))
+            with self.assertRaises(KeyError):
+                info[key]
+            with self.assertRaises(KeyError):
+                del info[key]
+        self.assertIn('dependents', info)
+
+
+class SubDispatcher(Dispatcher):
+    p2 = Property(30)
+    p3 = Property(40)
+
+    def on_p3(self, inst, value):
+        self.p3_dispatches = getattr(self, 'p3_dispatches', 0) + 1
+
+
+class PropertyRegistryTest(unittest.TestCase):
+
+    def test_registry_is_shared(self):
+        d1, d2 = SubDispatcher(), SubDispatcher()
+        self.assertIs(SubDispatcher.get_property_registry(), SubDispatcher.get_property_registry())
+        self.assertEqual([name for name, _, _ in SubDispatcher.get_property_registry()], ['p1', 'p2', 'p3'])
+        self.assertEqual((d1.p1, d1.p2, d1.p3), (10, 30, 40))
+        self.assertEqual(d2.p2, 30)
+        self.assertEqual(Dispatcher().p2, 20)
+
+    def test_default_handler(self):
+        d = SubDispatcher()
+        d.p3 = 41
+        self.assertEqual(d.p3_dispatches, 1)
+
+    def test_invalidate_registry(self):
+        class Dynamic(EventDispatcher):
+            p1 = Property(1)
+
+        Dynamic()
+        Dynamic.p2 = Property(2)
+        EventDispatcher.invalidate_property_registry(Dynamic)
+        self.assertEqual(Dynamic().p2, 2)
@@ -0,0 +1,176 @@
+__author__ = 'calvin'
+
+import gc
+import threading
+import unittest
+import weakref
+
+from eventdispatcher import EventDispatcher, Property, BindError
+from eventdispatcher import PropertyGraph, bind_property, bind_properties
+
+
+class Node(EventDispatcher):
+    value = Property(0)
+    other = Property(0)
+
+
+class PropertyGraphTest(unittest.TestCase):
+
+    def setUp(self):
+        self.subscriptions = []
+
+    def tearDown(self):
+        for subscription in self.subscriptions:
+            subscription.unbind()
+
+    def bind(self, *args, **kwargs):
+        subscription = bind_property(*args, **kwargs)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def test_chain(self):
+        a, b, c = Node(), Node(), Node()
+        a.value = 1
+        self.bind(a, 'value', b, 'value', lambda v: v * 2)
+        self.bind(b, 'value', c, 'value', lambda v: v + 1)
+        self.assertEqual((b.value, c.value), (2, 3))
+        a.value = 5
+        self.assertEqual((b.value, c.value), (10, 11))
+
+    def test_diamond_computes_sink_once(self):
+        a, b, c, d = Node(), Node(), Node(), Node()
+        computed = []
+
+        def total(x, y):
+            computed.append((x, y))
+            return x + y
+
+        self.bind(a, 'value', b, 'value', lambda v: v + 1)
+        self.bind(a, 'value', c, 'value', lambda v: v * 2)
+        self.subscriptions.append(
+            bind_properties([(b, 'value'), (c, 'value')], d, 'value', total))
+        del computed[:]
+        dispatched = []
+        d.bind(value=lambda inst, value: dispatched.append(value))
+        a.value = 3
+        # The sink sees both upstream changes at once, no intermediate value
+        self.assertEqual(computed, [(4, 6)])
+        self.assertEqual(dispatched, [10])
+
+    def test_batch_computes_once(self):
+        a, b = Node(), Node()
+        computed = []
+
+        def total(x, y):
+            computed.append((x, y))
+            return x + y
+
+        self.subscriptions.append(
+            bind_properties([(a, 'value'), (a, 'other')], b, 'value', total))
+        del computed[:]
+        with a.batch():
+            a.value = 1
+            a.other = 2
+        self.assertEqual(computed, [(1, 2)])
+        self.assertEqual(b.value, 3)
+
+    def test_cycle(self):
+        a, b, c = Node(), Node(), Node()
+        self.bind(a, 'value', b, 'value')
+        self.bind(b, 'value', c, 'value')
+        with self.assertRaises(BindError):
+            self.bind(c, 'value', a, 'value')
+        with self.assertRaises(BindError):
+            self.bind(a, 'other', a, 'other')
+        # A property of the same dispatcher is a different node
+        self.bind(c, 'value', a, 'other')
+        a.value = 4
+        self.assertEqual(a.other, 4)
+
+    def test_errors(self):
+        a, b = Node(), Node()
+        with self.assertRaises(BindError):
+            self.bind(a, 'missing', b, 'value')
+        with self.assertRaises(BindError):
+            self.bind(a, 'value', b, 'missing')
+        self.bind(a, 'value', b, 'value')
+        with self.assertRaises(BindError):
+            self.bind(a, 'other', b, 'value')
+
+    def test_unbind(self):
+        a, b = Node(), Node()
+        subscription = self.bind(a, 'value', b, 'value')
+        a.value = 1
+        subscription.unbind()
+        a.value = 2
+        self.assertEqual(b.value, 1)
+        self.assertIsNone(a.event_dispatcher_properties['value']['dependents'])
+        # The property can be bound again
+        self.bind(a, 'other', b, 'value')
+
+    def test_unbind_all(self):
+        a, b = Node(), Node()
+        self.bind(a, 'value', b, 'value')
+        a.unbind_all('value')
+        a.value = 3
+        self.assertEqual(b.value, 3)
+
+    def test_stop_propagation(self):
+        a, b = Node(), Node()
+        a.bind(value=lambda inst, value: True)
+        self.bind(a, 'value', b, 'value')
+        a.value = 3
+        self.assertEqual(b.value, 3)
+
+    def test_change_from_callback(self):
+        a, b, c = Node(), Node(), Node()
+        graph = PropertyGraph()
+        self.subscriptions.append(graph.bind([(a, 'value')], b, 'value', lambda v: v))
+        self.subscriptions.append(graph.bind([(a, 'other')], c, 'value', lambda v: v))
+        # A callback changing another source while the graph propagates
+        b.bind(value=lambda inst, value: setattr(a, 'other', value * 10))
+        a.value = 2
+        self.assertEqual((b.value, a.other, c.value), (2, 20, 20))
+
+    def test_collected(self):
+        graph = PropertyGraph()
+        a, b, c = Node(), Node(), Node()
+        graph.bind([(a, 'value')], b, 'value', lambda v: v)
+        graph.bind([(b, 'value')], c, 'value', lambda v: v)
+        # A forgotten subscription does not keep the dispatchers alive
+        a_ref, b_ref = weakref.ref(a), weakref.ref(b)
+        del a, b
+        gc.collect()
+        self.assertIsNone(a_ref())
+        self.assertIsNone(b_ref())
+        # Their bindings are removed the next time the graph is used
+        d = Node()
+        graph.bind([(c, 'other')], d, 'value', lambda v: v)
+        self.assertEqual(list(graph.rules), [(id(d), 'value')])
+        self.assertEqual(list(graph.dependents), [(id(c), 'other')])
+
+    def test_threads(self):
+        n, writers = 1000, 4
+        chains = [(Node(), Node()) for i in range(writers)]
+        for a, b in chains:
+            self.bind(a, 'value', b, 'value', lambda v: v * 2)
+        errors = []
+
+        def write(a, b):
+            for i in range(1, n):
+                a.value = i
+                # The change is propagated before the assignment returns
+                if b.value != i * 2:
+                    errors.append((i, b.value))
+
+        threads = [threading.Thread(target=write, args=chain) for chain in chains]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual([b.value for a, b in chains], [(n - 1) * 2] * writers)
+
+
+if __name__ == '__main__':
+    unittest.main()
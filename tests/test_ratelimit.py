@@ -0,0 +1,120 @@
+__author__ = 'calvin'
+
+import time
+import unittest
+
+from eventdispatcher import Clock, EventDispatcher, Property
+
+
+class Dispatcher(EventDispatcher):
+    p1 = Property(0)
+
+
+class RateLimitTest(unittest.TestCase):
+    INTERVAL = 0.05
+
+    def setUp(self):
+        self.previous_clock = getattr(Clock, 'clock', None)
+        self.clock = Clock()
+        self.calls = []
+        self.d = Dispatcher()
+
+    def tearDown(self):
+        Clock.clock = self.previous_clock
+
+    def callback(self, inst, value):
+        self.calls.append(value)
+
+    def run_clock(self, duration):
+        t0 = time.time()
+        while time.time() - t0 < duration:
+            self.clock._run_scheduled_events()
+            time.sleep(0.001)
+
+    def test_throttle(self):
+        d = self.d
+        d.bind_throttled(self.INTERVAL, p1=self.callback)
+        for i in range(1, 11):
+            d.p1 = i
+        # The first change is delivered right away
+        self.assertEqual(self.calls, [1])
+        self.run_clock(self.INTERVAL / 2)
+        self.assertEqual(self.calls, [1])
+        # The trailing value after the interval
+        self.run_clock(self.INTERVAL)
+        self.assertEqual(self.calls, [1, 10])
+        self.run_clock(self.INTERVAL * 2)
+        self.assertEqual(self.calls, [1, 10])
+        d.p1 = 11
+        self.assertEqual(self.calls, [1, 10, 11])
+
+    def test_throttle_rate(self):
+        d = self.d
+        d.bind_throttled(self.INTERVAL, p1=self.callback)
+        t0 = time.time()
+        i = 0
+        while time.time() - t0 < self.INTERVAL * 4:
+            i += 1
+            d.p1 = i
+            self.clock._run_scheduled_events()
+            time.sleep(0.001)
+        self.run_clock(self.INTERVAL * 2)
+        self.assertLessEqual(len(self.calls), 6)
+        self.assertGreaterEqual(len(self.calls), 3)
+        self.assertEqual(self.calls[-1], i)
+
+    def test_debounce(self):
+        d = self.d
+        d.bind_debounced(self.INTERVAL, p1=self.callback)
+        for i in range(1, 6):
+            d.p1 = i
+            self.run_clock(self.INTERVAL / 2)
+        self.assertEqual(self.calls, [])
+        self.run_clock(self.INTERVAL * 2)
+        self.assertEqual(self.calls, [5])
+        d.p1 = 6
+        self.run_clock(self.INTERVAL * 2)
+        self.assertEqual(self.calls, [5, 6])
+
+    def test_unbind(self):
+        d = self.d
+        d.bind_debounced(self.INTERVAL, p1=self.callback)
+        d.unbind(p1=self.callback)
+        d.p1 = 1
+        self.run_clock(self.INTERVAL * 2)
+        self.assertEqual(self.calls, [])
+
+    def test_unbind_pending(self):
+        d = self.d
+        debounced = d.bind_debounced(self.INTERVAL, p1=self.callback)
+        throttled = d.bind_throttled(self.INTERVAL, p1=self.callback)
+        d.p1 = 1
+        d.p1 = 2
+        d.p1 = 3
+        # Only the first call of the throttled binding was made
+        self.assertEqual(self.calls, [1])
+        debounced.unbind()
+        throttled.unbind()
+        self.run_clock(self.INTERVAL * 2)
+        self.assertEqual(self.calls, [1])
+
+    def test_unbind_all_pending(self):
+        d = self.d
+        d.bind_debounced(self.INTERVAL, p1=self.callback)
+        d.p1 = 1
+        d.unbind_all('p1')
+        self.run_clock(self.INTERVAL * 2)
+        self.assertEqual(self.calls, [])
+
+    def test_no_clock(self):
+        Clock.clock = None
+        with self.assertRaises(RuntimeError):
+            self.d.bind_throttled(self.INTERVAL, p1=self.callback)
+        with self.assertRaises(RuntimeError):
+            self.d.bind_debounced(self.INTERVAL, p1=self.callback)
+        self.d.p1 = 1
+        self.assertEqual(self.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
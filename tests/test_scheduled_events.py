@@ -11,6 +11,8 @@ MAX_TIME_S = 3
 
 
 class App(Clock):
+    # The loop hooks are checked on every cycle
+    poll_interval = 0.001
 
     def __init__(self):
         super(App, self).__init__()
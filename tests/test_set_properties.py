@@ -0,0 +1,95 @@
+__author__ = 'calvin'
+
+import unittest
+
+from eventdispatcher import EventDispatcher, Property, ListProperty, LimitProperty, ComputedProperty
+
+
+class Dispatcher(EventDispatcher):
+    p1 = Property(0)
+    p2 = Property(0)
+    limitp = LimitProperty(5, min=0, max=10)
+    listp = ListProperty([1, 2])
+    total = ComputedProperty(lambda self: self.p1 + self.p2, depends_on=['p1', 'p2'])
+
+
+class SetPropertiesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.d = Dispatcher()
+        self.calls = []
+        self.d.bind(p1=self.callback, p2=self.callback, limitp=self.callback, listp=self.callback)
+        self.d.bind_any(self.any_callback)
+
+    def callback(self, inst, value):
+        self.calls.append(value)
+
+    def any_callback(self, inst, name, value):
+        # Observing any property makes the computed property eager
+        if name != 'total':
+            self.calls.append(('any', name))
+
+    def test_set_silent(self):
+        d = self.d
+        self.assertEqual(d.total, 0)
+        d.set_silent('p1', 3)
+        d.set_silent('limitp', 20)
+        d.set_silent('listp', [4])
+        self.assertEqual(self.calls, [])
+        self.assertEqual((d.p1, d.limitp, d.listp), (3, 10, [4]))
+        # Computed properties see the new value
+        self.assertEqual(d.total, 3)
+        # Bindings still work afterwards
+        d.p1 = 4
+        self.assertEqual(self.calls, [4, ('any', 'p1')])
+
+    def test_set_silent_in_batch(self):
+        d = self.d
+        with d.batch():
+            d.p2 = 1
+            d.set_silent('p1', 3)
+        self.assertEqual(self.calls, [1, ('any', 'p2')])
+
+    def test_set_silent_concurrent_dispatch(self):
+        # A dispatch made while a value is silently assigned, eg. by another
+        # thread, still reaches the callbacks
+        def compare(old, new):
+            probe.dispatch('p', probe, 'dispatched')
+            return old == new
+
+        class Probe(EventDispatcher):
+            p = Property(0, compare=compare)
+
+        probe = Probe()
+        probe.bind(p=self.callback)
+        probe.set_silent('p', 1)
+        self.assertEqual(probe.p, 1)
+        self.assertEqual(self.calls, ['dispatched'])
+
+    def test_each(self):
+        d = self.d
+        d.set_properties(p1=1, p2=2)
+        d.set_properties(p1=1, p2=3, dispatch='each')
+        self.assertEqual(self.calls, [1, ('any', 'p1'), 2, ('any', 'p2'), 3, ('any', 'p2')])
+
+    def test_once(self):
+        d = self.d
+        d.bind(total=self.callback)
+        d.set_properties(p1=1, p2=2, dispatch='once')
+        self.assertEqual(self.calls.count(1), 1)
+        self.assertEqual(self.calls.count(2), 1)
+        self.assertEqual(self.calls[-1], 3)
+
+    def test_none(self):
+        d = self.d
+        d.set_properties(p1=1, p2=2, dispatch='none')
+        self.assertEqual(self.calls, [])
+        self.assertEqual(d.total, 3)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            self.d.set_properties(p1=1, dispatch='twice')
+
+
+if __name__ == '__main__':
+    unittest.main()
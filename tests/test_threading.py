@@ -0,0 +1,100 @@
+__author__ = 'calvin'
+
+import sys
+import threading
+import unittest
+
+from eventdispatcher import EventDispatcher, Property
+
+
+class Dispatcher(EventDispatcher):
+    p1 = Property(0)
+
+    def __init__(self):
+        super(Dispatcher, self).__init__()
+        self.register_event('event1')
+
+
+class ThreadSafetyTest(unittest.TestCase):
+    N_DISPATCHERS = 4
+    N_CHURNERS = 4
+    N_DISPATCHES = 2000
+
+    def setUp(self):
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def run_threads(self, dispatch):
+        """
+        Dispatch from several threads while other threads keep binding and
+        unbinding, return the number of calls of the callbacks that stayed
+        bound.
+        """
+        d = Dispatcher()
+        counts = [0, 0]
+        lock = threading.Lock()
+        stop = threading.Event()
+        errors = []
+
+        def first(*args):
+            with lock:
+                counts[0] += 1
+
+        def last(*args):
+            with lock:
+                counts[1] += 1
+
+        d.bind(event1=first, p1=first)
+
+        def churn():
+            def noise(*args):
+                pass
+
+            try:
+                while not stop.is_set():
+                    subscription = d.bind(event1=noise, p1=noise)
+                    d.bind_once(event1=noise, p1=noise)
+                    d.bind(event1=noise, p1=noise)
+                    subscription.unbind()
+                    d.unbind(event1=noise, p1=noise)
+            except Exception as e:
+                errors.append(e)
+
+        def produce():
+            try:
+                for i in range(self.N_DISPATCHES):
+                    dispatch(d, i)
+            except Exception as e:
+                errors.append(e)
+
+        churners = [threading.Thread(target=churn) for i in range(self.N_CHURNERS)]
+        for thread in churners:
+            thread.start()
+        d.bind(event1=last, p1=last)
+        producers = [threading.Thread(target=produce) for i in range(self.N_DISPATCHERS)]
+        for thread in producers:
+            thread.start()
+        for thread in producers:
+            thread.join()
+        stop.set()
+        for thread in churners:
+            thread.join()
+        self.assertEqual(errors, [])
+        return counts
+
+    def test_dispatch_event_exactly_once(self):
+        counts = self.run_threads(lambda d, i: d.dispatch_event('event1', i))
+        expected = self.N_DISPATCHERS * self.N_DISPATCHES
+        self.assertEqual(counts, [expected, expected])
+
+    def test_dispatch_exactly_once(self):
+        counts = self.run_threads(lambda d, i: d.dispatch('p1', d, i))
+        expected = self.N_DISPATCHERS * self.N_DISPATCHES
+        self.assertEqual(counts, [expected, expected])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+__author__ = 'calvin'
+
+import random
+import threading
+import time
+import unittest
+
+from eventdispatcher import Clock, ScheduledEvent, TimerHeap, TimingWheel
+
+
+class TimerHeapTest(unittest.TestCase):
+    # Longest time a timer can expire after its deadline
+    LATENESS = 0.0
+    # How much earlier than the next deadline next_deadline can be
+    EARLY = 0.0
+
+    def make_timers(self):
+        return TimerHeap()
+
+    def run_timers(self, timers, start, step):
+        """Expire the timers in steps, returns (deadline, expiry time)."""
+        expired = []
+        now = start
+        while timers:
+            now += step
+            timers.expire(now, lambda func: expired.append((func(), now)))
+        return expired
+
+    def test_expire_in_order(self):
+        timers = self.make_timers()
+        start = time.time()
+        deadlines = [start + random.random() * 10 for i in range(1000)]
+        for deadline in deadlines:
+            timers.add(deadline, lambda deadline=deadline: deadline)
+        self.assertEqual(len(timers), 1000)
+        expired = self.run_timers(timers, start, 0.0005)
+        self.assertEqual(sorted(d for d, now in expired), sorted(deadlines))
+        for deadline, now in expired:
+            self.assertLessEqual(deadline, now)
+            self.assertLessEqual(now - deadline, self.LATENESS + 0.0005)
+
+    def test_far_deadlines(self):
+        timers = self.make_timers()
+        start = time.time()
+        deadlines = [start + 0.01, start + 1e4, start + 1e7]
+        for deadline in deadlines:
+            timers.add(deadline, lambda deadline=deadline: deadline)
+        expired = []
+        now = start
+        while timers:
+            now = max(now, timers.next_deadline())
+            timers.expire(now, lambda func: expired.append(func()))
+        self.assertEqual(expired, deadlines)
+
+    def test_cancel(self):
+        timers = self.make_timers()
+        start = time.time()
+        handles = [
+            timers.add(start + i * 0.001, lambda i=i: i) for i in range(200)
+        ]
+        for handle in handles[::2]:
+            self.assertTrue(timers.cancel(handle))
+        self.assertFalse(timers.cancel(handles[0]))
+        self.assertFalse(handles[0].active)
+        self.assertEqual(len(timers), 100)
+        expired = self.run_timers(timers, start, 0.01)
+        self.assertEqual(
+            sorted(i for i, now in expired), list(range(1, 200, 2))
+        )
+        # Expired timers cannot be cancelled
+        self.assertFalse(timers.cancel(handles[1]))
+
+    def test_next_deadline(self):
+        timers = self.make_timers()
+        self.assertIsNone(timers.next_deadline())
+        start = time.time()
+        handle = timers.add(start + 0.5, lambda: None)
+        timers.add(start + 2, lambda: None)
+        self.assertLessEqual(timers.next_deadline(), start + 0.5)
+        self.assertGreaterEqual(
+            timers.next_deadline(), start + 0.5 - self.EARLY
+        )
+        timers.cancel(handle)
+        self.assertLessEqual(timers.next_deadline(), start + 2)
+        self.assertGreaterEqual(
+            timers.next_deadline(), start + 2 - self.EARLY
+        )
+
+
+class TimingWheelTest(TimerHeapTest):
+    LATENESS = 0.001
+    # The start of the slot of a timer in the second level
+    EARLY = 0.064
+
+    def make_timers(self):
+        return TimingWheel(resolution=0.001)
+
+    def test_small_wheel(self):
+        # Timers cascade through every level and overflow the top one
+        timers = TimingWheel(resolution=0.001, slots=4, levels=3)
+        start = time.time()
+        deadlines = [start + random.random() * 1 for i in range(500)]
+        for deadline in deadlines:
+            timers.add(deadline, lambda deadline=deadline: deadline)
+        expired = self.run_timers(timers, start, 0.0005)
+        self.assertEqual(sorted(d for d, now in expired), sorted(deadlines))
+        for deadline, now in expired:
+            self.assertLess(deadline, now)
+            self.assertLessEqual(now - deadline, self.LATENESS + 0.0005)
+
+    def test_past_deadline(self):
+        timers = self.make_timers()
+        expired = []
+        timers.add(time.time() - 1, lambda: expired.append(1))
+        self.assertLessEqual(timers.next_deadline(), time.time())
+        timers.expire(time.time(), expired.append)
+        self.assertEqual(len(expired), 1)
+
+    def test_slots_power_of_2(self):
+        with self.assertRaises(ValueError):
+            TimingWheel(slots=10)
+
+
+class TimingWheelClockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_clock = getattr(Clock, 'clock', None)
+        self.clock = Clock(timers=TimingWheel())
+        self.thread = threading.Thread(target=self.clock.run)
+        self.calls = []
+
+    def tearDown(self):
+        self.clock.stop()
+        self.thread.join()
+        Clock.clock = self.previous_clock
+
+    def call(self):
+        self.calls.append(time.time())
+
+    def test_schedule(self):
+        t0 = time.time()
+        ScheduledEvent.schedule_once(self.call, 0.05)
+        event = ScheduledEvent.schedule_interval(self.call, 0.02, start=True)
+        self.thread.start()
+        time.sleep(0.11)
+        event.stop()
+        self.assertIn(len(self.calls), (4, 5, 6))
+        self.assertTrue(
+            any(abs(t - t0 - 0.05) < 0.01 for t in self.calls)
+        )
+
+    def test_cancel(self):
+        timer = self.clock.schedule_at(time.time() + 0.05, self.call)
+        self.assertEqual(self.clock.scheduled_funcs[self.call], 1)
+        self.assertTrue(self.clock.cancel(timer))
+        self.assertFalse(self.clock.cancel(timer))
+        self.assertEqual(self.clock.scheduled_funcs[self.call], 0)
+        self.thread.start()
+        time.sleep(0.1)
+        self.assertEqual(self.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()